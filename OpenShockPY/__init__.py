@@ -4,6 +4,8 @@
 
 from typing import Any
 
+from ._circuit import CircuitBreaker
+from ._codec import MsgspecCodec, OrjsonCodec, StdlibCodec
 from ._core import (
     AUTH_HEADER,
     DEFAULT_BASE_URL,
@@ -13,14 +15,19 @@ from ._core import (
     SESSION_COOKIE,
     SESSION_HEADER,
     ActionResponse,
+    AsyncTransport,
+    BatchResult,
     Control,
     ControlType,
     Device,
     DeviceListResponse,
     DeviceResponse,
+    JSONCodec,
     OpenShockAPIError,
     OpenShockAuthError,
+    OpenShockCircuitOpenError,
     OpenShockConnectionError,
+    OpenShockDeadlineExceededError,
     OpenShockNotFoundError,
     OpenShockPYError,
     OpenShockRateLimitError,
@@ -28,6 +35,7 @@ from ._core import (
     OpenShockValidationError,
     OwnShockerListResponse,
     PermissionType,
+    PoolStats,
     Shocker,
     ShockerLimits,
     ShockerListResponse,
@@ -35,10 +43,39 @@ from ._core import (
     ShockerPermissions,
     ShockerResponse,
     SortDirection,
+    StreamedResponse,
+    Timeouts,
+    Transport,
+    TransportResponse,
     build_control,
     validate_action_params,
 )
+from ._hedge import HedgePolicy
+from ._lazy import LazyArray, LazyObject
+from ._models import DeviceRecord, ShockerRecord
+from ._ratelimit import RateLimiter, SQLiteRateLimiter
+from ._reconcile import ControlReconciler, ReconcileResult
+from ._retry import (
+    BackoffStrategy,
+    DecorrelatedJitterBackoff,
+    EqualJitterBackoff,
+    ExponentialBackoff,
+    FullJitterBackoff,
+    RetryBudget,
+    RetryBudgetStats,
+    deadline,
+    request_timeout,
+)
 from .client import OpenShockClient
+from .transports import (
+    AsyncHTTPXTransport,
+    AsyncInMemoryTransport,
+    HTTPXTransport,
+    InMemoryTransport,
+    RequestsTransport,
+    TransportRequest,
+    Urllib3Transport,
+)
 
 try:  # pragma: no cover - trivial
     from importlib.metadata import version
@@ -56,18 +93,60 @@ __all__ = [
     "OpenShockPYError",
     "OpenShockValidationError",
     "OpenShockConnectionError",
+    "OpenShockCircuitOpenError",
+    "OpenShockDeadlineExceededError",
     "OpenShockAPIError",
     "OpenShockAuthError",
     "OpenShockNotFoundError",
     "OpenShockRateLimitError",
     "OpenShockServerError",
+    # Transports
+    "Transport",
+    "AsyncTransport",
+    "TransportRequest",
+    "TransportResponse",
+    "StreamedResponse",
+    "PoolStats",
+    "Timeouts",
+    "RequestsTransport",
+    "Urllib3Transport",
+    "HTTPXTransport",
+    "AsyncHTTPXTransport",
+    "InMemoryTransport",
+    "AsyncInMemoryTransport",
+    # JSON codecs
+    "JSONCodec",
+    "StdlibCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
+    # Rate limiting
+    "RateLimiter",
+    "SQLiteRateLimiter",
+    "RetryBudget",
+    "RetryBudgetStats",
+    "CircuitBreaker",
+    "HedgePolicy",
+    # Backoff strategies
+    "BackoffStrategy",
+    "ExponentialBackoff",
+    "FullJitterBackoff",
+    "EqualJitterBackoff",
+    "DecorrelatedJitterBackoff",
+    # Bulk calls
+    "BatchResult",
+    # Control delivery reconciliation
+    "ControlReconciler",
+    "ReconcileResult",
     # Types for IDE autocompletion
     "ActionResponse",
     "Control",
     "ControlType",
     "Device",
     "DeviceListResponse",
+    "DeviceRecord",
     "DeviceResponse",
+    "LazyArray",
+    "LazyObject",
     "OwnShockerListResponse",
     "PermissionType",
     "Shocker",
@@ -75,10 +154,13 @@ __all__ = [
     "ShockerListResponse",
     "ShockerModel",
     "ShockerPermissions",
+    "ShockerRecord",
     "ShockerResponse",
     "SortDirection",
     # Helpers and constants
     "build_control",
+    "deadline",
+    "request_timeout",
     "validate_action_params",
     "AUTH_HEADER",
     "LEGACY_AUTH_HEADER",
@@ -0,0 +1,194 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Per-endpoint circuit breaking, so a dead API fails fast.
+
+A `CircuitBreaker` counts consecutive failures (transport errors and 5xx
+responses) per base URL and endpoint template. After ``failure_threshold``
+of them the circuit for that endpoint *opens*: requests to it raise
+`OpenShockCircuitOpenError` at once instead of waiting out timeouts and
+retries. After ``recovery_timeout`` seconds it goes *half-open* and lets
+``half_open_max_calls`` probe requests through; a probe that succeeds
+closes the circuit, one that fails opens it again.
+
+Like `RateLimiter`, one breaker may be shared by clients, threads and event
+loops: each check is a short critical section under a lock.
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from ._core import OpenShockCircuitOpenError, OpenShockValidationError
+
+__all__ = ["CircuitBreaker", "endpoint_template"]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+#: Called as ``on_state_change(key, old_state, new_state)``.
+StateCallback = Callable[[Tuple[str, str], str, str], None]
+
+_UUID = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+
+
+def endpoint_template(path: str) -> str:
+    """``/1/shockers/<uuid>/logs`` -> ``/1/shockers/{id}/logs``.
+
+    Ids are UUIDs throughout the API, so every call to one endpoint shares
+    a circuit whichever resource it names.
+    """
+    return _UUID.sub("{id}", path)
+
+
+@dataclass
+class _Circuit:
+    state: str = CLOSED
+    failures: int = 0
+    # When it opened or, while half-open, when the last probe went out.
+    opened_at: float = 0.0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    """Fail fast on endpoints that keep failing.
+
+    Args:
+        failure_threshold: Consecutive failures that open a circuit.
+        recovery_timeout: Seconds an open circuit rejects requests before
+            letting probes through.
+        half_open_max_calls: Probe requests allowed at once while half-open.
+        on_state_change: Called as ``(key, old_state, new_state)`` on every
+            transition, where ``key`` is ``(base_url, endpoint_template)``
+            and the states are ``"closed"``, ``"open"`` and
+            ``"half_open"``. It runs on the requesting thread, outside the
+            breaker's lock, and must not raise.
+        clock: Clock in seconds, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_state_change: Optional[StateCallback] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise OpenShockValidationError("failure_threshold must be >= 1")
+        if recovery_timeout < 0:
+            raise OpenShockValidationError("recovery_timeout must be >= 0")
+        if half_open_max_calls < 1:
+            raise OpenShockValidationError("half_open_max_calls must be >= 1")
+        self.failure_threshold = int(failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = int(half_open_max_calls)
+        self.on_state_change = on_state_change
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[Tuple[str, str], _Circuit] = {}
+
+    @staticmethod
+    def key(base_url: str, path: str) -> Tuple[str, str]:
+        """The circuit a request to ``base_url`` + ``path`` belongs to."""
+        return (base_url, endpoint_template(path))
+
+    def state(self, key: Tuple[str, str]) -> str:
+        """The state of one circuit; ``"closed"`` for one never used."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit.state if circuit else CLOSED
+
+    def _move(self, circuit: _Circuit, state: str) -> str:
+        old, circuit.state = circuit.state, state
+        circuit.probes = 0
+        circuit.opened_at = self._clock()
+        if state == CLOSED:
+            circuit.failures = 0
+        return old
+
+    def _notify(self, key: Tuple[str, str], old: Optional[str], new: str) -> None:
+        if old is not None and old != new and self.on_state_change is not None:
+            self.on_state_change(key, old, new)
+
+    def before_request(self, key: Tuple[str, str]) -> None:
+        """Admit one request or raise `OpenShockCircuitOpenError`."""
+        old = None
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.recovery_timeout - self._clock()
+                if remaining > 0:
+                    raise OpenShockCircuitOpenError(
+                        f"Circuit open for {key[1]} at {key[0]}; "
+                        f"retry in {remaining:.1f}s",
+                        key=key,
+                        retry_after=remaining,
+                    )
+                old = self._move(circuit, HALF_OPEN)
+            if circuit.state == HALF_OPEN:
+                now = self._clock()
+                if now - circuit.opened_at >= self.recovery_timeout:
+                    # Probes that never reported back (cancelled, crashed)
+                    # must not hold the circuit half-open forever.
+                    circuit.probes = 0
+                if circuit.probes >= self.half_open_max_calls:
+                    raise OpenShockCircuitOpenError(
+                        f"Circuit half-open for {key[1]} at {key[0]}; "
+                        "a probe request is already in flight",
+                        key=key,
+                    )
+                circuit.probes += 1
+                circuit.opened_at = now
+        self._notify(key, old, HALF_OPEN)
+
+    def record_success(self, key: Tuple[str, str]) -> None:
+        """The request got a response that does not count as a failure."""
+        old = None
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.failures = 0
+            if circuit.state != CLOSED:
+                old = self._move(circuit, CLOSED)
+        self._notify(key, old, CLOSED)
+
+    def record_failure(self, key: Tuple[str, str]) -> None:
+        """The request failed in transport or with a 5xx."""
+        old = None
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or (
+                circuit.state == CLOSED
+                and circuit.failures >= self.failure_threshold
+            ):
+                old = self._move(circuit, OPEN)
+        self._notify(key, old, OPEN)
+
+    def release(self, key: Tuple[str, str]) -> None:
+        """An admitted request ended without an outcome, e.g. before sending.
+
+        Gives back its probe slot if the circuit is half-open; failures are
+        left as they are.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None and circuit.state == HALF_OPEN and circuit.probes:
+                circuit.probes -= 1
+
+    def reset(self) -> None:
+        """Close every circuit and forget all failures."""
+        with self._lock:
+            self._circuits.clear()
+
+    def __repr__(self) -> str:
+        with self._lock:
+            opened = sum(c.state != CLOSED for c in self._circuits.values())
+        return (
+            f"{type(self).__name__}(failure_threshold={self.failure_threshold}, "
+            f"recovery_timeout={self.recovery_timeout}, open={opened})"
+        )
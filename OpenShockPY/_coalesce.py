@@ -0,0 +1,247 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Coalescing of single-shocker controls into one ``ControlRequest``.
+
+``POST /2/shockers/control`` accepts any number of ``Control`` entries, so
+controls issued by many callers within a few milliseconds of each other can
+travel as one request. Each caller still gets its own result: the decoded
+response of the shared request, or the exception it raised.
+
+Controls are only merged when they share the same ``api_key`` and
+``custom_name``, since both apply to the whole request. A shocker never
+appears twice in one batch; a second control for a shocker that is already
+pending flushes the pending batch first. Batches are sent independently, so
+two controls for one shocker that end up in different batches may reach the
+API in either order. Only Stops are sequenced: they are never coalesced,
+and before one is sent the client calls ``flush`` for its shockers, which
+sends their pending batches at once and waits until every batch holding
+them has been sent. A Stop therefore always reaches the API after the
+controls queued before it.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from ._core import Control, OpenShockValidationError
+
+#: Signature of the function that actually sends a batch:
+#: ``send(controls, custom_name, api_key)``.
+SendControls = Callable[[List[Control], Optional[str], Optional[str]], Any]
+AsyncSendControls = Callable[
+    [List[Control], Optional[str], Optional[str]], Awaitable[Any]
+]
+
+_BatchKey = Tuple[Optional[str], Optional[str]]
+
+
+def _validate(window: float, max_batch: int) -> None:
+    if window <= 0:
+        raise OpenShockValidationError("coalesce_window must be greater than 0")
+    if isinstance(max_batch, bool) or not isinstance(max_batch, int) or max_batch < 1:
+        raise OpenShockValidationError("coalesce_max_batch must be an integer >= 1")
+
+
+class _Batch:
+    """Controls waiting to be flushed together, with one future per caller."""
+
+    def __init__(self) -> None:
+        self.controls: List[Control] = []
+        self.futures: List[Any] = []
+        self.ids: Set[str] = set()
+        self.closed = threading.Event()
+        self.sent = threading.Event()
+
+    def add(self, control: Control, future: Any) -> None:
+        self.controls.append(control)
+        self.futures.append(future)
+        self.ids.add(control["id"])
+
+
+class ControlCoalescer:
+    """Merge controls submitted from many threads into shared requests.
+
+    The first caller to open a batch waits up to ``window`` seconds (less if
+    the batch fills up) and then sends it; every other caller just blocks on
+    its own future. No background thread is involved.
+    """
+
+    def __init__(self, send: SendControls, window: float, max_batch: int) -> None:
+        _validate(window, max_batch)
+        self._send = send
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: Dict[_BatchKey, _Batch] = {}
+        # Batches not sent yet, pending or being sent.
+        self._unsent: Set[_Batch] = set()
+
+    def _close(self, key: _BatchKey, batch: _Batch) -> None:
+        # Caller holds the lock.
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        batch.closed.set()
+
+    def submit(
+        self,
+        control: Control,
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> Any:
+        """Queue one control and block until its batch has been sent."""
+        key = (api_key, custom_name)
+        future: "Future[Any]" = Future()
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is not None and control["id"] in batch.ids:
+                self._close(key, batch)
+                batch = None
+            leader = batch is None
+            if batch is None:
+                batch = _Batch()
+                self._pending[key] = batch
+                self._unsent.add(batch)
+            batch.add(control, future)
+            if len(batch.controls) >= self.max_batch:
+                self._close(key, batch)
+
+        if leader:
+            batch.closed.wait(self.window)
+            with self._lock:
+                self._close(key, batch)
+            self._flush(batch, custom_name, api_key)
+        return future.result()
+
+    def flush(self, shocker_ids: Iterable[str]) -> None:
+        """Send the batches holding ``shocker_ids`` now and wait until they are sent."""
+        ids = set(shocker_ids)
+        with self._lock:
+            waiting = [batch for batch in self._unsent if batch.ids & ids]
+            for key, batch in list(self._pending.items()):
+                if batch.ids & ids:
+                    self._close(key, batch)
+        for batch in waiting:
+            batch.sent.wait()
+
+    def _flush(
+        self, batch: _Batch, custom_name: Optional[str], api_key: Optional[str]
+    ) -> None:
+        try:
+            result = self._send(batch.controls, custom_name, api_key)
+        except BaseException as exc:
+            self._sent(batch)
+            # Every caller in the batch sees the failure, not just this one.
+            for future in batch.futures:
+                future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        self._sent(batch)
+        for future in batch.futures:
+            future.set_result(result)
+
+    def _sent(self, batch: _Batch) -> None:
+        with self._lock:
+            self._unsent.discard(batch)
+        batch.sent.set()
+
+
+class AsyncControlCoalescer:
+    """`ControlCoalescer` for coroutines sharing one event loop.
+
+    The flush is scheduled on the loop rather than run by the first caller,
+    so cancelling any one caller never strands the rest of its batch.
+    """
+
+    def __init__(
+        self, send: AsyncSendControls, window: float, max_batch: int
+    ) -> None:
+        _validate(window, max_batch)
+        self._send = send
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[_BatchKey, _Batch] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        # Flushes in progress and the batch each one sends.
+        self._tasks: Dict["asyncio.Task[None]", _Batch] = {}
+
+    def _close(self, key: _BatchKey, batch: _Batch) -> None:
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        timer = self._timers.pop(id(batch), None)
+        if timer is not None:
+            timer.cancel()
+        task = asyncio.get_running_loop().create_task(
+            self._flush(batch, key[1], key[0])
+        )
+        self._tasks[task] = batch
+        task.add_done_callback(self._forget)
+
+    def _forget(self, task: "asyncio.Task[None]") -> None:
+        self._tasks.pop(task, None)
+
+    async def flush(self, shocker_ids: Iterable[str]) -> None:
+        """Send the batches holding ``shocker_ids`` now and wait until they are sent."""
+        ids = set(shocker_ids)
+        for key, batch in list(self._pending.items()):
+            if batch.ids & ids:
+                self._close(key, batch)
+        waiting = [task for task, batch in self._tasks.items() if batch.ids & ids]
+        if waiting:
+            # asyncio.wait, not gather: a cancelled Stop leaves the flushes running.
+            await asyncio.wait(waiting)
+
+    async def submit(
+        self,
+        control: Control,
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> Any:
+        """Queue one control and wait until its batch has been sent."""
+        loop = asyncio.get_running_loop()
+        key = (api_key, custom_name)
+        batch = self._pending.get(key)
+        if batch is not None and control["id"] in batch.ids:
+            self._close(key, batch)
+            batch = None
+        if batch is None:
+            batch = _Batch()
+            self._pending[key] = batch
+            self._timers[id(batch)] = loop.call_later(
+                self.window, self._close, key, batch
+            )
+        future = loop.create_future()
+        batch.add(control, future)
+        if len(batch.controls) >= self.max_batch:
+            self._close(key, batch)
+        return await future
+
+    async def _flush(
+        self, batch: _Batch, custom_name: Optional[str], api_key: Optional[str]
+    ) -> None:
+        try:
+            result = await self._send(batch.controls, custom_name, api_key)
+        except asyncio.CancelledError:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future in batch.futures:
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,124 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""JSON codecs the clients can encode request bodies and decode responses with.
+
+By default the transport encodes request bodies and responses are decoded
+with the standard library, as before. With ``codec=`` the client encodes
+bodies itself and sends the bytes, and decodes every response, error bodies
+included, with the chosen codec:
+
+- `StdlibCodec`: ``json``, compact separators.
+- `OrjsonCodec`: ``orjson`` (``pip install Nanashi-OpenShockPY[orjson]``).
+- `MsgspecCodec`: ``msgspec`` (``pip install Nanashi-OpenShockPY[msgspec]``).
+
+``codec="auto"`` picks orjson, then msgspec, whichever is installed, and
+falls back to the standard library.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+from ._core import JSONCodec, OpenShockValidationError
+
+try:  # orjson is an optional extra
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+try:  # msgspec is an optional extra
+    import msgspec  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    msgspec = None  # type: ignore[assignment]
+
+__all__ = ["StdlibCodec", "OrjsonCodec", "MsgspecCodec", "resolve_codec"]
+
+
+class StdlibCodec:
+    """The standard library ``json`` module."""
+
+    name = "stdlib"
+    content_type = "application/json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class OrjsonCodec(StdlibCodec):
+    """``orjson``: several times faster than ``json`` both ways."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError(
+                "OrjsonCodec requires orjson. Install it with: "
+                "pip install Nanashi-OpenShockPY[orjson]"
+            )
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def decode(self, data: bytes) -> Any:
+        # orjson.JSONDecodeError is a ValueError, like json's.
+        return orjson.loads(data)
+
+
+class MsgspecCodec(StdlibCodec):
+    """``msgspec.json``: comparable to orjson, with a reusable decoder."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise ImportError(
+                "MsgspecCodec requires msgspec. Install it with: "
+                "pip install Nanashi-OpenShockPY[msgspec]"
+            )
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, value: Any) -> bytes:
+        return self._encoder.encode(value)
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as exc:
+            # Callers catch ValueError for unparseable bodies.
+            raise ValueError(str(exc)) from exc
+
+
+_NAMED: Dict[str, Callable[[], JSONCodec]] = {
+    "stdlib": StdlibCodec,
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+}
+
+
+def resolve_codec(codec: Union[str, JSONCodec, None]) -> Optional[JSONCodec]:
+    """Turn the clients' ``codec`` argument into a codec, or None for default.
+
+    Accepts None, a codec instance, ``"stdlib"``, ``"orjson"``,
+    ``"msgspec"`` or ``"auto"``.
+    """
+    if codec is None or not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        if orjson is not None:
+            return OrjsonCodec()
+        if msgspec is not None:
+            return MsgspecCodec()
+        return StdlibCodec()
+    factory = _NAMED.get(codec)
+    if factory is None:
+        raise OpenShockValidationError(
+            f"Unknown codec {codec!r}; expected one of: auto, "
+            + ", ".join(_NAMED)
+        )
+    return factory()
@@ -4,10 +4,30 @@
 
 Nothing in here performs I/O, so the sync client (``requests``) and the async
 client (``httpx``) can share exactly the same validation, payload building,
-response parsing and error mapping.
+response parsing and error mapping. The `Transport` protocols describe the
+one piece that does; implementations live in `OpenShockPY.transports`.
 """
 
-from typing import Any, Dict, List, Literal, Optional, Sequence, TypedDict
+import functools
+import json
+import threading
+import time
+from dataclasses import astuple, dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 DEFAULT_BASE_URL = "https://api.openshock.app"
 DEFAULT_TIMEOUT = 15.0
@@ -34,11 +54,21 @@ RETRY_STATUSES = frozenset({429, 502, 503, 504})
 #: request may well have been executed and only the response lost.
 ALWAYS_SAFE_RETRY_STATUSES = frozenset({429})
 
+#: Longest wait, in seconds, a priority Stop sits out after a 429 before it
+#: is replayed. A longer ``Retry-After`` is not waited for; the 429 is raised.
+STOP_MAX_RETRY_WAIT = 1.0
+
 #: HTTP methods that can be replayed without changing the outcome. ``POST`` is
 #: absent on purpose - ``POST /2/shockers/control`` delivers a shock, and
 #: retrying a timed-out control request would deliver it a second time.
 IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
 
+#: The one endpoint every control action goes through.
+CONTROL_PATH = "/2/shockers/control"
+
+#: Cheap, unauthenticated endpoint used to open and keep alive connections.
+WARMUP_PATH = "/1/public/stats"
+
 INTENSITY_MIN = 0
 INTENSITY_MAX = 100
 DURATION_MIN = 300
@@ -82,7 +112,56 @@ class OpenShockValidationError(OpenShockPYError, ValueError):
 
 
 class OpenShockConnectionError(OpenShockPYError):
-    """Raised when the request could not be completed (DNS, TLS, timeout, ...)."""
+    """Raised when the request could not be completed (DNS, TLS, timeout, ...).
+
+    Attributes:
+        request_sent: False when the failure happened before any of the
+            request left the machine (DNS, connect refused or timed out, no
+            pooled connection free), so replaying it is safe even for a
+            control POST. True or None (unknown) when the server may have
+            received it.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        payload: Optional[Any] = None,
+        request_sent: Optional[bool] = None,
+    ) -> None:
+        super().__init__(message, status_code, payload)
+        self.request_sent = request_sent
+
+
+class OpenShockDeadlineExceededError(OpenShockConnectionError):
+    """Raised when a call's deadline passed before it could send a request.
+
+    A retry that would not finish before the deadline is skipped instead,
+    and the error that triggered it is raised.
+    """
+
+
+class OpenShockCircuitOpenError(OpenShockConnectionError):
+    """Raised without sending when a `CircuitBreaker` has the endpoint open.
+
+    Subclasses `OpenShockConnectionError`, since it stands in for the
+    connection failures that opened the circuit.
+
+    Attributes:
+        key: The ``(base_url, endpoint_template)`` circuit that is open.
+        retry_after: Seconds until the circuit lets a probe through, or
+            None while a probe is already in flight.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        key: Tuple[str, str] = ("", ""),
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.key = key
+        self.retry_after = retry_after
 
 
 class OpenShockAPIError(OpenShockPYError):
@@ -176,28 +255,68 @@ def should_retry(status_code: int, method: str = "GET") -> bool:
     return method.upper() in IDEMPOTENT_METHODS
 
 
-def should_retry_transport_error(method: str) -> bool:
+def should_retry_transport_error(
+    method: str, request_sent: Optional[bool] = None
+) -> bool:
     """Return True when a connection/timeout failure may safely be retried.
 
-    The request may have reached the server and been executed, so only
-    idempotent methods are replayed.
+    A request that never left the machine (``request_sent=False``) is always
+    safe to replay. Otherwise it may have reached the server and been
+    executed, so only idempotent methods are replayed.
     """
-    return method.upper() in IDEMPOTENT_METHODS
+    return request_sent is False or method.upper() in IDEMPOTENT_METHODS
 
 
-def retry_delay(
-    attempt: int,
-    retry_after: Optional[float] = None,
-    backoff_factor: float = 0.5,
-    max_delay: float = 30.0,
-) -> float:
-    """Seconds to wait before retry number ``attempt`` (0-based).
+@dataclass(frozen=True)
+class Timeouts:
+    """Per-phase request timeouts, in seconds.
+
+    A phase left as ``None`` is taken from whatever these are layered over:
+    a per-call `request_timeout` over the endpoint class, and the endpoint
+    class over the client's ``timeout``.
 
-    A server supplied ``Retry-After`` always wins over the exponential backoff.
+    Attributes:
+        connect: Establishing the connection, TLS included.
+        read: Waiting for (each chunk of) the response.
+        write: Sending (each chunk of) the request.
+        pool: Waiting for a free pooled connection.
     """
-    if retry_after is not None:
-        return min(retry_after, max_delay)
-    return min(backoff_factor * (2**attempt), max_delay)
+
+    connect: Optional[float] = None
+    read: Optional[float] = None
+    write: Optional[float] = None
+    pool: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if any(value is not None and value <= 0 for value in astuple(self)):
+            raise OpenShockValidationError("timeouts must be greater than 0")
+
+    @classmethod
+    def of(cls, value: Union[float, "Timeouts"]) -> "Timeouts":
+        """``value`` as `Timeouts`; a plain number applies to every phase."""
+        if isinstance(value, Timeouts):
+            return value
+        return cls(value, value, value, value)
+
+    def over(self, fallback: "Timeouts") -> "Timeouts":
+        """These timeouts, with unset phases taken from ``fallback``."""
+        return Timeouts(
+            *(
+                mine if mine is not None else theirs
+                for mine, theirs in zip(astuple(self), astuple(fallback))
+            )
+        )
+
+    def capped(self, limit: float) -> "Timeouts":
+        """Every phase cut down to at most ``limit`` seconds."""
+        return Timeouts(
+            *(limit if value is None else min(value, limit) for value in astuple(self))
+        )
+
+    def simplify(self) -> Union[float, "Timeouts", None]:
+        """A plain number when every phase agrees, which any transport takes."""
+        values = set(astuple(self))
+        return values.pop() if len(values) == 1 else self
 
 
 # ---------------------------------------------------------------------------
@@ -336,6 +455,14 @@ def normalize_base_url(base_url: str) -> str:
     return base_url.strip().rstrip("/")
 
 
+def validate_warmup(connections: int, keepalive_interval: Optional[float]) -> None:
+    """Validate the arguments of the clients' ``warmup``."""
+    if isinstance(connections, bool) or not isinstance(connections, int) or connections < 1:
+        raise OpenShockValidationError("connections must be an integer >= 1")
+    if keepalive_interval is not None and keepalive_interval <= 0:
+        raise OpenShockValidationError("keepalive_interval must be greater than 0")
+
+
 def validate_action_params(intensity: int, duration: int) -> None:
     """Validate an action against the ``Control`` schema bounds.
 
@@ -408,6 +535,20 @@ def build_control_request(
     return {"shocks": controls, "customName": custom_name}
 
 
+@functools.lru_cache(maxsize=64)
+def encode_stop_request(
+    shocker_ids: Tuple[str, ...], custom_name: Optional[str] = None
+) -> bytes:
+    """Serialized ``ControlRequest`` that stops every shocker in ``shocker_ids``.
+
+    Memoized, so the emergency-stop path skips validation and JSON encoding
+    for a shocker set it has already stopped once.
+    """
+    controls = [build_control(sid, "Stop", 0, DURATION_MIN) for sid in shocker_ids]
+    payload = build_control_request(controls, custom_name)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
 def extract_shocker_ids(response: Any) -> List[str]:
     """Collect shocker ids from any of the shocker listing response shapes.
 
@@ -422,7 +563,7 @@ def extract_shocker_ids(response: Any) -> List[str]:
     data = response.get("data")
     if isinstance(data, list):
         for entry in data:
-            if not isinstance(entry, dict):
+            if not isinstance(entry, Mapping):
                 continue
             nested = entry.get("shockers")
             if isinstance(nested, list):
@@ -437,7 +578,7 @@ def extract_shocker_ids(response: Any) -> List[str]:
     ids: List[str] = []
     seen = set()
     for entry in candidates:
-        if not isinstance(entry, dict):
+        if not isinstance(entry, Mapping):
             continue
         shocker_id = entry.get("id")
         if isinstance(shocker_id, str) and shocker_id not in seen:
@@ -446,11 +587,88 @@ def extract_shocker_ids(response: Any) -> List[str]:
     return ids
 
 
+class ShockerIdCache:
+    """Shocker ids for the ``*_all`` fan-out, remembered for ``ttl`` seconds.
+
+    Entries are keyed by the per-call ``api_key`` argument, since different
+    credentials can see different shockers. A ``ttl`` of 0 disables caching.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self, ttl: float = 0.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        if ttl < 0:
+            raise OpenShockValidationError("shocker_cache_ttl must be >= 0")
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, List[str]]] = {}
+
+    def get(self, key: Hashable) -> Optional[List[str]]:
+        """Cached ids for ``key``, or None when missing or expired."""
+        if not self.ttl:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, ids = entry
+            if self._clock() >= expires:
+                del self._entries[key]
+                return None
+            return list(ids)
+
+    def put(self, key: Hashable, ids: Sequence[str]) -> None:
+        """Remember ``ids`` for ``key``. A no-op when caching is disabled."""
+        if not self.ttl:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, list(ids))
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Forget ``key``, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
 def clean_params(params: Dict[str, Any]) -> Dict[str, Any]:
     """Drop ``None`` values so they are not serialized as query parameters."""
     return {k: v for k, v in params.items() if v is not None}
 
 
+def logs_params(
+    page: Optional[int],
+    page_size: Optional[int],
+    search: Optional[str],
+    sort: Optional[str],
+    sort_dir: Optional[str],
+    shocker_ids: Optional[Sequence[str]],
+) -> Dict[str, Any]:
+    """Query parameters for ``GET /1/shockers/logs``."""
+    return ENDPOINTS["get_logs"].params(
+        {
+            "page": page,
+            "page_size": page_size,
+            "search": search,
+            "sort": sort,
+            "sort_dir": sort_dir,
+            "shocker_ids": shocker_ids or None,
+        }
+    )
+
+
+def validate_log_paging(page_size: int, prefetch: int) -> None:
+    """Check the paging arguments of ``iter_logs``."""
+    if page_size < 1:
+        raise OpenShockValidationError("page_size must be >= 1")
+    if prefetch < 0:
+        raise OpenShockValidationError("prefetch must be >= 0")
+
+
 def auth_headers(api_key: Optional[str]) -> Dict[str, str]:
     """Headers carrying an API token, under the canonical and legacy names."""
     if not api_key:
@@ -463,3 +681,500 @@ def session_headers(session_token: Optional[str]) -> Dict[str, str]:
     if not session_token:
         return {}
     return {SESSION_HEADER: session_token}
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+
+def _listed(value: Any) -> Any:
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        return list(value)
+    return value
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """How one endpoint method turns its arguments into a request.
+
+    Attributes:
+        method: The HTTP method.
+        path: Path template; each ``{field}`` is filled from the argument of
+            the same name.
+        body: The JSON body as ``{json_key: argument}``, or None to send
+            none. Sequences are sent as lists.
+        query: Query parameters as ``{param: argument}``; None values are
+            left out.
+        optional: Leave out body members whose argument is None instead of
+            sending ``null``.
+    """
+
+    method: str
+    path: str
+    body: Optional[Mapping[str, str]] = None
+    query: Optional[Mapping[str, str]] = None
+    optional: bool = False
+
+    def params(self, args: Mapping[str, Any]) -> Dict[str, Any]:
+        """The query parameters for a call with ``args``."""
+        query = self.query or {}
+        return clean_params({key: _listed(args[arg]) for key, arg in query.items()})
+
+    def request(self, args: Mapping[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+        """``(method, path, keyword arguments)`` to hand a client's ``_request``."""
+        kwargs: Dict[str, Any] = {}
+        if self.query is not None:
+            kwargs["params"] = self.params(args)
+        if self.body is not None:
+            body = {key: _listed(args[arg]) for key, arg in self.body.items()}
+            kwargs["json_body"] = clean_params(body) if self.optional else body
+        return self.method, self.path.format(**args), kwargs
+
+
+_SHOCKER_BODY = {
+    "device": "device_id",
+    "name": "name",
+    "rfId": "rf_id",
+    "model": "model",
+}
+_SHARE_BODY = {"permissions": "permissions", "limits": "limits"}
+_TOKEN_BODY = {
+    "name": "name",
+    "permissions": "permissions",
+    "shockerControl": "shocker_control",
+}
+
+#: Every plain endpoint, keyed by the client method that calls it. Both
+#: clients build their requests from this one table, so the sync and async
+#: methods cannot send different requests. Control actions, which have their
+#: own request builders, are not listed.
+ENDPOINTS: Dict[str, Endpoint] = {
+    # hubs / devices
+    "list_devices": Endpoint("GET", "/1/devices"),
+    "get_device": Endpoint("GET", "/1/devices/{device_id}"),
+    "create_device": Endpoint("POST", "/1/devices"),
+    "edit_device": Endpoint("PATCH", "/1/devices/{device_id}", {"name": "name"}),
+    "delete_device": Endpoint("DELETE", "/1/devices/{device_id}"),
+    "regenerate_device_token": Endpoint("PUT", "/1/devices/{device_id}"),
+    "get_device_pair_code": Endpoint("GET", "/1/devices/{device_id}/pair"),
+    "get_device_lcg": Endpoint("GET", "/1/devices/{device_id}/lcg"),
+    "get_device_lcg_v2": Endpoint("GET", "/2/devices/{device_id}/lcg"),
+    "get_device_ota_updates": Endpoint("GET", "/1/devices/{device_id}/ota"),
+    # shockers; ``list_shockers`` uses one of the first two
+    "list_device_shockers": Endpoint("GET", "/1/devices/{device_id}/shockers"),
+    "list_own_shockers": Endpoint("GET", "/1/shockers/own"),
+    "list_shared_shockers": Endpoint("GET", "/1/shockers/shared"),
+    "get_shocker": Endpoint("GET", "/1/shockers/{shocker_id}"),
+    "create_shocker": Endpoint("POST", "/1/shockers", _SHOCKER_BODY),
+    "edit_shocker": Endpoint("PATCH", "/1/shockers/{shocker_id}", _SHOCKER_BODY),
+    "delete_shocker": Endpoint("DELETE", "/1/shockers/{shocker_id}"),
+    "pause_shocker": Endpoint(
+        "POST", "/1/shockers/{shocker_id}/pause", {"pause": "paused"}
+    ),
+    "get_shocker_logs": Endpoint(
+        "GET",
+        "/1/shockers/{shocker_id}/logs",
+        query={"offset": "offset", "limit": "limit"},
+    ),
+    "get_logs": Endpoint(
+        "GET",
+        "/1/shockers/logs",
+        query={
+            "page": "page",
+            "pageSize": "page_size",
+            "search": "search",
+            "sort": "sort",
+            "sortDir": "sort_dir",
+            "shockerIds": "shocker_ids",
+        },
+    ),
+    # shares
+    "list_public_shares": Endpoint("GET", "/1/shares/links"),
+    "create_public_share": Endpoint(
+        "POST",
+        "/1/shares/links",
+        {"name": "name", "expiresOn": "expires_on"},
+        optional=True,
+    ),
+    "delete_public_share": Endpoint("DELETE", "/1/shares/links/{public_share_id}"),
+    "get_public_share": Endpoint("GET", "/1/public/shares/links/{public_share_id}"),
+    "add_shocker_to_public_share": Endpoint(
+        "POST", "/1/shares/links/{public_share_id}/{shocker_id}", _SHARE_BODY
+    ),
+    "remove_shocker_from_public_share": Endpoint(
+        "DELETE", "/1/shares/links/{public_share_id}/{shocker_id}"
+    ),
+    "list_shocker_shares": Endpoint("GET", "/1/shockers/{shocker_id}/shares"),
+    "list_user_shares": Endpoint("GET", "/2/shares/user"),
+    "create_share_invite": Endpoint(
+        "POST",
+        "/2/shares/user/invites",
+        {"shockers": "shockers", "user": "user"},
+        optional=True,
+    ),
+    "list_incoming_share_invites": Endpoint("GET", "/2/shares/user/invites/incoming"),
+    "list_outgoing_share_invites": Endpoint("GET", "/2/shares/user/invites/outgoing"),
+    "accept_share_invite": Endpoint(
+        "POST", "/2/shares/user/invites/incoming/{invite_id}"
+    ),
+    "decline_share_invite": Endpoint(
+        "DELETE", "/2/shares/user/invites/incoming/{invite_id}"
+    ),
+    "cancel_share_invite": Endpoint(
+        "DELETE", "/2/shares/user/invites/outgoing/{invite_id}"
+    ),
+    "update_user_shares": Endpoint(
+        "PATCH",
+        "/2/shares/user/{user_id}/shockers",
+        {"shockers": "shockers", **_SHARE_BODY},
+    ),
+    "pause_user_shares": Endpoint(
+        "POST",
+        "/2/shares/user/{user_id}/shockers/pause",
+        {"shockers": "shockers", "paused": "paused"},
+    ),
+    "remove_user_shares": Endpoint(
+        "DELETE", "/2/shares/user/{user_id}/shockers", {"shockers": "shockers"}
+    ),
+    # tokens
+    "list_tokens": Endpoint("GET", "/2/tokens"),
+    "get_token": Endpoint("GET", "/2/tokens/{token_id}"),
+    "get_self_token": Endpoint("GET", "/2/tokens/self"),
+    "create_token": Endpoint(
+        "POST",
+        "/2/tokens",
+        {**_TOKEN_BODY, "validUntil": "valid_until"},
+        optional=True,
+    ),
+    "edit_token": Endpoint("PATCH", "/2/tokens/{token_id}", _TOKEN_BODY),
+    "set_token_paused": Endpoint(
+        "PATCH", "/2/tokens/{token_id}/paused", {"paused": "paused"}
+    ),
+    "delete_token": Endpoint("DELETE", "/1/tokens/{token_id}"),
+    "report_tokens": Endpoint("POST", "/2/tokens/report", {"secrets": "secrets"}),
+    # account / users / sessions
+    "get_self": Endpoint("GET", "/1/users/self"),
+    "get_user_by_name": Endpoint("GET", "/1/users/by-name/{username}"),
+    "list_sessions": Endpoint("GET", "/1/sessions"),
+    "get_self_session": Endpoint("GET", "/1/sessions/self"),
+    "delete_session": Endpoint("DELETE", "/1/sessions/{session_id}"),
+    "logout": Endpoint("POST", "/1/account/logout"),
+    "get_public_stats": Endpoint("GET", "/1/public/stats"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Transport protocol
+# ---------------------------------------------------------------------------
+
+#: Request headers handed to a transport. A ``None`` value means "do not send
+#: this header", even if the underlying HTTP library has a default for it.
+RequestHeaders = Mapping[str, Optional[str]]
+
+
+def get_header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup that also works on a plain dict."""
+    value = headers.get(name)
+    if value is not None:
+        return value
+    lowered = name.lower()
+    for key, candidate in headers.items():
+        if key.lower() == lowered:
+            return candidate
+    return None
+
+
+@dataclass
+class TransportResponse:
+    """What a transport hands back: status, headers and the raw body."""
+
+    status_code: int
+    headers: Mapping[str, str] = field(default_factory=dict)
+    content: bytes = b""
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+@dataclass
+class StreamedResponse:
+    """What a transport's optional ``stream`` yields: status, headers, body.
+
+    ``chunks`` hands out the body piece by piece as it arrives: an iterator
+    of ``bytes`` for a `Transport`, an async iterator for an
+    `AsyncTransport`. Failures while reading raise
+    `OpenShockConnectionError`, as in ``send``.
+    """
+
+    status_code: int
+    headers: Mapping[str, str]
+    chunks: Any
+
+
+class JSONCodec(Protocol):
+    """Encodes request bodies and decodes response bodies.
+
+    ``decode`` must raise `ValueError` for a body that is not valid JSON.
+    """
+
+    content_type: str
+
+    def encode(self, value: Any) -> bytes:
+        ...
+
+    def decode(self, data: bytes) -> Any:
+        ...
+
+
+class Transport(Protocol):
+    """Sends one HTTP request and returns the complete response.
+
+    ``json`` and ``content`` are mutually exclusive request bodies: ``json``
+    is encoded by the transport, ``content`` is sent as-is. Failures to
+    complete the exchange (DNS, connect, TLS, timeouts) must be raised as
+    `OpenShockConnectionError`, so the client can decide whether to retry
+    without knowing which HTTP library sits underneath. ``timeout`` is a
+    number of seconds unless per-phase `Timeouts` were configured.
+
+    A transport may also offer ``stream(method, url, *, headers, params=None,
+    timeout=None)``: a context manager yielding a `StreamedResponse`, used
+    by `OpenShockClient.iter_logs_stream`. Without it the body is read whole
+    with ``send``.
+    """
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class AsyncTransport(Protocol):
+    """`Transport` for `AsyncOpenShockClient`.
+
+    The optional ``stream`` is an async context manager here.
+    """
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Connection pool counters reported by a transport's ``pool_stats()``.
+
+    Attributes:
+        created: Connections opened (a TCP, and TLS, handshake each).
+        reused: Requests sent over an already open connection.
+        discarded: Connections closed by the pool. For the ``requests`` and
+            ``urllib3`` transports these are connections dropped because the
+            pool was full, which means ``pool_maxsize`` is too small; for
+            ``httpx`` every closed connection counts.
+    """
+
+    created: int = 0
+    reused: int = 0
+    discarded: int = 0
+
+
+class PoolCounter:
+    """Thread-safe running totals behind `PoolStats`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {"created": 0, "reused": 0, "discarded": 0}
+
+    def add(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self, **overrides: int) -> PoolStats:
+        with self._lock:
+            counts = dict(self._counts)
+        counts.update(overrides)
+        return PoolStats(**counts)
+
+
+def request_headers(
+    user_agent: str,
+    api_key: Optional[str] = None,
+    session_token: Optional[str] = None,
+) -> Dict[str, Optional[str]]:
+    """Complete header set for one request.
+
+    Every credential header is always present, set to ``None`` when it must
+    not be sent, so nothing a transport keeps as a default can leak through.
+    """
+    headers: Dict[str, Optional[str]] = {
+        "Accept": "application/json",
+        "User-Agent": user_agent,
+        AUTH_HEADER: None,
+        LEGACY_AUTH_HEADER: None,
+        SESSION_HEADER: None,
+    }
+    headers.update(auth_headers(api_key))
+    headers.update(session_headers(session_token))
+    if session_token:
+        headers["Cookie"] = f"{SESSION_COOKIE}={session_token}"
+    return headers
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """Immutable snapshot of the settings every request is built from.
+
+    Clients never edit it in place: each setter swaps in a new snapshot, and
+    each request reads the current one once. A request therefore never mixes
+    a token from before a concurrent `SetAPIKey` with a base URL or session
+    token from after it, and no lock is taken on the request path.
+    """
+
+    base_url: str
+    user_agent: str = ""
+    api_key: Optional[str] = None
+    session_token: Optional[str] = None
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def headers(self, api_key: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """`request_headers` for this snapshot; see the clients' ``_get_headers``."""
+        if not self.user_agent:
+            raise OpenShockValidationError(
+                "User-Agent must be set via SetUA before using the client"
+            )
+        token = self.api_key if api_key is None else (api_key or None)
+        return request_headers(self.user_agent, token, self.session_token)
+
+
+def config_property(name: str, setter: str) -> Any:
+    """Read a `ClientConfig` field; assigning goes through the ``setter``."""
+
+    def fget(self: Any) -> Any:
+        return getattr(self._config, name)
+
+    def fset(self: Any, value: Any) -> None:
+        getattr(self, setter)(value)
+
+    return property(fget, fset, doc=f"Current ``{name}``; assign or use `{setter}`.")
+
+
+def decode_response(
+    resp: TransportResponse, codec: Optional[JSONCodec] = None
+) -> Any:
+    """Turn a response into decoded JSON, or raise the matching error.
+
+    Bodies are decoded with ``codec`` when given, else with ``json``.
+    """
+    loads = resp.json if codec is None else lambda: codec.decode(resp.content)
+    if 200 <= resp.status_code < 300:
+        if resp.content:
+            try:
+                return loads()
+            except ValueError:
+                return None
+        return None
+    try:
+        payload = loads()
+    except Exception:
+        payload = {"message": resp.text}
+    retry_after = parse_retry_after(get_header(resp.headers, "Retry-After"))
+    raise build_api_error(resp.status_code, payload, retry_after)
+
+
+# ---------------------------------------------------------------------------
+# Bulk calls
+# ---------------------------------------------------------------------------
+
+#: Client methods ``batch`` refuses to fan out: they configure or manage the
+#: client itself rather than call an endpoint.
+BATCH_EXCLUDED = frozenset(
+    {
+        "batch",
+        "close",
+        "aclose",
+        "iter_logs",
+        "aiter_logs",
+        "iter_logs_stream",
+        "aiter_logs_stream",
+        "warmup",
+        "pool_stats",
+        "refresh_shocker_cache",
+        "reconcile_controls",
+        "SetUA",
+        "SetBaseURL",
+        "SetAPIKey",
+        "SetSessionToken",
+        "set_user_agent",
+        "set_base_url",
+        "set_api_key",
+        "set_session_token",
+    }
+)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one call made by a client's ``batch``.
+
+    Attributes:
+        index: Position of the call in the input.
+        kwargs: The keyword arguments it was called with.
+        result: What the method returned, when it succeeded.
+        error: The `OpenShockPYError` it raised, if any.
+    """
+
+    index: int
+    kwargs: Mapping[str, Any]
+    result: Any = None
+    error: Optional[OpenShockPYError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """Return `result`, or raise `error`."""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def batch_target(client: Any, method: str, concurrency: int) -> Callable[..., Any]:
+    """Validate ``batch`` arguments and return the bound method to call."""
+    if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+        raise OpenShockValidationError("concurrency must be an integer >= 1")
+    target = None
+    if isinstance(method, str) and not method.startswith("_") and method not in BATCH_EXCLUDED:
+        target = getattr(client, method, None)
+    if not callable(target):
+        raise OpenShockValidationError(f"{method!r} is not an endpoint method")
+    return target
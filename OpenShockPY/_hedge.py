@@ -0,0 +1,109 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Request hedging: a second copy of a slow read, first answer wins.
+
+When an idempotent request has not answered within its endpoint's usual
+p95 latency (or a fixed delay), the client sends the same request again
+and returns whichever response arrives first. The rare request stuck on a
+slow connection then costs about p95 instead of its full latency, for
+roughly 5% more read traffic.
+
+`HedgePolicy` holds the settings and the latency samples; the clients do
+the sending (pool threads for the sync one, tasks for the async one).
+Control requests are never hedged.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+from ._circuit import endpoint_template
+from ._core import CONTROL_PATH, IDEMPOTENT_METHODS, OpenShockValidationError
+
+__all__ = ["HedgePolicy"]
+
+
+class HedgePolicy:
+    """When to send a second copy of a slow idempotent request.
+
+    Args:
+        delay: Fixed seconds to wait for the first response before hedging.
+            Leave None to use the observed ``quantile`` of each endpoint's
+            recent latencies instead.
+        quantile: Which latency quantile triggers a hedge when ``delay`` is
+            None; 0.95 hedges the slowest 5% of requests.
+        initial_delay: The delay used until an endpoint has ``min_samples``
+            latencies recorded.
+        min_samples: Latencies needed before the quantile is trusted.
+        samples: How many recent latencies per endpoint are kept.
+        min_delay: Never hedge sooner than this, however fast the endpoint.
+        methods: Methods that may be hedged; a subset of the idempotent
+            ones. ``PUT`` and ``DELETE`` are idempotent but change state, so
+            they are left out by default.
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        quantile: float = 0.95,
+        initial_delay: float = 0.5,
+        min_samples: int = 20,
+        samples: int = 200,
+        min_delay: float = 0.01,
+        methods: Iterable[str] = ("GET", "HEAD", "OPTIONS"),
+    ) -> None:
+        if delay is not None and delay < 0:
+            raise OpenShockValidationError("delay must be >= 0")
+        if not 0 < quantile < 1:
+            raise OpenShockValidationError("quantile must be between 0 and 1")
+        if initial_delay < 0 or min_delay < 0:
+            raise OpenShockValidationError("delays must be >= 0")
+        if min_samples < 1 or samples < min_samples:
+            raise OpenShockValidationError(
+                "min_samples must be >= 1 and samples >= min_samples"
+            )
+        self.methods = frozenset(m.upper() for m in methods)
+        if not self.methods <= IDEMPOTENT_METHODS:
+            raise OpenShockValidationError(
+                "only idempotent methods can be hedged: "
+                + ", ".join(sorted(IDEMPOTENT_METHODS))
+            )
+        self.delay = delay
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_samples = int(min_samples)
+        self.samples = int(samples)
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def applies(self, method: str, path: str) -> bool:
+        """Whether a request may be hedged. Never true for control requests."""
+        return path != CONTROL_PATH and method.upper() in self.methods
+
+    def delay_for(self, path: str) -> float:
+        """Seconds to wait for the first attempt before sending the hedge."""
+        if self.delay is not None:
+            return max(self.delay, self.min_delay)
+        with self._lock:
+            recent = sorted(self._latencies.get(endpoint_template(path), ()))
+        if len(recent) < self.min_samples:
+            return max(self.initial_delay, self.min_delay)
+        index = min(len(recent) - 1, math.ceil(self.quantile * len(recent)) - 1)
+        return max(recent[index], self.min_delay)
+
+    def observe(self, path: str, seconds: float) -> None:
+        """Record how long a request to ``path`` took to answer."""
+        key = endpoint_template(path)
+        with self._lock:
+            recent = self._latencies.get(key)
+            if recent is None:
+                recent = self._latencies[key] = deque(maxlen=self.samples)
+            recent.append(seconds)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(delay={self.delay}, "
+            f"quantile={self.quantile}, methods={sorted(self.methods)})"
+        )
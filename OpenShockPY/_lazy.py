@@ -0,0 +1,236 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Lazy views over JSON response bodies, decoded only as far as they are read.
+
+``json.loads`` builds the whole tree even when the caller reads one field of
+a 500-entry log page. With ``lazy=True`` the listing methods return a
+`LazyObject` over the response text instead. Looking up a key decodes the
+object's members only up to that key; arrays become `LazyArray` views whose
+entries are decoded one at a time as they are reached, by the same C
+scanner ``json.loads`` uses. A scan that reads each entry and lets it go
+therefore never holds more than one decoded entry besides the text.
+
+Objects inside objects are views too, but the entries of an array are
+decoded whole. Decoded entries are not cached:
+reading one twice decodes it twice and returns two equal, independent
+values. A body that turns out to be invalid JSON raises `ValueError` where
+it is read, not when the response arrives. Views are not thread-safe while
+they are still being scanned.
+"""
+
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+__all__ = ["LazyArray", "LazyObject", "lazy_response"]
+
+_DECODER = json.JSONDecoder()
+_scan = _DECODER.scan_once
+_scanstring = json.decoder.scanstring  # type: ignore[attr-defined]
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _skip(text: str, index: int) -> int:
+    if index < len(text) and text[index] not in " \t\n\r":
+        return index  # compact JSON: skip the regex
+    return _WHITESPACE.match(text, index).end()  # type: ignore[union-attr]
+
+
+def _decode(text: str, index: int) -> Tuple[Any, int]:
+    """Decode the value at ``index`` with the C scanner: ``(value, end)``."""
+    try:
+        return _scan(text, index)
+    except StopIteration as exc:
+        raise json.JSONDecodeError("Expecting value", text, exc.value) from None
+
+
+def _expect(text: str, index: int, chars: str) -> int:
+    """The position of one of ``chars`` at ``index``, after whitespace."""
+    index = _skip(text, index)
+    if index >= len(text) or text[index] not in chars:
+        raise ValueError(f"Expecting one of {chars!r} at char {index}")
+    return index
+
+
+class _View(ABC):
+    __slots__ = ("_text", "_start", "_pos", "_end")
+
+    def __init__(self, text: str, start: int) -> None:
+        self._text = text
+        self._start = start
+        self._pos = start + 1  # where scanning resumes
+        self._end: Optional[int] = None  # just past the closing bracket
+
+    @abstractmethod
+    def _advance(self) -> Any:
+        """Scan one more entry, setting ``_end`` once the closing bracket is read."""
+
+    def _finish(self) -> int:
+        """Scan to the closing bracket and return the position after it."""
+        while self._end is None:
+            self._advance()
+        return self._end
+
+    def to_python(self) -> Any:
+        """Decode the whole value into plain dicts and lists."""
+        return _decode(self._text, self._start)[0]
+
+
+def _value_at(text: str, index: int) -> Tuple[Any, int]:
+    """The value at ``index``, as a view for objects and arrays, and its end.
+
+    The end of a view is only known once it has been scanned, so it is
+    returned as -1 and found with `_View._finish` when needed.
+    """
+    char = text[index] if index < len(text) else ""
+    if char == "{":
+        return LazyObject(text, index), -1
+    if char == "[":
+        return LazyArray(text, index), -1
+    return _decode(text, index)
+
+
+class LazyArray(_View, Sequence[Any]):
+    """A JSON array whose entries are decoded one by one when read."""
+
+    __slots__ = ("_offsets",)
+
+    def __init__(self, text: str, start: int) -> None:
+        super().__init__(text, start)
+        self._offsets: List[int] = []
+
+    def _advance(self) -> Tuple[bool, Any]:
+        """Decode the next entry: ``(True, value)``, or ``(False, None)`` at the end."""
+        if self._end is not None:
+            return False, None
+        text = self._text
+        index = self._pos
+        if self._offsets and text.startswith(",", index):
+            index = _skip(text, index + 1)  # the usual case, kept short
+        else:
+            index = _skip(text, index)
+            if self._offsets or text.startswith("]", index):
+                index = _expect(text, index, ",]")
+                if text[index] == "]":
+                    self._end = index + 1
+                    return False, None
+                index = _skip(text, index + 1)
+        value, end = _decode(text, index)
+        self._offsets.append(index)
+        self._pos = end
+        return True, value
+
+    def __iter__(self) -> Iterator[Any]:
+        # By position, so indexing ahead while iterating skips nothing.
+        index = 0
+        while True:
+            if index < len(self._offsets):
+                yield _decode(self._text, self._offsets[index])[0]
+            else:
+                found, value = self._advance()
+                if not found:
+                    return
+                yield value
+            index += 1
+
+    def __len__(self) -> int:
+        self._finish()
+        return len(self._offsets)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        while index >= len(self._offsets) and self._advance()[0]:
+            pass
+        if not 0 <= index < len(self._offsets):
+            raise IndexError("LazyArray index out of range")
+        return _decode(self._text, self._offsets[index])[0]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, LazyArray)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        scanned = "" if self._end is None else f", {len(self._offsets)} entries"
+        return f"{type(self).__name__}(at {self._start}{scanned})"
+
+
+class LazyObject(_View, Mapping[str, Any]):
+    """A JSON object whose members are decoded up to the key being read."""
+
+    __slots__ = ("_members", "_keys", "_last")
+
+    def __init__(self, text: str, start: int = 0) -> None:
+        super().__init__(text, start)
+        self._members: Dict[str, Any] = {}
+        self._keys: List[str] = []  # in order, for iteration by position
+        # The view decoded last, whose end is needed to scan further.
+        self._last: Optional[_View] = None
+
+    def _advance(self) -> Optional[str]:
+        """Scan the next member and return its key, or None at the end."""
+        if self._end is not None:
+            return None
+        text = self._text
+        if self._last is not None:
+            self._pos = self._last._finish()
+            self._last = None
+        index = _skip(text, self._pos)
+        if self._members or (index < len(text) and text[index] == "}"):
+            index = _expect(text, index, ",}")
+            if text[index] == "}":
+                self._end = index + 1
+                return None
+            index = _skip(text, index + 1)
+        index = _expect(text, index, '"')
+        key, index = _scanstring(text, index + 1)
+        index = _skip(text, _expect(text, index, ":") + 1)
+        value, end = _value_at(text, index)
+        if key not in self._members:
+            self._keys.append(key)
+        self._members[key] = value
+        if end < 0:
+            self._last = value
+        else:
+            self._pos = end
+        return key
+
+    def __getitem__(self, key: str) -> Any:
+        while key not in self._members:
+            if self._advance() is None:
+                raise KeyError(key)
+        return self._members[key]
+
+    def __iter__(self) -> Iterator[str]:
+        # By position, so looking up a later key while iterating skips nothing.
+        index = 0
+        while True:
+            while index >= len(self._keys):
+                if self._advance() is None:
+                    return
+            yield self._keys[index]
+            index += 1
+
+    def __len__(self) -> int:
+        self._finish()
+        return len(self._members)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(keys={list(self._members)}...)"
+
+
+def lazy_response(content: bytes) -> Any:
+    """A lazy view of a response body; scalars and empty bodies are decoded."""
+    if not content:
+        return None
+    text = content.decode("utf-8")
+    index = _skip(text, 0)
+    if text.startswith(("{", "["), index):
+        return _value_at(text, index)[0]
+    return json.loads(text)
@@ -0,0 +1,158 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Compact, read-only records for large listing responses.
+
+A decoded listing is a dict per shocker and hub, each with its own hash
+table and key strings. With ``typed_responses=True`` the clients turn the
+entries of the shocker and hub listings into slotted records instead:
+values sit in fixed slots, and ids, hub ids and model names are interned so
+repeated values share one string. That saves the per-entry dict overhead;
+the unique id and timestamp strings remain, so how much a listing shrinks
+depends on its contents.
+
+Records stay compatible with code written for dicts: they are read-only
+`Mapping` objects keyed by the API's field names, so ``shocker["id"]``,
+``.get``, ``in``, iteration and ``==`` against a dict all work. Fields this
+version does not know about are kept as they were decoded. Records are
+not `dict` subclasses, so ``json.dumps`` and other code that checks for
+``dict`` reject them; `to_dict` returns plain, mutable dicts again.
+"""
+
+import re
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+__all__ = ["ShockerRecord", "DeviceRecord", "compact_listing"]
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+    def __reduce__(self) -> str:
+        return "_MISSING"
+
+
+#: Slot value of a field the response did not include.
+_MISSING: Any = _Missing()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Record(Mapping[str, Any]):
+    """Base of the slotted records: a read-only mapping over fixed fields."""
+
+    __slots__ = ("_extra",)
+    #: JSON field names, one slot each.
+    _fields: Tuple[str, ...] = ()
+    #: Fields whose string values repeat across a listing.
+    _interned: frozenset = frozenset()
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        extra: Optional[Dict[str, Any]] = None
+        for key in self._fields:
+            value = data.get(key, _MISSING)
+            if key in self._interned:
+                value = _intern(value)
+            object.__setattr__(self, key, value)
+        for key, value in data.items():
+            if key not in self._fields:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(self, "_extra", extra)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only; see to_dict")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._fields:
+            if getattr(self, key) is not _MISSING:
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        present = sum(getattr(self, key) is not _MISSING for key in self._fields)
+        return present + (len(self._extra) if self._extra is not None else 0)
+
+    def __reduce__(self) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+        # Rebuild through __init__, since __setattr__ is blocked.
+        return (type(self), (dict(self.items()),))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict copy, with nested records converted too."""
+        return {
+            key: (
+                [v.to_dict() if isinstance(v, _Record) else v for v in value]
+                if isinstance(value, list)
+                else value
+            )
+            for key, value in self.items()
+        }
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class ShockerRecord(_Record):
+    """A `Shocker` held in slots; read it like the dict it replaces."""
+
+    __slots__ = ("id", "name", "rfId", "model", "isPaused", "createdOn", "device")
+    _fields = __slots__
+    _interned = frozenset({"id", "model", "device"})
+
+
+class DeviceRecord(_Record):
+    """A `Device` (hub) held in slots, its ``shockers`` as `ShockerRecord`."""
+
+    __slots__ = ("id", "name", "createdOn", "shockers")
+    _fields = __slots__
+    _interned = frozenset({"id"})
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        shockers = data.get("shockers")
+        if isinstance(shockers, list):
+            data = dict(data, shockers=_records(ShockerRecord, shockers))
+        super().__init__(data)
+
+
+RecordType = Callable[[Mapping[str, Any]], _Record]
+
+
+def _records(kind: RecordType, entries: List[Any]) -> List[Any]:
+    return [kind(entry) if isinstance(entry, Mapping) else entry for entry in entries]
+
+
+#: Listing endpoints and the record type of their ``data`` entries.
+_LISTINGS: Tuple[Tuple["re.Pattern[str]", RecordType], ...] = (
+    (re.compile(r"/1/shockers/own"), DeviceRecord),
+    (re.compile(r"/1/devices"), DeviceRecord),
+    (re.compile(r"/1/devices/[^/]+/shockers"), ShockerRecord),
+)
+
+
+def compact_listing(path: str, response: Any) -> Any:
+    """``response`` with its ``data`` entries as records, for listing paths.
+
+    Other paths and unexpected shapes are returned unchanged.
+    """
+    if not isinstance(response, dict) or not isinstance(response.get("data"), list):
+        return response
+    for pattern, kind in _LISTINGS:
+        if pattern.fullmatch(path):
+            return dict(response, data=_records(kind, response["data"]))
+    return response
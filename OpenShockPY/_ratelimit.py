@@ -0,0 +1,284 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Client-side token-bucket rate limiting that adapts to HTTP 429s.
+
+A `RateLimiter` hands out request slots at a target rate. When the API
+answers 429 anyway, the limiter halves its rate and, if the response said
+how long to back off, holds every caller until then - not just the one that
+got the 429. Afterwards the rate climbs back to the target linearly over
+``recovery`` seconds.
+
+One limiter may be shared by any number of clients, threads and event loops
+(for example every client using the same API token), since the bookkeeping
+is a reservation under a lock and the waiting happens outside it.
+`SQLiteRateLimiter` keeps the same bucket in a file, to share it between
+processes.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional, Union
+
+from ._core import OpenShockDeadlineExceededError, OpenShockValidationError
+
+__all__ = ["RateLimiter", "SQLiteRateLimiter"]
+
+
+def _check_wait(wait: float, timeout: Optional[float]) -> None:
+    if timeout is not None and wait > timeout:
+        raise OpenShockDeadlineExceededError(
+            f"Rate limiter wait of {wait:.3g}s would pass the deadline"
+        )
+
+
+@dataclass
+class BucketState:
+    """Mutable state of one bucket; what a shared backend has to persist."""
+
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    # Rate right after the last 429 (0 when none), and when it happened.
+    floor: float = 0.0
+    penalized_at: float = 0.0
+
+
+class RateLimiter:
+    """Adaptive token bucket shared by every request it is attached to.
+
+    Args:
+        rate: Target requests per second.
+        burst: How many requests may go out back to back after an idle
+            spell. Defaults to ``rate`` (at least 1).
+        min_rate: Floor the rate never drops below after 429s. Defaults to a
+            tenth of ``rate``.
+        decrease: Factor the rate is multiplied by on every 429.
+        recovery: Seconds to climb back from the reduced rate to ``rate``
+            once 429s stop.
+        clock: Clock in seconds, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        decrease: float = 0.5,
+        recovery: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise OpenShockValidationError("rate must be greater than 0")
+        if not 0 < decrease < 1:
+            raise OpenShockValidationError("decrease must be between 0 and 1")
+        if recovery < 0:
+            raise OpenShockValidationError("recovery must be >= 0")
+        self.target_rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(1.0, self.target_rate)
+        if self.burst < 1:
+            raise OpenShockValidationError("burst must be >= 1")
+        self.min_rate = min(
+            self.target_rate,
+            float(min_rate) if min_rate is not None else self.target_rate / 10,
+        )
+        self.decrease = decrease
+        self.recovery = recovery
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bucket = self._initial_state()
+
+    def _initial_state(self) -> BucketState:
+        return BucketState(tokens=self.burst, updated=self._clock())
+
+    @contextmanager
+    def _state(self) -> Iterator[BucketState]:
+        """Exclusive access to the bucket for one read-modify-write."""
+        with self._lock:
+            yield self._bucket
+
+    def _rate_at(self, state: BucketState, now: float) -> float:
+        if not state.floor or state.floor >= self.target_rate or self.recovery == 0:
+            return self.target_rate
+        progress = (now - state.penalized_at) / self.recovery
+        if progress >= 1:
+            state.floor = 0.0
+            return self.target_rate
+        return state.floor + (self.target_rate - state.floor) * max(0.0, progress)
+
+    def _refill(self, state: BucketState, now: float) -> float:
+        # Tokens may be negative: each one below zero is a reservation
+        # somebody is already waiting out.
+        rate = self._rate_at(state, now)
+        elapsed = max(0.0, now - state.updated)
+        state.tokens = min(self.burst, state.tokens + elapsed * rate)
+        state.updated = max(state.updated, now)
+        return rate
+
+    @property
+    def rate(self) -> float:
+        """The current requests-per-second rate."""
+        with self._state() as state:
+            return self._rate_at(state, self._clock())
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """Take one slot and return how many seconds to wait before using it.
+
+        With ``max_wait``, a slot that needs a longer wait is given back
+        rather than taken; the wait is returned all the same.
+        """
+        with self._state() as state:
+            now = self._clock()
+            rate = self._refill(state, now)
+            state.tokens -= 1
+            # Slots queue up behind a Retry-After block rather than all
+            # coming due the moment it ends.
+            wait = max(0.0, state.blocked_until - now)
+            wait += max(0.0, -state.tokens) / rate
+            if max_wait is not None and wait > max_wait:
+                state.tokens += 1
+            return wait
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """Block until a request may be sent. Returns the seconds waited.
+
+        Raises:
+            OpenShockDeadlineExceededError: If that would take longer than
+                ``timeout`` seconds. No slot is taken then.
+        """
+        wait = self.reserve(timeout)
+        _check_wait(wait, timeout)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, timeout: Optional[float] = None) -> float:
+        """`acquire` for coroutines: waits without blocking the loop."""
+        wait = self.reserve(timeout)
+        _check_wait(wait, timeout)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Record a 429: cut the rate and honour ``Retry-After`` for everyone."""
+        with self._state() as state:
+            now = self._clock()
+            rate = self._refill(state, now)
+            state.floor = max(self.min_rate, rate * self.decrease)
+            state.penalized_at = now
+            if not retry_after:
+                state.tokens = min(state.tokens, 0.0)
+                return
+            state.blocked_until = max(state.blocked_until, now + retry_after)
+            # Nothing builds up during the block: the bucket restarts at its
+            # end with one slot, less any reservations that run past it, and
+            # hands out the rest at the reduced rate.
+            elapsed = max(0.0, state.blocked_until - state.updated)
+            state.tokens = min(1.0, state.tokens + elapsed * state.floor)
+            state.updated = max(state.updated, state.blocked_until)
+
+    async def apenalize(self, retry_after: Optional[float] = None) -> None:
+        """`penalize` for coroutines."""
+        self.penalize(retry_after)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(rate={self.rate:.3g}, "
+            f"target_rate={self.target_rate:.3g})"
+        )
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """`RateLimiter` whose bucket lives in a SQLite file shared by processes.
+
+    Every worker that opens the same ``path`` and ``key`` draws from one
+    bucket, so a fleet of processes on one token stays under the limit
+    together, and a ``Retry-After`` seen by any of them pauses all of them.
+    Each reservation is one short ``BEGIN IMMEDIATE`` transaction, which
+    SQLite serializes across processes; the file must be on a local disk.
+
+    The clock defaults to wall time, since monotonic clocks are not
+    comparable between processes. Give every process the same settings.
+    The async methods run the transaction on a worker thread, so a busy
+    database file never stalls the event loop.
+
+    Args:
+        path: SQLite database file; created if missing.
+        rate: Target requests per second, for the fleet as a whole.
+        key: Bucket name, so several limits can share one file.
+        **kwargs: The other `RateLimiter` settings.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        key: str = "default",
+        clock: Callable[[], float] = time.time,
+        **kwargs: Any,
+    ) -> None:
+        self.path = str(path)
+        self.key = key
+        super().__init__(rate, clock=clock, **kwargs)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS openshock_rate_limits ("
+                "key TEXT PRIMARY KEY, tokens REAL, updated REAL, "
+                "blocked_until REAL, floor REAL, penalized_at REAL)"
+            )
+
+    def _connect(self) -> "closing[sqlite3.Connection]":
+        # Autocommit mode, so transactions are exactly the BEGINs below.
+        return closing(
+            sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        )
+
+    @contextmanager
+    def _state(self) -> Iterator[BucketState]:
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tokens, updated, blocked_until, floor, penalized_at "
+                    "FROM openshock_rate_limits WHERE key = ?",
+                    (self.key,),
+                ).fetchone()
+                state = BucketState(*row) if row else self._initial_state()
+                yield state
+                conn.execute(
+                    "INSERT OR REPLACE INTO openshock_rate_limits "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self.key,
+                        state.tokens,
+                        state.updated,
+                        state.blocked_until,
+                        state.floor,
+                        state.penalized_at,
+                    ),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    async def aacquire(self, timeout: Optional[float] = None) -> float:
+        wait = await asyncio.to_thread(self.reserve, timeout)
+        _check_wait(wait, timeout)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    async def apenalize(self, retry_after: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.penalize, retry_after)
+
+
+def as_limiter(value: Union[float, RateLimiter, None]) -> Optional[RateLimiter]:
+    """Accept a `RateLimiter`, a plain rate in requests per second, or None."""
+    if value is None or isinstance(value, RateLimiter):
+        return value
+    return RateLimiter(value)
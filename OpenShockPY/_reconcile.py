@@ -0,0 +1,247 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Finding out whether a control was delivered after an ambiguous failure.
+
+A control POST that times out or gets a 5xx may or may not have reached the
+shocker, so the clients never replay it blindly. With a `ControlReconciler`
+they instead read back the targeted shockers' logs, look for an entry with
+the same type, intensity, duration and custom name close to when the
+control was sent, and re-send only the controls the logs show were not
+delivered.
+
+The polling itself lives in the clients (threads for the sync one, tasks
+for the async one); this module holds the settings and the matching, which
+do no I/O.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set
+
+from ._core import (
+    Control,
+    OpenShockConnectionError,
+    OpenShockPYError,
+    OpenShockServerError,
+    OpenShockValidationError,
+)
+
+__all__ = ["ControlReconciler", "ReconcileResult"]
+
+
+def is_ambiguous_failure(exc: OpenShockPYError) -> bool:
+    """Whether ``exc`` leaves it unknown if a control request took effect."""
+    if isinstance(exc, OpenShockServerError):
+        return True
+    # The subclasses (open circuit, passed deadline) are raised before
+    # sending, and a control is only ever retried after unambiguous failures.
+    return type(exc) is OpenShockConnectionError and exc.request_sent is not False
+
+
+def parse_log_time(value: Any) -> Optional[float]:
+    """A log ``createdOn`` as a Unix timestamp, or None when unparseable.
+
+    The API sends ISO 8601 in UTC, sometimes with 7 fractional digits,
+    which `datetime.fromisoformat` rejects before Python 3.11.
+    """
+    if not isinstance(value, str) or not value:
+        return None
+    text = value.strip()
+    if text.endswith(("Z", "z")):
+        text = text[:-1] + "+00:00"
+    if "." in text:
+        head, _, rest = text.partition(".")
+        digits = len(rest) - len(rest.lstrip("0123456789"))
+        text = f"{head}.{rest[:digits][:6]}{rest[digits:]}"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _entry_key(entry: Mapping[str, Any]) -> Any:
+    # Polls return fresh objects, so identify entries by their log id.
+    return entry.get("id") or id(entry)
+
+
+def log_entries(response: Any) -> List[Mapping[str, Any]]:
+    """The log entries in a ``get_shocker_logs`` response."""
+    data = response.get("data") if isinstance(response, Mapping) else response
+    if not isinstance(data, list):
+        return []
+    return [entry for entry in data if isinstance(entry, Mapping)]
+
+
+@dataclass(frozen=True)
+class ReconcileResult:
+    """What the logs said about one control.
+
+    Attributes:
+        control: The control that was sent.
+        delivered: True when a matching log entry was found; False when the
+            shocker's logs were read but showed none within the polling
+            budget; None when its logs could not be read at all.
+        log: The matching log entry, when one was found.
+    """
+
+    control: Control
+    delivered: Optional[bool]
+    log: Optional[Mapping[str, Any]] = None
+
+
+class ControlReconciler:
+    """Settings for checking the shocker logs after ambiguous failures.
+
+    Args:
+        max_polls: How many times each shocker's logs are read before a
+            control without a matching entry counts as not delivered.
+        poll_interval: Seconds between polls.
+        clock_skew: Seconds a log entry may be timestamped before the
+            control was sent, to allow for clock differences.
+        window: Seconds after sending within which a matching entry counts.
+        page_size: How many of the newest log entries each poll reads.
+        concurrency: Shockers whose logs are read at once.
+        resend: Re-send the controls the logs show were not delivered. With
+            False the original error is raised instead, as without a
+            reconciler, unless every control was delivered.
+    """
+
+    def __init__(
+        self,
+        max_polls: int = 5,
+        poll_interval: float = 1.0,
+        clock_skew: float = 5.0,
+        window: float = 60.0,
+        page_size: int = 20,
+        concurrency: int = 8,
+        resend: bool = True,
+    ) -> None:
+        if max_polls < 1:
+            raise OpenShockValidationError("max_polls must be >= 1")
+        if poll_interval < 0 or clock_skew < 0 or window <= 0:
+            raise OpenShockValidationError(
+                "poll_interval and clock_skew must be >= 0 and window > 0"
+            )
+        if page_size < 1 or concurrency < 1:
+            raise OpenShockValidationError("page_size and concurrency must be >= 1")
+        self.max_polls = int(max_polls)
+        self.poll_interval = poll_interval
+        self.clock_skew = clock_skew
+        self.window = window
+        self.page_size = int(page_size)
+        self.concurrency = int(concurrency)
+        self.resend = resend
+
+    def matches(
+        self,
+        entry: Mapping[str, Any],
+        control: Control,
+        custom_name: Optional[str],
+        sent_at: float,
+    ) -> bool:
+        """Whether log ``entry`` records ``control`` sent at ``sent_at``."""
+        if entry.get("type") != control.get("type"):
+            return False
+        if control.get("type") != "Stop" and (
+            entry.get("intensity") != control.get("intensity")
+            or entry.get("duration") != control.get("duration")
+        ):
+            return False
+        controlled_by = entry.get("controlledBy") or {}
+        if (controlled_by.get("customName") or None) != (custom_name or None):
+            return False
+        created = parse_log_time(entry.get("createdOn"))
+        return (
+            created is not None
+            and sent_at - self.clock_skew <= created <= sent_at + self.window
+        )
+
+    def begin(
+        self,
+        controls: Sequence[Control],
+        custom_name: Optional[str],
+        sent_at: float,
+    ) -> "Reconciliation":
+        """Start reconciling ``controls``, sent at ``sent_at`` (Unix time)."""
+        return Reconciliation(self, controls, custom_name, sent_at)
+
+    def to_resend(self, results: Sequence[ReconcileResult]) -> Optional[List[Control]]:
+        """The controls to re-send, or None when the original error stands.
+
+        Nothing is re-sent while any shocker's logs were unreadable, since
+        its control might have landed.
+        """
+        if any(result.delivered is None for result in results):
+            return None
+        missing = [result.control for result in results if not result.delivered]
+        if missing and not self.resend:
+            return None
+        return missing
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(max_polls={self.max_polls}, "
+            f"poll_interval={self.poll_interval}, resend={self.resend})"
+        )
+
+
+class Reconciliation:
+    """One reconciliation in progress: which controls are still unmatched."""
+
+    def __init__(
+        self,
+        reconciler: ControlReconciler,
+        controls: Sequence[Control],
+        custom_name: Optional[str],
+        sent_at: float,
+    ) -> None:
+        self.reconciler = reconciler
+        self.controls = list(controls)
+        self.custom_name = custom_name
+        self.sent_at = sent_at
+        self._found: Dict[int, Mapping[str, Any]] = {}
+        self._read: Set[str] = set()
+
+    def pending_shockers(self) -> List[str]:
+        """Shockers that still have a control without a matching log entry."""
+        pending: Dict[str, None] = {}
+        for index, control in enumerate(self.controls):
+            if index not in self._found:
+                pending[str(control.get("id"))] = None
+        return list(pending)
+
+    def update(
+        self, shocker_id: str, entries: Optional[Sequence[Mapping[str, Any]]]
+    ) -> None:
+        """Match one shocker's newest log ``entries``; None if unreadable."""
+        if entries is None:
+            return
+        self._read.add(shocker_id)
+        claimed = {_entry_key(entry) for entry in self._found.values()}
+        for index, control in enumerate(self.controls):
+            if index in self._found or str(control.get("id")) != shocker_id:
+                continue
+            for entry in entries:
+                key = _entry_key(entry)
+                if key not in claimed and self.reconciler.matches(
+                    entry, control, self.custom_name, self.sent_at
+                ):
+                    self._found[index] = entry
+                    claimed.add(key)
+                    break
+
+    def results(self) -> List[ReconcileResult]:
+        """One `ReconcileResult` per control, in the order they were sent."""
+        results = []
+        for index, control in enumerate(self.controls):
+            entry = self._found.get(index)
+            if entry is not None:
+                results.append(ReconcileResult(control, True, entry))
+            elif str(control.get("id")) in self._read:
+                results.append(ReconcileResult(control, False))
+            else:
+                results.append(ReconcileResult(control, None))
+        return results
@@ -0,0 +1,355 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Retry, backoff and deadline machinery shared by both clients.
+
+How long to wait before a retry (`retry_delay` and the `BackoffStrategy`
+implementations), how many retries a client may spend (`RetryBudget`), and
+how much time a call has left: the per-endpoint-class timeouts, the
+`request_timeout` and `deadline` blocks that follow `contextvars`, and the
+checks the request loops make against them. Like `_core`, nothing in here
+performs I/O.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, Mapping, Optional, Protocol, Union
+
+from ._core import (
+    CONTROL_PATH,
+    DEFAULT_TIMEOUT,
+    OpenShockDeadlineExceededError,
+    OpenShockValidationError,
+    Timeouts,
+)
+
+__all__ = [
+    "BackoffStrategy",
+    "DecorrelatedJitterBackoff",
+    "EqualJitterBackoff",
+    "ExponentialBackoff",
+    "FullJitterBackoff",
+    "RetryBudget",
+    "RetryBudgetStats",
+    "deadline",
+    "request_timeout",
+    "retry_delay",
+]
+
+
+class BackoffStrategy(Protocol):
+    """How long to sleep before a retry when the server gave no Retry-After.
+
+    ``attempt`` is 0 for the first retry; ``previous`` is the delay used
+    before the previous retry of the same request, or None for the first.
+    """
+
+    def delay(self, attempt: int, previous: Optional[float] = None) -> float:
+        ...
+
+
+class ExponentialBackoff:
+    """``base * 2**attempt``, capped at ``max_delay``. No jitter; the default."""
+
+    def __init__(self, base: float = 0.5, max_delay: float = 30.0) -> None:
+        self.base = base
+        self.max_delay = max_delay
+
+    def _ceiling(self, attempt: int) -> float:
+        return min(self.base * (2**attempt), self.max_delay)
+
+    def delay(self, attempt: int, previous: Optional[float] = None) -> float:
+        return self._ceiling(attempt)
+
+
+class _JitteredBackoff(ExponentialBackoff):
+    def __init__(
+        self, base: float = 0.5, max_delay: float = 30.0, seed: Optional[int] = None
+    ) -> None:
+        super().__init__(base, max_delay)
+        # A private generator, so a seed makes a client's delays reproducible.
+        self._random = random.Random(seed)  # jitter, not crypto  # nosec B311
+
+
+class FullJitterBackoff(_JitteredBackoff):
+    """Uniform in ``[0, base * 2**attempt]``: spreads retries the most."""
+
+    def delay(self, attempt: int, previous: Optional[float] = None) -> float:
+        return self._random.uniform(0, self._ceiling(attempt))
+
+
+class EqualJitterBackoff(_JitteredBackoff):
+    """Half the exponential delay, plus up to that much again at random.
+
+    Never retries sooner than half the plain exponential delay.
+    """
+
+    def delay(self, attempt: int, previous: Optional[float] = None) -> float:
+        half = self._ceiling(attempt) / 2
+        return half + self._random.uniform(0, half)
+
+
+class DecorrelatedJitterBackoff(_JitteredBackoff):
+    """Uniform in ``[base, previous * 3]``, capped at ``max_delay``.
+
+    Grows from the delay actually used last time rather than from the
+    attempt number, so clients that started together drift apart.
+    """
+
+    def delay(self, attempt: int, previous: Optional[float] = None) -> float:
+        upper = max(self.base, (previous or self.base) * 3)
+        return min(self.max_delay, self._random.uniform(self.base, upper))
+
+
+def retry_delay(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    backoff_factor: float = 0.5,
+    max_delay: float = 30.0,
+    strategy: Optional[BackoffStrategy] = None,
+    previous: Optional[float] = None,
+) -> float:
+    """Seconds to wait before retry number ``attempt`` (0-based).
+
+    A server supplied ``Retry-After`` always wins over the backoff, which is
+    ``strategy`` when given and plain exponential from ``backoff_factor``
+    otherwise.
+    """
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    if strategy is not None:
+        return min(strategy.delay(attempt, previous), max_delay)
+    return min(backoff_factor * (2**attempt), max_delay)
+
+
+@dataclass(frozen=True)
+class RetryBudgetStats:
+    """Totals reported by `RetryBudget.stats`, since the budget was created.
+
+    Attributes:
+        requests: First attempts recorded.
+        retries: Retries the budget allowed.
+        suppressed: Retries refused because the budget was spent; each of
+            these surfaced its error to the caller straight away.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    suppressed: int = 0
+
+
+class RetryBudget:
+    """Caps retries at a fraction of recent first attempts, client-wide.
+
+    Within any ``window`` seconds, retries may not exceed ``ratio`` times
+    the first attempts in that window plus ``min_per_second`` per second.
+    During an outage almost every request fails; without a budget each one
+    is retried ``max_retries`` times, multiplying traffic exactly when the
+    backend is weakest. With one, load stays within ``1 + ratio`` of normal.
+    The floor keeps retries working for clients that only send a trickle.
+    Safe to share between threads and clients.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 0.1,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ratio < 0:
+            raise OpenShockValidationError("ratio must be >= 0")
+        if min_per_second < 0:
+            raise OpenShockValidationError("min_per_second must be >= 0")
+        if window <= 0:
+            raise OpenShockValidationError("window must be greater than 0")
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._totals = [0, 0, 0]
+
+    def _prune(self, now: float) -> None:
+        horizon = now - self.window
+        for times in (self._requests, self._retries):
+            while times and times[0] <= horizon:
+                times.popleft()
+
+    def record_request(self) -> None:
+        """Count a first attempt, which earns ``ratio`` of a retry."""
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            self._requests.append(now)
+            self._totals[0] += 1
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False when it is spent."""
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            allowed = self.ratio * len(self._requests) + self.min_per_second * self.window
+            if len(self._retries) + 1 > allowed:
+                self._totals[2] += 1
+                return False
+            self._retries.append(now)
+            self._totals[1] += 1
+            return True
+
+    def stats(self) -> RetryBudgetStats:
+        """Lifetime totals of first attempts, retries and suppressed retries."""
+        with self._lock:
+            return RetryBudgetStats(*self._totals)
+
+
+#: Endpoint classes ``endpoint_timeouts`` configures: control requests,
+#: single-resource lookups and listings, and bulk pulls such as log pages.
+ENDPOINT_CLASSES = ("control", "lookup", "bulk")
+
+
+def endpoint_class(path: str) -> str:
+    """The `ENDPOINT_CLASSES` entry whose timeouts a request to ``path`` uses."""
+    if path == CONTROL_PATH:
+        return "control"
+    if path.endswith("/logs"):
+        return "bulk"
+    return "lookup"
+
+
+def resolve_endpoint_timeouts(
+    timeout: Union[float, Timeouts],
+    overrides: Optional[Mapping[str, Union[float, Timeouts]]] = None,
+) -> Dict[str, Timeouts]:
+    """Fully specified `Timeouts` for each endpoint class.
+
+    Every class defaults to ``timeout``; ``overrides`` replaces the phases
+    it sets for the classes it names.
+
+    Raises:
+        OpenShockValidationError: For a class not in `ENDPOINT_CLASSES`.
+    """
+    base = Timeouts.of(timeout).over(Timeouts.of(DEFAULT_TIMEOUT))
+    resolved = {name: base for name in ENDPOINT_CLASSES}
+    for name, value in (overrides or {}).items():
+        if name not in resolved:
+            raise OpenShockValidationError(
+                f"Unknown endpoint class {name!r}; expected one of "
+                + ", ".join(ENDPOINT_CLASSES)
+            )
+        resolved[name] = Timeouts.of(value).over(base)
+    return resolved
+
+
+_TIMEOUTS: ContextVar[Optional[Timeouts]] = ContextVar(
+    "openshock_timeouts", default=None
+)
+
+
+@contextmanager
+def request_timeout(value: Union[float, Timeouts]) -> Iterator[Timeouts]:
+    """Override the timeouts of every request made inside the block.
+
+    A plain number replaces every phase; phases left unset in a `Timeouts`
+    keep the endpoint class's value. Like `deadline`, the override follows
+    `contextvars`. Nested blocks layer over the outer one.
+    """
+    override = Timeouts.of(value)
+    outer = _TIMEOUTS.get()
+    if outer is not None:
+        override = override.over(outer)
+    token = _TIMEOUTS.set(override)
+    try:
+        yield override
+    finally:
+        _TIMEOUTS.reset(token)
+
+
+def call_timeouts(configured: Timeouts) -> Timeouts:
+    """``configured`` with any enclosing `request_timeout` layered on top."""
+    override = _TIMEOUTS.get()
+    return configured if override is None else override.over(configured)
+
+
+#: Monotonic time the calls in the current context must finish by.
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("openshock_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """Bound every request made inside the block to ``seconds`` in total.
+
+    Covers every attempt, backoff sleep and rate limiter wait of every call
+    in the block, sync or async. Nested blocks keep the earlier deadline.
+    Yields the deadline as a `time.monotonic` timestamp.
+
+    Raises:
+        OpenShockValidationError: If ``seconds`` is not positive.
+    """
+    if seconds <= 0:
+        raise OpenShockValidationError("deadline must be greater than 0")
+    expires = time.monotonic() + seconds
+    outer = _DEADLINE.get()
+    if outer is not None:
+        expires = min(expires, outer)
+    token = _DEADLINE.set(expires)
+    try:
+        yield expires
+    finally:
+        _DEADLINE.reset(token)
+
+
+def call_deadline(client_deadline: Optional[float]) -> Optional[float]:
+    """When the call starting now must finish, or None for no deadline.
+
+    The sooner of the enclosing `deadline` block and ``client_deadline``
+    seconds from now.
+    """
+    expires = _DEADLINE.get()
+    if client_deadline is not None:
+        own = time.monotonic() + client_deadline
+        expires = own if expires is None else min(expires, own)
+    return expires
+
+
+def attempt_timeout(
+    timeouts: Timeouts, expires: Optional[float]
+) -> Union[float, Timeouts, None]:
+    """The timeout to hand the transport, trimmed to the deadline if any.
+
+    Raises:
+        OpenShockDeadlineExceededError: If the deadline has already passed.
+    """
+    if expires is not None:
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            raise OpenShockDeadlineExceededError("Deadline exceeded before sending")
+        timeouts = timeouts.capped(remaining)
+    return timeouts.simplify()
+
+
+#: Least time, in seconds, worth giving one attempt. A retry that would be
+#: left with less before the deadline is skipped.
+MIN_ATTEMPT_TIME = 0.1
+
+
+def time_left(expires: Optional[float]) -> Optional[float]:
+    """Seconds until ``expires`` (never negative), or None for no deadline."""
+    return None if expires is None else max(0.0, expires - time.monotonic())
+
+
+def fits_deadline(expires: Optional[float], delay: float, needed: float = 0.0) -> bool:
+    """Whether a retry after ``delay`` seconds could still finish in time.
+
+    ``needed`` is how long the attempt is expected to take, such as the
+    duration of the one that just failed; at least `MIN_ATTEMPT_TIME`.
+    """
+    if expires is None:
+        return True
+    return time.monotonic() + delay + max(needed, MIN_ATTEMPT_TIME) <= expires
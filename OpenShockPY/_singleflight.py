@@ -0,0 +1,175 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Single-flight GETs: identical concurrent reads share one request.
+
+When several callers ask for the same resource at the same moment (a
+dashboard refreshing every widget, many tasks calling `list_shockers`), only
+the first sends the request; the others wait for it and get the same
+decoded result, or the same exception. Requests are identical when method,
+URL, query parameters and headers (and so the effective credentials) all
+match, so callers on different tokens never share a response. Requests
+made with different timeouts are not shared either, and a waiter gives up
+once its own deadline passes, so nobody waits on a request allowed to run
+longer than it is.
+
+Only requests in flight are shared; nothing is cached once a request
+finishes. Each caller gets its own copy of the result, so one caller
+mutating it cannot affect another.
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from ._core import OpenShockDeadlineExceededError
+
+__all__ = ["AsyncSingleFlight", "SingleFlight", "flight_key"]
+
+_WAIT_EXPIRED = "Deadline exceeded waiting for a shared request"
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(v) for v in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort(key=repr)
+        return tuple(items)
+    return value if isinstance(value, Hashable) else repr(value)
+
+
+def flight_key(
+    method: str,
+    url: str,
+    params: Optional[Mapping[str, Any]],
+    headers: Mapping[str, Optional[str]],
+    timeout: Any = None,
+) -> Tuple[Hashable, ...]:
+    """What makes two requests interchangeable.
+
+    Headers carry the API token or session cookie, so requests made with
+    different credentials get different keys. ``timeout`` is the timeout the
+    request would be sent with; callers with different ones are kept apart.
+    """
+    return (
+        method.upper(),
+        url,
+        _freeze(params or {}),
+        _freeze(headers),
+        _freeze(timeout),
+    )
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe single flight for the sync client."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(
+        self, key: Hashable, call: Callable[[], Any], timeout: Optional[float] = None
+    ) -> Any:
+        """Run ``call``, or wait for the identical call already running.
+
+        Raises:
+            OpenShockDeadlineExceededError: If the call being waited for has
+                not finished within ``timeout`` seconds.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise OpenShockDeadlineExceededError(_WAIT_EXPIRED)
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+        try:
+            result = call()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.result = result
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+                shared = flight.waiters > 0
+            if shared and flight.error is None:
+                # The leader may change its result as soon as it returns;
+                # the waiters copy from a snapshot nobody else holds.
+                flight.result = copy.deepcopy(flight.result)
+            flight.done.set()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+class _AsyncFlight:
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """Single flight for the async client, within one event loop.
+
+    The shared request runs as its own task, so a caller being cancelled
+    does not cancel it for the callers still waiting.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _AsyncFlight] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Await ``call()``, or the identical call already running.
+
+        Raises:
+            OpenShockDeadlineExceededError: If the call being waited for has
+                not finished within ``timeout`` seconds.
+        """
+        flight = self._flights.get(key)
+        if flight is not None and not flight.task.done():
+            flight.waiters += 1
+            try:
+                result = await asyncio.wait_for(asyncio.shield(flight.task), timeout)
+            except asyncio.TimeoutError:
+                raise OpenShockDeadlineExceededError(_WAIT_EXPIRED) from None
+            return copy.deepcopy(result)
+        flight = self._flights[key] = _AsyncFlight(asyncio.ensure_future(call()))
+        flight.task.add_done_callback(lambda task: self._finish(key, flight))
+        result = await asyncio.shield(flight.task)
+        # Nobody joins a finished task, so the count is final here.
+        return copy.deepcopy(result) if flight.waiters else result
+
+    def _finish(self, key: Hashable, flight: _AsyncFlight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            # Mark the error retrieved even if every caller was cancelled.
+            flight.task.exception()
+
+    def __len__(self) -> int:
+        return len(self._flights)
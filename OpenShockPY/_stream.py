@@ -0,0 +1,159 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Incremental parsing of a listing body as it streams in.
+
+`DataStreamParser` is fed the response body chunk by chunk and hands back
+each entry of its ``data`` array as soon as the entry's closing brace has
+arrived, so `OpenShockClient.iter_logs_stream` holds one chunk and one
+entry at a time, never the whole page. The envelope's other members
+(``message``, paging fields) are collected in `DataStreamParser.envelope`.
+
+Entries are decoded by the C scanner ``json.loads`` uses. An entry split
+across chunks is retried once the next chunk arrives; with the transports'
+64 KiB chunks that is rare.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+__all__ = ["DataStreamParser"]
+
+_DECODER = json.JSONDecoder()
+_scan = _DECODER.scan_once
+_scanstring = json.decoder.scanstring  # type: ignore[attr-defined]
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SCALAR_ENDS = frozenset(",]} \t\n\r")
+
+_START, _MEMBERS, _ENTRIES, _DONE = range(4)
+
+
+class _Incomplete(Exception):
+    """The buffer ends before the next value does."""
+
+
+class DataStreamParser:
+    """Pull the entries of a ``{"data": [...]}`` body out of byte chunks.
+
+    A body that is a bare array streams its entries the same way.
+
+    Args:
+        key: The envelope member holding the entries.
+    """
+
+    def __init__(self, key: str = "data") -> None:
+        self.key = key
+        self.envelope: Dict[str, Any] = {}
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = _START
+        self._first = True  # no member or entry yet in the current container
+        self._in_envelope = False
+        self._eof = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add ``chunk`` and return the entries it completed."""
+        self._buffer += self._utf8.decode(chunk)
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """Finish the body; raises `ValueError` if it was cut short."""
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._eof = True
+        entries = self._parse()
+        rest = self._buffer.strip()
+        if rest or self._state not in (_DONE, _START):
+            raise ValueError("Response body ended in the middle of the JSON")
+        return entries
+
+    # -- scanning ---------------------------------------------------------
+
+    def _skip(self, index: int) -> int:
+        index = _WHITESPACE.match(self._buffer, index).end()  # type: ignore[union-attr]
+        if index >= len(self._buffer):
+            raise _Incomplete
+        return index
+
+    def _expect(self, index: int, char: str) -> int:
+        index = self._skip(index)
+        if self._buffer[index] != char:
+            raise ValueError(f"Expecting {char!r} at char {index}")
+        return index + 1
+
+    def _value(self, index: int) -> Tuple[Any, int]:
+        buffer = self._buffer
+        try:
+            value, end = _scan(buffer, index)
+        except (StopIteration, json.JSONDecodeError) as exc:
+            if self._eof:
+                raise ValueError(f"Invalid JSON at char {index}") from exc
+            raise _Incomplete from None
+        if (
+            not self._eof
+            and not isinstance(value, (dict, list, str))
+            and (end >= len(buffer) or buffer[end] not in _SCALAR_ENDS)
+        ):
+            # The scanner stops at "12." or "-7e", so a number (or a literal)
+            # is only whole once a delimiter follows it.
+            raise _Incomplete
+        return value, end
+
+    def _parse(self) -> List[Any]:
+        entries: List[Any] = []
+        index = 0
+        try:
+            while self._state != _DONE:
+                index = self._step(index, entries)
+        except _Incomplete:
+            pass
+        # Keep only what has not been consumed yet.
+        self._buffer = self._buffer[index:]
+        return entries
+
+    def _step(self, index: int, entries: List[Any]) -> int:
+        """Consume one unit (opening, member or entry); return the new index."""
+        at = self._skip(index)
+        char = self._buffer[at]
+        if self._state == _START:
+            if char == "{":
+                self._state, self._in_envelope = _MEMBERS, True
+            elif char == "[":
+                self._state = _ENTRIES
+            else:
+                raise ValueError("Expected a JSON object or array body")
+            self._first = True
+            return at + 1
+
+        if self._state == _ENTRIES:
+            if char == "]":
+                self._state = _MEMBERS if self._in_envelope else _DONE
+                self._first = False
+                return at + 1
+            if not self._first:
+                at = self._skip(self._expect(at, ","))
+            value, end = self._value(at)
+            entries.append(value)
+            self._first = False
+            return end
+
+        # _MEMBERS: the envelope's keys.
+        if char == "}":
+            self._state = _DONE
+            return at + 1
+        if not self._first:
+            at = self._expect(at, ",")
+        at = self._expect(at, '"')
+        try:
+            key, at = _scanstring(self._buffer, at)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise ValueError("Unterminated key in the response body") from None
+            raise _Incomplete from None
+        at = self._skip(self._expect(at, ":"))
+        if key == self.key and self._buffer[at] == "[":
+            self._state, self._first = _ENTRIES, True
+            return at + 1
+        self.envelope[key], end = self._value(at)
+        self._first = False
+        return end
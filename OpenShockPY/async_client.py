@@ -3,51 +3,135 @@
 """Asynchronous OpenShock API client (``httpx``)."""
 
 import asyncio
-from typing import Any, Dict, List, Optional, Sequence
+import threading
+import time
+from collections import deque
+from contextlib import AsyncExitStack, nullcontext
+from dataclasses import asdict, replace
+from itertools import count
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import httpx  # type: ignore
 
+from ._circuit import CircuitBreaker
+from ._coalesce import AsyncControlCoalescer
+from ._codec import resolve_codec
 from ._core import (
-    AUTH_HEADER,
+    CONTROL_PATH,
     DEFAULT_BASE_URL,
     DEFAULT_TIMEOUT,
-    LEGACY_AUTH_HEADER,
-    SESSION_COOKIE,
-    SESSION_HEADER,
+    ENDPOINTS,
+    RETRY_STATUSES,
+    STOP_MAX_RETRY_WAIT,
+    WARMUP_PATH,
     ActionResponse,
+    AsyncTransport,
+    BatchResult,
+    ClientConfig,
     Control,
     ControlType,
     DeviceListResponse,
     DeviceResponse,
+    JSONCodec,
+    OpenShockAPIError,
     OpenShockConnectionError,
     OpenShockNotFoundError,
     OpenShockPYError,
     OpenShockValidationError,
     OwnShockerListResponse,
     PermissionType,
+    PoolStats,
+    ShockerIdCache,
     ShockerLimits,
     ShockerModel,
     ShockerPermissions,
     ShockerResponse,
     SortDirection,
-    auth_headers,
-    build_api_error,
+    StreamedResponse,
+    Timeouts,
+    TransportResponse,
+    batch_target,
     build_control,
     build_control_request,
-    clean_params,
+    config_property,
+    decode_response,
+    encode_stop_request,
     extract_shocker_ids,
+    get_header,
+    logs_params,
     normalize_base_url,
     parse_retry_after,
-    retry_delay,
-    session_headers,
     should_retry,
     should_retry_transport_error,
     validate_action_params,
+    validate_log_paging,
+    validate_warmup,
+)
+from ._hedge import HedgePolicy
+from ._lazy import LazyObject, lazy_response
+from ._models import compact_listing
+from ._ratelimit import RateLimiter, as_limiter
+from ._reconcile import (
+    ControlReconciler,
+    ReconcileResult,
+    is_ambiguous_failure,
+    log_entries,
+)
+from ._retry import (
+    BackoffStrategy,
+    RetryBudget,
+    attempt_timeout,
+    call_deadline,
+    call_timeouts,
+    endpoint_class,
+    fits_deadline,
+    resolve_endpoint_timeouts,
+    retry_delay,
+    time_left,
 )
+from ._singleflight import AsyncSingleFlight, flight_key
+from ._stream import DataStreamParser
+from .transports import AsyncHTTPXTransport
+
+_H2_HINT = (
+    "http2=True requires the h2 package. Install it with: "
+    "pip install Nanashi-OpenShockPY[http2]"
+)
+
+#: Pool limits used when the caller passes none; httpx's own defaults, which
+#: a bare ``httpx.Limits()`` would lift.
+_DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+#: Statuses that suggest a cached shocker listing no longer matches the account.
+_STALE_LISTING_STATUSES = frozenset({400, 403, 404})
 
 __all__ = ["AsyncOpenShockClient"]
 
 
+def _require_h2() -> None:
+    try:
+        import h2  # type: ignore  # noqa: F401
+    except ImportError:
+        raise ImportError(_H2_HINT) from None
+
+
+async def _single_chunk(content: bytes) -> AsyncIterator[bytes]:
+    yield content
+
+
 class AsyncOpenShockClient:
     """Asynchronous client for the OpenShock REST API (v1 + v2).
 
@@ -72,50 +156,245 @@ class AsyncOpenShockClient:
 
     Attributes:
         base_url: Base URL for the OpenShock API.
-        timeout: Request timeout in seconds.
+        timeout: Request timeout in seconds, or per-phase `Timeouts`;
+            assigning it re-resolves ``endpoint_timeouts``.
+        endpoint_timeouts: Fully resolved `Timeouts` per endpoint class.
         api_key: The API token used for authentication.
+        session_token: The user session token, if one was set.
         user_agent: The User-Agent header value sent with every request.
         max_retries: How many times a retryable response is retried.
+        coalesce_window: Seconds single-shocker controls wait to be merged
+            with others into one request, or None when coalescing is off.
+        shocker_cache_ttl: Seconds the ``*_all`` methods reuse a shocker
+            listing; 0 re-lists on every call.
+        priority_stop: Whether stops travel over their own reserved
+            connection pool.
     """
 
-    base_url: str
-    timeout: float
-    api_key: Optional[str]
-    user_agent: str
+    _timeout: Union[float, Timeouts]
+    _timeout_overrides: Dict[str, Union[float, Timeouts]]
+    endpoint_timeouts: Dict[str, Timeouts]
     max_retries: int
     backoff_factor: float
+    coalesce_window: Optional[float]
+    shocker_cache_ttl: float
+    priority_stop: bool
+    _transport: AsyncTransport
+
+    # Connection settings live in one immutable `ClientConfig`; these read
+    # it, and assigning one is the same as calling its setter.
+    base_url = config_property("base_url", "SetBaseURL")
+    user_agent = config_property("user_agent", "SetUA")
+    api_key = config_property("api_key", "SetAPIKey")
+    session_token = config_property("session_token", "SetSessionToken")
+
+    @property
+    def timeout(self) -> Union[float, Timeouts]:
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: Union[float, Timeouts]) -> None:
+        # Re-resolve so endpoint classes without an override follow the change.
+        self.endpoint_timeouts = resolve_endpoint_timeouts(
+            value, self._timeout_overrides
+        )
+        self._timeout = value
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         base_url: str = DEFAULT_BASE_URL,
-        timeout: float = DEFAULT_TIMEOUT,
+        timeout: Union[float, Timeouts] = DEFAULT_TIMEOUT,
         user_agent: Optional[str] = None,
         max_retries: int = 2,
         backoff_factor: float = 0.5,
+        coalesce_window: Optional[float] = None,
+        coalesce_max_batch: int = 64,
+        shocker_cache_ttl: float = 0.0,
+        priority_stop: bool = False,
+        transport: Optional[AsyncTransport] = None,
+        http2: bool = False,
+        limits: Optional[httpx.Limits] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        control_rate_limit: Union[float, RateLimiter, None] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        backoff: Optional[BackoffStrategy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[float] = None,
+        endpoint_timeouts: Optional[Mapping[str, Union[float, Timeouts]]] = None,
+        reconciler: Optional[ControlReconciler] = None,
+        hedge: Optional[HedgePolicy] = None,
+        single_flight: bool = False,
+        codec: Union[str, JSONCodec, None] = None,
+        typed_responses: bool = False,
     ) -> None:
         """Initialize the async OpenShock client.
 
         Args:
             api_key: Optional API token for authentication.
             base_url: Base URL for the OpenShock API.
-            timeout: Request timeout in seconds.
+            timeout: Request timeout in seconds, or `Timeouts` to set the
+                connect, read, write and pool phases separately.
             user_agent: User-Agent header value. Required before any request;
                 pass it here or via `SetUA`.
             max_retries: Retries for HTTP 429/502/503/504 and transport errors.
             backoff_factor: Base for exponential backoff, in seconds.
+            coalesce_window: Opt-in. When set, `shock`, `vibrate`, `beep` and
+                `send_action` calls for a single shocker that arrive within
+                this many seconds of each other are sent as one
+                ``POST /2/shockers/control``. A few milliseconds is plenty.
+                Stops are never delayed. Ordering is only guaranteed for
+                Stops, which are sent after the controls queued before them;
+                two other controls for one shocker that land in different
+                batches may reach the API in either order.
+            coalesce_max_batch: Flush a coalesced batch early once it holds
+                this many controls.
+            shocker_cache_ttl: Opt-in. How long, in seconds, the shocker ids
+                looked up by the ``*_all`` methods are reused, so a warm
+                `stop_all` is a single request. Creating or deleting shockers
+                or hubs through this client, or changing credentials or the
+                base URL, drops the cache; `refresh_shocker_cache` re-lists
+                on demand.
+            priority_stop: Opt-in. Send every Stop control over a dedicated
+                keep-alive `httpx.AsyncClient` with a pre-serialized body,
+                bypassing coalescing and backoff sleeps, so a stop never
+                queues behind other requests for a pooled connection. Pair it
+                with ``shocker_cache_ttl`` to make a warm `stop_all` a single
+                round trip.
+            transport: Send requests through this `AsyncTransport` instead
+                of the default `AsyncHTTPXTransport`, for example a
+                zero-network `AsyncInMemoryTransport`. The client owns it and
+                closes it in `aclose`.
+            http2: Opt-in. Negotiate HTTP/2 so concurrent requests multiplex
+                over one connection instead of each opening its own TCP+TLS
+                handshake. Needs the ``http2`` extra (``h2``); servers that
+                only speak HTTP/1.1 keep working.
+            limits: `httpx.Limits` for the default connection pool, e.g.
+                ``httpx.Limits(max_connections=10)``. Only applies to the
+                default transport, which otherwise keeps httpx's defaults of
+                100 connections, 20 of them kept alive.
+            rate_limit: Opt-in. Requests per second, or a `RateLimiter` to
+                share with other clients on the same token. Every request
+                waits for a slot; a 429 slows the limiter down for all of
+                them and it speeds back up once 429s stop.
+            control_rate_limit: Opt-in. A separate limiter for control
+                requests, so listing traffic cannot starve them. Without it
+                controls share ``rate_limit``. Priority stops never wait.
+            retry_budget: Opt-in. A `RetryBudget` capping retries at a
+                fraction of recent requests, so an outage does not multiply
+                traffic. Retries it refuses raise the error at once; its
+                `RetryBudget.stats` counts them. May be shared between
+                clients. Priority stop replays are exempt.
+            backoff: How long to wait between retries when the server sends
+                no ``Retry-After``: a `BackoffStrategy` such as
+                `FullJitterBackoff`, so many clients failing together do not
+                retry in lockstep. Defaults to un-jittered exponential
+                backoff from ``backoff_factor``.
+            circuit_breaker: Opt-in. A `CircuitBreaker` that, once an
+                endpoint keeps failing, raises `OpenShockCircuitOpenError`
+                for it at once instead of waiting out timeouts and retries.
+                May be shared between clients. Priority stops bypass it.
+            deadline: Opt-in. Seconds each call may take in total, across
+                all attempts, backoff sleeps and rate limiter waits. The
+                last attempt's timeout is trimmed to what is left, and a
+                retry that could not finish in time is skipped. Wrap calls
+                in `OpenShockPY.deadline` for a per-call bound.
+            endpoint_timeouts: Timeouts per endpoint class, keyed
+                ``"control"`` (control requests), ``"lookup"`` (everything
+                else) or ``"bulk"`` (log pages), as seconds or `Timeouts`.
+                Unset classes and phases fall back to ``timeout``. Wrap
+                calls in `OpenShockPY.request_timeout` to override them
+                per call.
+            reconciler: Opt-in. A `ControlReconciler`: when a control
+                request fails ambiguously (a 5xx, or a transport error after
+                it may have been sent), read back the targeted shockers'
+                logs and re-send only the controls that did not land.
+            hedge: Opt-in. A `HedgePolicy`: when a GET has not answered
+                within its endpoint's recent p95 latency (or a fixed delay),
+                send a second copy in a task and return whichever answers
+                first; the other is cancelled. Each hedge draws from
+                ``retry_budget`` when one is set. Control requests are never
+                hedged.
+            single_flight: Opt-in. Identical GETs in flight at the same
+                time (same URL, query parameters and credentials) share one
+                request: the first caller sends it and the others wait for
+                its result or error, each getting its own copy. The shared
+                request runs in its own task, so cancelling one caller does
+                not cancel it for the rest. Nothing is cached once the
+                request finishes.
+            codec: Opt-in. Encode request bodies and decode responses,
+                error bodies included, with this `JSONCodec` or one of
+                ``"orjson"``, ``"msgspec"`` or ``"stdlib"``; ``"auto"``
+                picks the fastest one installed. By default the transport
+                encodes bodies and responses go through ``json``.
+            typed_responses: Opt-in. Return the entries of the hub and
+                shocker listings (``list_devices``, ``list_shockers``,
+                ``list_own_shockers``) as compact, read-only
+                `DeviceRecord` and `ShockerRecord` mappings instead of
+                dicts, for large fleets. They read like the dicts they
+                replace but are not ``dict`` instances: call ``to_dict()``
+                before ``json.dumps`` or anything else that needs a dict.
         """
-        self.base_url = normalize_base_url(base_url)
+        self._config = ClientConfig(normalize_base_url(base_url))
+        self._config_lock = threading.Lock()
+        self._timeout_overrides = dict(endpoint_timeouts or {})
         self.timeout = timeout
-        self.user_agent = ""
-        self.api_key = None
-        self.session_token: Optional[str] = None
         self.max_retries = max(0, int(max_retries))
         self.backoff_factor = backoff_factor
+        self.coalesce_window = coalesce_window
+        self.shocker_cache_ttl = shocker_cache_ttl
+        self._shocker_cache = ShockerIdCache(shocker_cache_ttl)
+        self._coalescer: Optional[AsyncControlCoalescer] = None
+        if coalesce_window is not None:
+            self._coalescer = AsyncControlCoalescer(
+                self._send_controls, coalesce_window, coalesce_max_batch
+            )
+        self.priority_stop = priority_stop
+        self.rate_limiter = as_limiter(rate_limit)
+        self.control_rate_limiter = as_limiter(control_rate_limit)
+        self.retry_budget = retry_budget
+        self.backoff = backoff
+        self.circuit_breaker = circuit_breaker
+        if deadline is not None and deadline <= 0:
+            raise OpenShockValidationError("deadline must be greater than 0")
+        self.deadline = deadline
+        self.reconciler = reconciler
+        self.hedge = hedge
+        self.single_flight = single_flight
+        self.codec = resolve_codec(codec)
+        self.typed_responses = typed_responses
+        self._flights = AsyncSingleFlight() if single_flight else None
         self._closed = False
-        self._client = httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+        self.http2 = http2
+        if transport is not None and (http2 or limits is not None):
+            raise OpenShockValidationError(
+                "http2 and limits configure the default transport; "
+                "set them on your own transport instead"
+            )
+        if http2:
+            _require_h2()
+        self._client: Optional[httpx.AsyncClient] = None
+        if transport is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(**asdict(self.endpoint_timeouts["lookup"])),
+                follow_redirects=True,
+                http2=http2,
+                limits=limits if limits is not None else _DEFAULT_LIMITS,
+            )
+            transport = AsyncHTTPXTransport(self._client)
+        self._transport = transport
+        self._stop_transport: AsyncTransport = transport
+        if priority_stop and self._client is not None:
+            self._stop_transport = AsyncHTTPXTransport(
+                httpx.AsyncClient(
+                    timeout=httpx.Timeout(**asdict(self.endpoint_timeouts["control"])),
+                    follow_redirects=True,
+                    http2=http2,
+                    limits=httpx.Limits(max_keepalive_connections=1),
+                )
+            )
 
-        self._client.headers.setdefault("Accept", "application/json")
+        self._keepalive_task: Optional["asyncio.Task[None]"] = None
 
         if user_agent is not None:
             self.SetUA(user_agent)
@@ -123,54 +402,68 @@ class AsyncOpenShockClient:
 
     # -- plumbing ----------------------------------------------------------
 
+    def _limiter_for(self, path: str) -> Optional[RateLimiter]:
+        if path == CONTROL_PATH and self.control_rate_limiter is not None:
+            return self.control_rate_limiter
+        return self.rate_limiter
+
+    def _timeouts_for(self, path: str) -> Timeouts:
+        return call_timeouts(self.endpoint_timeouts[endpoint_class(path)])
+
+    def _retry_delay(
+        self, attempt: int, retry_after: Optional[float], previous: Optional[float]
+    ) -> float:
+        return retry_delay(
+            attempt,
+            retry_after,
+            self.backoff_factor,
+            strategy=self.backoff,
+            previous=previous,
+        )
+
+    def _spend_retry(self) -> bool:
+        budget = self.retry_budget
+        return budget is None or budget.try_spend()
+
     def _url(self, path: str) -> str:
-        return f"{self.base_url}{path}"
+        return self._config.url(path)
 
-    def _ensure_open(self) -> "httpx.AsyncClient":
+    def _ensure_open(self) -> AsyncTransport:
         if self._closed:
             raise OpenShockPYError(
                 "Client is closed; create a new AsyncOpenShockClient"
             )
-        return self._client
-
-    def _ensure_user_agent(self) -> None:
-        if not self.user_agent:
-            raise OpenShockValidationError(
-                "User-Agent must be set via SetUA before using the client"
-            )
+        return self._transport
 
-    def _get_headers(self, api_key: Optional[str] = None) -> Dict[str, str]:
-        """Per-request headers, layered on top of the client defaults.
+    def _get_headers(
+        self, api_key: Optional[str] = None, config: Optional[ClientConfig] = None
+    ) -> Dict[str, Any]:
+        """The complete header set for one request.
 
         Args:
             api_key: Optional API token to use instead of the stored one.
                 Pass an empty string to send the request unauthenticated even
                 when a key is stored on the client.
+            config: The snapshot to build from; the current one by default.
+                Callers that also build the URL pass the snapshot they used.
+
+        Returns:
+            Headers for the transport. A ``None`` value means the header
+            must not be sent.
         """
-        self._ensure_user_agent()
-        if api_key is None:
-            return dict(auth_headers(self.api_key))
-        if not api_key:
-            # httpx merges per-request headers over client headers, so the
-            # stored token has to be blanked rather than omitted.
-            return {AUTH_HEADER: "", LEGACY_AUTH_HEADER: ""}
-        return dict(auth_headers(api_key))
-
-    def _handle(self, resp: "httpx.Response") -> Any:
-        """Turn a response into decoded JSON, or raise the matching error."""
-        if 200 <= resp.status_code < 300:
-            if resp.content:
-                try:
-                    return resp.json()
-                except ValueError:
-                    return None
-            return None
-        try:
-            payload = resp.json()
-        except Exception:
-            payload = {"message": resp.text}
-        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
-        raise build_api_error(resp.status_code, payload, retry_after)
+        return (config or self._config).headers(api_key)
+
+    async def _call(
+        self,
+        endpoint: str,
+        *,
+        api_key: Optional[str] = None,
+        lazy: bool = False,
+        **args: Any,
+    ) -> Any:
+        """Call one of the `ENDPOINTS` with its endpoint method's arguments."""
+        method, path, kwargs = ENDPOINTS[endpoint].request(args)
+        return await self._request(method, path, api_key=api_key, lazy=lazy, **kwargs)
 
     async def _request(
         self,
@@ -180,65 +473,253 @@ class AsyncOpenShockClient:
         params: Optional[Dict[str, Any]] = None,
         json_body: Optional[Any] = None,
         api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
         """Send a request, retrying only where a replay is safe.
 
         Control requests are POSTs, so they are replayed on HTTP 429 (the
         request was rejected, never executed) but never on a timeout or 5xx,
-        which could otherwise deliver a second shock.
+        which could otherwise deliver a second shock. With ``lazy``, a
+        successful body is returned as a `LazyObject` view, unshared.
         """
-        client = self._ensure_open()
-        url = self._url(path)
-        headers = self._get_headers(api_key)
+        transport = self._ensure_open()
+        config = self._config
+        url = config.url(path)
+        headers = self._get_headers(api_key, config)
+        if lazy:
+            return await self._send_request(
+                transport, method, path, config, url, headers, params, json_body, True
+            )
+        if self._flights is not None and method == "GET":
+            result = await self._flights.do(
+                flight_key(method, url, params, headers, self._timeouts_for(path)),
+                lambda: self._send_request(
+                    transport, method, path, config, url, headers, params, json_body
+                ),
+                # A waiter stops waiting at its own deadline, not the sender's.
+                timeout=time_left(call_deadline(self.deadline)),
+            )
+        else:
+            result = await self._send_request(
+                transport, method, path, config, url, headers, params, json_body
+            )
+        if self.typed_responses and method == "GET":
+            return compact_listing(path, result)
+        return result
+
+    async def _send_request(
+        self,
+        transport: AsyncTransport,
+        method: str,
+        path: str,
+        config: ClientConfig,
+        url: str,
+        headers: Dict[str, Optional[str]],
+        params: Optional[Dict[str, Any]],
+        json_body: Optional[Any],
+        lazy: bool = False,
+    ) -> Any:
+        """The attempts and retries behind one `_request`."""
+        expires = call_deadline(self.deadline)
+        limiter = self._limiter_for(path)
+        body: Dict[str, Any] = {"json": json_body}
+        codec = self.codec
+        if codec is not None and json_body is not None:
+            body = {"content": codec.encode(json_body)}
+            headers = {**headers, "Content-Type": codec.content_type}
+        breaker = self.circuit_breaker
+        circuit = breaker.key(config.base_url, path) if breaker else None
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
         attempt = 0
+        delay: Optional[float] = None
         while True:
+            if breaker is not None:
+                breaker.before_request(circuit)
+            recorded = False
             try:
-                resp = await client.request(
-                    method,
-                    url,
-                    params=params,
-                    json=json_body,
-                    headers=headers,
-                )
-            except httpx.HTTPError as exc:
-                if attempt < self.max_retries and should_retry_transport_error(method):
-                    await asyncio.sleep(
-                        retry_delay(attempt, None, self.backoff_factor)
+                if limiter is not None:
+                    await limiter.aacquire(timeout=time_left(expires))
+                timeout = attempt_timeout(self._timeouts_for(path), expires)
+                started = time.monotonic()
+                try:
+                    resp = await self._send(
+                        transport,
+                        method,
+                        path,
+                        url,
+                        headers=headers,
+                        params=params,
+                        timeout=timeout,
+                        **body,
                     )
+                except OpenShockConnectionError as exc:
+                    recorded = True
+                    if breaker is not None:
+                        breaker.record_failure(circuit)
+                    if attempt < self.max_retries and should_retry_transport_error(
+                        method, exc.request_sent
+                    ):
+                        wait = self._retry_delay(attempt, None, delay)
+                        took = time.monotonic() - started
+                        if fits_deadline(expires, wait, took) and self._spend_retry():
+                            delay = wait
+                            await asyncio.sleep(delay)
+                            attempt += 1
+                            continue
+                    raise
+                recorded = True
+                if breaker is not None:
+                    if resp.status_code >= 500:
+                        breaker.record_failure(circuit)
+                    else:
+                        breaker.record_success(circuit)
+            finally:
+                if breaker is not None and not recorded:
+                    # Stopped before an outcome (deadline, limiter, cancel):
+                    # give the probe slot back instead of holding it.
+                    breaker.release(circuit)
+            after = None
+            if resp.status_code in RETRY_STATUSES:
+                after = parse_retry_after(get_header(resp.headers, "Retry-After"))
+                if resp.status_code == 429 and limiter is not None:
+                    await limiter.apenalize(after)
+            if should_retry(resp.status_code, method) and attempt < self.max_retries:
+                wait = self._retry_delay(attempt, after, delay)
+                took = time.monotonic() - started
+                if fits_deadline(expires, wait, took) and self._spend_retry():
+                    delay = wait
+                    await asyncio.sleep(delay)
                     attempt += 1
                     continue
-                raise OpenShockConnectionError(
-                    f"{method} {url} failed: {exc}"
-                ) from exc
+            if lazy and 200 <= resp.status_code < 300:
+                return lazy_response(resp.content)
+            return decode_response(resp, self.codec)
 
-            if should_retry(resp.status_code, method) and attempt < self.max_retries:
-                after = parse_retry_after(resp.headers.get("Retry-After"))
-                await asyncio.sleep(retry_delay(attempt, after, self.backoff_factor))
+    async def _send(
+        self,
+        transport: AsyncTransport,
+        method: str,
+        path: str,
+        url: str,
+        **kwargs: Any,
+    ) -> TransportResponse:
+        hedge = self.hedge
+        if hedge is None or not hedge.applies(method, path):
+            return await transport.send(method, url, **kwargs)
+
+        def launch(first: bool) -> "asyncio.Future[TransportResponse]":
+            started = time.monotonic()
+
+            def finished(attempt: "asyncio.Future[TransportResponse]") -> None:
+                # A first attempt cancelled because the hedge won took at
+                # least this long; record it so slow answers are sampled too.
+                # A cancelled hedge says nothing about the endpoint.
+                if attempt.cancelled():
+                    if first:
+                        hedge.observe(path, time.monotonic() - started)
+                elif attempt.exception() is None:
+                    hedge.observe(path, time.monotonic() - started)
+
+            attempt = asyncio.ensure_future(transport.send(method, url, **kwargs))
+            attempt.add_done_callback(finished)
+            return attempt
+
+        pending = {launch(first=True)}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge.delay_for(path))
+            if not done and self._spend_retry():
+                pending.add(launch(first=False))
+            failures: List[BaseException] = []
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    error = attempt.exception()
+                    if error is None:
+                        return attempt.result()
+                    failures.append(error)
+            # Every attempt failed; report the first failure.
+            raise failures[0]
+        finally:
+            for attempt in pending:
+                attempt.cancel()
+
+    async def _send_stop(
+        self,
+        shocker_ids: Sequence[str],
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> Optional[ActionResponse]:
+        """Send a Stop for ``shocker_ids`` over the priority transport.
+
+        Controls still queued in the coalescer for these shockers are sent
+        first, so none of them lands after the Stop. A repeated Stop is
+        harmless, so unlike other control requests this one is replayed
+        after a 5xx or transport failure too - immediately, without a
+        backoff sleep. A 429 penalizes the control rate limiter and is
+        replayed only after its ``Retry-After`` (or the backoff), and only
+        when that is at most `STOP_MAX_RETRY_WAIT`; otherwise it is raised.
+        """
+        self._ensure_open()
+        if self._coalescer is not None:
+            await self._coalescer.flush(shocker_ids)
+        config = self._config
+        url = config.url(CONTROL_PATH)
+        headers = self._get_headers(api_key, config)
+        headers["Content-Type"] = "application/json"
+        body = encode_stop_request(tuple(shocker_ids), custom_name)
+        timeout = attempt_timeout(self._timeouts_for(CONTROL_PATH), None)
+        attempt = 0
+        while True:
+            try:
+                resp = await self._stop_transport.send(
+                    "POST", url, headers=headers, content=body, timeout=timeout
+                )
+            except OpenShockConnectionError:
+                if attempt < self.max_retries:
+                    attempt += 1
+                    continue
+                raise
+            if resp.status_code == 429:
+                after = parse_retry_after(get_header(resp.headers, "Retry-After"))
+                limiter = self._limiter_for(CONTROL_PATH)
+                if limiter is not None:
+                    await limiter.apenalize(after)
+                wait = self._retry_delay(attempt, after, None)
+                if attempt < self.max_retries and wait <= STOP_MAX_RETRY_WAIT:
+                    await asyncio.sleep(wait)
+                    attempt += 1
+                    continue
+                return decode_response(resp, self.codec)
+            if resp.status_code in RETRY_STATUSES and attempt < self.max_retries:
                 attempt += 1
                 continue
-            return self._handle(resp)
+            return decode_response(resp, self.codec)
 
     # -- configuration -----------------------------------------------------
 
+    def _configure(self, **changes: Any) -> None:
+        # Writers serialize on the lock; readers just take ``self._config``.
+        with self._config_lock:
+            self._config = replace(self._config, **changes)
+
     def SetUA(self, user_agent: str) -> None:
         """Set the User-Agent header. Required before any request."""
         if not user_agent:
             raise OpenShockValidationError("user_agent must be provided to SetUA")
-        self.user_agent = user_agent
-        self._client.headers["User-Agent"] = user_agent
+        self._configure(user_agent=user_agent)
 
     def SetBaseURL(self, base_url: str) -> None:
         """Set the base API URL, without trailing slashes."""
-        self.base_url = normalize_base_url(base_url)
+        self._configure(base_url=normalize_base_url(base_url))
+        self._shocker_cache.invalidate()
 
     def SetAPIKey(self, api_key: Optional[str]) -> None:
-        """Store the API token in memory and refresh the client headers."""
-        self.api_key = api_key
-        if api_key:
-            self._client.headers.update(auth_headers(api_key))
-        else:
-            self._client.headers.pop(AUTH_HEADER, None)
-            self._client.headers.pop(LEGACY_AUTH_HEADER, None)
+        """Store the API token in memory; it is sent with every request."""
+        self._configure(api_key=api_key)
+        self._shocker_cache.invalidate()
 
     def SetSessionToken(self, session_token: Optional[str]) -> None:
         """Authenticate with a user session token instead of an API token.
@@ -246,13 +727,8 @@ class AsyncOpenShockClient:
         Sends it both as the ``OpenShockSession`` header and the
         ``openShockSession`` cookie, which are the two forms the API reads.
         """
-        self.session_token = session_token
-        if session_token:
-            self._client.headers.update(session_headers(session_token))
-            self._client.cookies.set(SESSION_COOKIE, session_token)
-        else:
-            self._client.headers.pop(SESSION_HEADER, None)
-            self._client.cookies.delete(SESSION_COOKIE)
+        self._configure(session_token=session_token)
+        self._shocker_cache.invalidate()
 
     # Pythonic aliases for the historical PascalCase setters.
     set_user_agent = SetUA
@@ -261,11 +737,14 @@ class AsyncOpenShockClient:
     set_session_token = SetSessionToken
 
     async def aclose(self) -> None:
-        """Close the underlying HTTP client. Safe to call more than once."""
+        """Close the underlying transport. Safe to call more than once."""
         if self._closed:
             return
         self._closed = True
-        await self._client.aclose()
+        await self._stop_keepalive()
+        await self._transport.aclose()
+        if self._stop_transport is not self._transport:
+            await self._stop_transport.aclose()
 
     async def __aenter__(self) -> "AsyncOpenShockClient":
         """Enter async context manager."""
@@ -275,79 +754,254 @@ class AsyncOpenShockClient:
         """Exit async context manager and close the client."""
         await self.aclose()
 
+    # -- connections -------------------------------------------------------
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Connection counters for the request pool.
+
+        Returns a `PoolStats` with how many connections were created, how
+        many requests reused one (with ``http2=True``, every request after
+        the first on a connection), and how many were closed. ``None`` when
+        the transport does not track them. Not a coroutine.
+        """
+        stats = getattr(self._ensure_open(), "pool_stats", None)
+        return None if stats is None else stats()
+
+    async def _ping(self, transport: AsyncTransport) -> bool:
+        # Any HTTP status means the connection is up; only a transport
+        # failure counts as a miss.
+        try:
+            await transport.send(
+                "GET",
+                self._url(WARMUP_PATH),
+                headers=self._get_headers(""),
+                timeout=attempt_timeout(self._timeouts_for(WARMUP_PATH), None),
+            )
+        except OpenShockConnectionError:
+            return False
+        return True
+
+    async def _ping_pool(self, connections: int) -> int:
+        transport = self._ensure_open()
+        lanes = [transport] * connections
+        if self._stop_transport is not transport:
+            lanes.append(self._stop_transport)
+        # Pings must overlap, or the pool would reuse a single connection.
+        results = await asyncio.gather(*(self._ping(lane) for lane in lanes))
+        return sum(results)
+
+    async def _keepalive_loop(self, connections: int, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._ping_pool(connections)
+            except OpenShockPYError:
+                return
+
+    async def _stop_keepalive(self) -> None:
+        task, self._keepalive_task = self._keepalive_task, None
+        if task is None or task is asyncio.current_task():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def warmup(
+        self, connections: int = 1, keepalive_interval: Optional[float] = None
+    ) -> int:
+        """Open pooled connections to ``base_url`` ahead of the first request.
+
+        Sends ``connections`` concurrent ``GET /1/public/stats`` requests, so
+        DNS, TCP and TLS setup are paid here rather than by the first
+        control. The `priority_stop` connection is warmed as well. With
+        ``http2=True`` a single connection carries everything, so
+        ``connections=1`` is enough.
+
+        Args:
+            connections: How many connections to open.
+            keepalive_interval: Opt-in. Re-ping the same number of
+                connections every this many seconds from a background task,
+                so idle connections are not reaped by proxies or load
+                balancers. Calling `warmup` again replaces the schedule;
+                `aclose` stops it.
+
+        Returns:
+            How many pings got a response. Failures are not raised; the
+            first real request reports them.
+        """
+        validate_warmup(connections, keepalive_interval)
+        warmed = await self._ping_pool(connections)
+        await self._stop_keepalive()
+        if keepalive_interval is not None:
+            self._keepalive_task = asyncio.get_running_loop().create_task(
+                self._keepalive_loop(connections, keepalive_interval)
+            )
+        return warmed
+
+    # -- bulk calls --------------------------------------------------------
+
+    def batch(
+        self,
+        method: str,
+        calls: Iterable[Mapping[str, Any]],
+        concurrency: int = 32,
+        ordered: bool = True,
+    ) -> AsyncIterator[BatchResult]:
+        """Call one endpoint method many times, at most ``concurrency`` at once.
+
+        The async counterpart of `OpenShockClient.batch`, run as tasks on
+        the current loop instead of threads. Not a coroutine: iterate it.
+
+        Example::
+
+            calls = ({"shocker_id": i} for i in ids)
+            async for r in client.batch("get_shocker", calls, ordered=False):
+                print(r.index, r.result if r.ok else r.error)
+
+        Args:
+            method: Name of the endpoint method, e.g. ``"get_shocker"``.
+            calls: Keyword arguments for each call. Consumed lazily.
+            concurrency: Maximum number of calls in flight.
+            ordered: Yield results in input order, or in completion order.
+
+        Returns:
+            An async iterator of `BatchResult`. Leaving it early cancels the
+            calls still in flight.
+        """
+        target = batch_target(self, method, concurrency)
+        self._ensure_open()
+        return self._aiter_batch(target, calls, concurrency, ordered)
+
+    @staticmethod
+    async def _call_one(
+        target: Callable[..., Awaitable[Any]], index: int, kwargs: Mapping[str, Any]
+    ) -> BatchResult:
+        try:
+            return BatchResult(index, kwargs, await target(**kwargs))
+        except OpenShockPYError as exc:
+            return BatchResult(index, kwargs, error=exc)
+
+    async def _aiter_batch(
+        self,
+        target: Callable[..., Awaitable[Any]],
+        calls: Iterable[Mapping[str, Any]],
+        concurrency: int,
+        ordered: bool,
+    ) -> AsyncIterator[BatchResult]:
+        items = enumerate(calls)
+        loop = asyncio.get_running_loop()
+        pending: Deque["asyncio.Task[BatchResult]"] = deque()
+
+        def submit_next() -> None:
+            for index, kwargs in items:
+                pending.append(
+                    loop.create_task(self._call_one(target, index, kwargs))
+                )
+                return
+
+        try:
+            for _ in range(concurrency):
+                submit_next()
+            while pending:
+                if ordered:
+                    task = pending.popleft()
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    task = next(t for t in pending if t in done)
+                    pending.remove(task)
+                result = await task
+                submit_next()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     # -- hubs / devices ----------------------------------------------------
 
     async def list_devices(self, api_key: Optional[str] = None) -> DeviceListResponse:
         """List every hub owned by the account. ``GET /1/devices``."""
-        return await self._request("GET", "/1/devices", api_key=api_key)
+        return await self._call("list_devices", api_key=api_key)
 
     async def get_device(
         self, device_id: str, api_key: Optional[str] = None
     ) -> DeviceResponse:
         """Get a single hub. ``GET /1/devices/{deviceId}``."""
-        return await self._request("GET", f"/1/devices/{device_id}", api_key=api_key)
+        return await self._call("get_device", device_id=device_id, api_key=api_key)
 
     async def create_device(self, api_key: Optional[str] = None) -> str:
         """Create a hub and return its id. ``POST /1/devices``."""
-        return await self._request("POST", "/1/devices", api_key=api_key)
+        try:
+            return await self._call("create_device", api_key=api_key)
+        finally:
+            self._shocker_cache.invalidate()
 
     async def edit_device(
         self, device_id: str, name: str, api_key: Optional[str] = None
     ) -> Any:
         """Rename a hub. ``PATCH /1/devices/{deviceId}``."""
-        return await self._request(
-            "PATCH",
-            f"/1/devices/{device_id}",
-            json_body={"name": name},
-            api_key=api_key,
+        return await self._call(
+            "edit_device", device_id=device_id, name=name, api_key=api_key
         )
 
     async def delete_device(self, device_id: str, api_key: Optional[str] = None) -> Any:
         """Delete a hub. ``DELETE /1/devices/{deviceId}``."""
-        return await self._request("DELETE", f"/1/devices/{device_id}", api_key=api_key)
+        try:
+            return await self._call(
+                "delete_device", device_id=device_id, api_key=api_key
+            )
+        finally:
+            self._shocker_cache.invalidate()
 
     async def regenerate_device_token(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Regenerate a hub's token. ``PUT /1/devices/{deviceId}``."""
-        return await self._request("PUT", f"/1/devices/{device_id}", api_key=api_key)
+        return await self._call(
+            "regenerate_device_token", device_id=device_id, api_key=api_key
+        )
 
     async def get_device_pair_code(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Get a hub pair code. ``GET /1/devices/{deviceId}/pair``."""
-        return await self._request(
-            "GET", f"/1/devices/{device_id}/pair", api_key=api_key
+        return await self._call(
+            "get_device_pair_code", device_id=device_id, api_key=api_key
         )
 
     async def get_device_lcg(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Get the LCG node a hub is connected to. ``GET /1/devices/{deviceId}/lcg``."""
-        return await self._request(
-            "GET", f"/1/devices/{device_id}/lcg", api_key=api_key
-        )
+        return await self._call("get_device_lcg", device_id=device_id, api_key=api_key)
 
     async def get_device_lcg_v2(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """LCG node for a hub, v2 shape. ``GET /2/devices/{deviceId}/lcg``."""
-        return await self._request(
-            "GET", f"/2/devices/{device_id}/lcg", api_key=api_key
+        return await self._call(
+            "get_device_lcg_v2", device_id=device_id, api_key=api_key
         )
 
     async def get_device_ota_updates(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """List OTA update history for a hub. ``GET /1/devices/{deviceId}/ota``."""
-        return await self._request(
-            "GET", f"/1/devices/{device_id}/ota", api_key=api_key
+        return await self._call(
+            "get_device_ota_updates", device_id=device_id, api_key=api_key
         )
 
     # -- shockers ----------------------------------------------------------
 
     async def list_shockers(
-        self, device_id: Optional[str] = None, api_key: Optional[str] = None
+        self,
+        device_id: Optional[str] = None,
+        api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
         """List shockers.
 
@@ -358,28 +1012,33 @@ class AsyncOpenShockClient:
                 which returns hubs with nested shockers
                 (`OwnShockerListResponse`).
             api_key: Optional API token to use instead of the stored one.
+            lazy: Return a `LazyObject` view that decodes the listing only
+                as far as it is read, instead of decoding it all up front.
         """
         if device_id:
-            return await self._request(
-                "GET", f"/1/devices/{device_id}/shockers", api_key=api_key
+            return await self._call(
+                "list_device_shockers", device_id=device_id, api_key=api_key, lazy=lazy
             )
-        return await self._request("GET", "/1/shockers/own", api_key=api_key)
+        return await self._call("list_own_shockers", api_key=api_key, lazy=lazy)
 
     async def list_own_shockers(
-        self, api_key: Optional[str] = None
-    ) -> OwnShockerListResponse:
-        """List owned hubs with their shockers. ``GET /1/shockers/own``."""
-        return await self._request("GET", "/1/shockers/own", api_key=api_key)
+        self, api_key: Optional[str] = None, lazy: bool = False
+    ) -> Union[OwnShockerListResponse, LazyObject]:
+        """List owned hubs with their shockers. ``GET /1/shockers/own``.
+
+        With ``lazy=True``, returns a `LazyObject` view instead.
+        """
+        return await self._call("list_own_shockers", api_key=api_key, lazy=lazy)
 
     async def list_shared_shockers(self, api_key: Optional[str] = None) -> Any:
         """List shockers shared with this account. ``GET /1/shockers/shared``."""
-        return await self._request("GET", "/1/shockers/shared", api_key=api_key)
+        return await self._call("list_shared_shockers", api_key=api_key)
 
     async def get_shocker(
         self, shocker_id: str, api_key: Optional[str] = None
     ) -> ShockerResponse:
         """Get a single shocker. ``GET /1/shockers/{shockerId}``."""
-        return await self._request("GET", f"/1/shockers/{shocker_id}", api_key=api_key)
+        return await self._call("get_shocker", shocker_id=shocker_id, api_key=api_key)
 
     async def create_shocker(
         self,
@@ -390,17 +1049,17 @@ class AsyncOpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Create a shocker on a hub. ``POST /1/shockers``."""
-        return await self._request(
-            "POST",
-            "/1/shockers",
-            json_body={
-                "device": device_id,
-                "name": name,
-                "rfId": rf_id,
-                "model": model,
-            },
-            api_key=api_key,
-        )
+        try:
+            return await self._call(
+                "create_shocker",
+                device_id=device_id,
+                name=name,
+                rf_id=rf_id,
+                model=model,
+                api_key=api_key,
+            )
+        finally:
+            self._shocker_cache.invalidate()
 
     async def edit_shocker(
         self,
@@ -416,15 +1075,13 @@ class AsyncOpenShockClient:
         The API requires the full ``NewShocker`` body, so every field must be
         supplied even when only one is changing.
         """
-        return await self._request(
-            "PATCH",
-            f"/1/shockers/{shocker_id}",
-            json_body={
-                "device": device_id,
-                "name": name,
-                "rfId": rf_id,
-                "model": model,
-            },
+        return await self._call(
+            "edit_shocker",
+            shocker_id=shocker_id,
+            device_id=device_id,
+            name=name,
+            rf_id=rf_id,
+            model=model,
             api_key=api_key,
         )
 
@@ -432,19 +1089,19 @@ class AsyncOpenShockClient:
         self, shocker_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Delete a shocker. ``DELETE /1/shockers/{shockerId}``."""
-        return await self._request(
-            "DELETE", f"/1/shockers/{shocker_id}", api_key=api_key
-        )
+        try:
+            return await self._call(
+                "delete_shocker", shocker_id=shocker_id, api_key=api_key
+            )
+        finally:
+            self._shocker_cache.invalidate()
 
     async def pause_shocker(
         self, shocker_id: str, paused: bool, api_key: Optional[str] = None
     ) -> Any:
         """Pause or unpause a shocker. ``POST /1/shockers/{shockerId}/pause``."""
-        return await self._request(
-            "POST",
-            f"/1/shockers/{shocker_id}/pause",
-            json_body={"pause": paused},
-            api_key=api_key,
+        return await self._call(
+            "pause_shocker", shocker_id=shocker_id, paused=paused, api_key=api_key
         )
 
     async def get_shocker_logs(
@@ -453,13 +1110,19 @@ class AsyncOpenShockClient:
         offset: Optional[int] = None,
         limit: Optional[int] = None,
         api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
-        """Get control logs for one shocker. ``GET /1/shockers/{shockerId}/logs``."""
-        return await self._request(
-            "GET",
-            f"/1/shockers/{shocker_id}/logs",
-            params=clean_params({"offset": offset, "limit": limit}),
+        """Get control logs for one shocker. ``GET /1/shockers/{shockerId}/logs``.
+
+        With ``lazy=True``, returns a `LazyObject` view instead.
+        """
+        return await self._call(
+            "get_shocker_logs",
+            shocker_id=shocker_id,
+            offset=offset,
+            limit=limit,
             api_key=api_key,
+            lazy=lazy,
         )
 
     async def get_logs(
@@ -471,24 +1134,168 @@ class AsyncOpenShockClient:
         sort_dir: Optional[SortDirection] = None,
         shocker_ids: Optional[Sequence[str]] = None,
         api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
-        """Get paged control logs across shockers. ``GET /1/shockers/logs``."""
-        return await self._request(
-            "GET",
-            "/1/shockers/logs",
-            params=clean_params(
-                {
-                    "page": page,
-                    "pageSize": page_size,
-                    "search": search,
-                    "sort": sort,
-                    "sortDir": sort_dir,
-                    "shockerIds": list(shocker_ids) if shocker_ids else None,
-                }
-            ),
+        """Get paged control logs across shockers. ``GET /1/shockers/logs``.
+
+        With ``lazy=True``, returns a `LazyObject` view instead.
+        """
+        return await self._call(
+            "get_logs",
+            page=page,
+            page_size=page_size,
+            search=search,
+            sort=sort,
+            sort_dir=sort_dir,
+            shocker_ids=shocker_ids,
             api_key=api_key,
+            lazy=lazy,
         )
 
+    def aiter_logs(
+        self,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        sort: Optional[str] = None,
+        sort_dir: Optional[SortDirection] = None,
+        shocker_ids: Optional[Sequence[str]] = None,
+        first_page: int = 1,
+        prefetch: int = 4,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """Yield log entries page after page, fetching the next pages ahead.
+
+        The async counterpart of `OpenShockClient.iter_logs`, prefetching
+        with tasks on the current loop. Not a coroutine: iterate it.
+
+        Example::
+
+            async for entry in client.aiter_logs(page_size=500, prefetch=8):
+                ...
+
+        Returns:
+            An async iterator of log entries in page order. Leaving it early
+            cancels the pages still in flight.
+        """
+        validate_log_paging(page_size, prefetch)
+        self._ensure_open()
+
+        def fetch(page: int) -> Awaitable[Any]:
+            return self.get_logs(
+                page, page_size, search, sort, sort_dir, shocker_ids, api_key
+            )
+
+        return self._aiter_logs(fetch, first_page, prefetch)
+
+    @staticmethod
+    async def _aiter_logs(
+        fetch: Callable[[int], Awaitable[Any]],
+        first_page: int,
+        prefetch: int,
+    ) -> AsyncIterator[Any]:
+        pages = count(first_page)
+        loop = asyncio.get_running_loop()
+        pending: Deque["asyncio.Future[Any]"] = deque(
+            asyncio.ensure_future(fetch(next(pages)), loop=loop)
+            for _ in range(prefetch + 1)
+        )
+        try:
+            while pending:
+                entries = log_entries(await pending.popleft())
+                if not entries:
+                    return
+                pending.append(asyncio.ensure_future(fetch(next(pages)), loop=loop))
+                for entry in entries:
+                    yield entry
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def aiter_logs_stream(
+        self,
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        search: Optional[str] = None,
+        sort: Optional[str] = None,
+        sort_dir: Optional[SortDirection] = None,
+        shocker_ids: Optional[Sequence[str]] = None,
+        api_key: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """Yield the entries of one `get_logs` page as they arrive.
+
+        The async counterpart of `OpenShockClient.iter_logs_stream`: memory
+        holds one chunk and one entry, and nothing is retried.
+        """
+        transport = self._ensure_open()
+        config = self._config
+        path = ENDPOINTS["get_logs"].path
+        url = config.url(path)
+        headers = self._get_headers(api_key, config)
+        params = logs_params(page, page_size, search, sort, sort_dir, shocker_ids)
+        limiter = self._limiter_for(path)
+        breaker = self.circuit_breaker
+        circuit = breaker.key(config.base_url, path) if breaker else None
+        if breaker is not None:
+            breaker.before_request(circuit)
+        recorded = False
+        try:
+            expires = call_deadline(self.deadline)
+            if limiter is not None:
+                await limiter.aacquire(timeout=time_left(expires))
+            timeout = attempt_timeout(self._timeouts_for(path), expires)
+            stream = getattr(transport, "stream", None)
+            try:
+                if stream is None:
+                    sent = await transport.send(
+                        "GET", url, headers=headers, params=params, timeout=timeout
+                    )
+                    opened: Any = nullcontext(
+                        StreamedResponse(
+                            sent.status_code, sent.headers, _single_chunk(sent.content)
+                        )
+                    )
+                else:
+                    opened = stream(
+                        "GET", url, headers=headers, params=params, timeout=timeout
+                    )
+                resp = await opened.__aenter__()
+                recorded = True
+                if breaker is not None:
+                    if resp.status_code >= 500:
+                        breaker.record_failure(circuit)
+                    else:
+                        breaker.record_success(circuit)
+            except OpenShockConnectionError:
+                recorded = True
+                if breaker is not None:
+                    breaker.record_failure(circuit)
+                raise
+        finally:
+            if breaker is not None and not recorded:
+                breaker.release(circuit)
+        async with AsyncExitStack() as cleanup:
+            cleanup.push_async_exit(opened)
+            if not 200 <= resp.status_code < 300:
+                body = b"".join([chunk async for chunk in resp.chunks])
+                if resp.status_code == 429 and limiter is not None:
+                    await limiter.apenalize(
+                        parse_retry_after(get_header(resp.headers, "Retry-After"))
+                    )
+                decode_response(
+                    TransportResponse(resp.status_code, resp.headers, body), self.codec
+                )
+                return
+            parser = DataStreamParser()
+            try:
+                async for chunk in resp.chunks:
+                    for entry in parser.feed(chunk):
+                        yield entry
+                for entry in parser.close():
+                    yield entry
+            except ValueError as exc:
+                raise OpenShockPYError(f"Malformed log page: {exc}") from exc
+
     # -- control actions ---------------------------------------------------
 
     async def control(
@@ -513,10 +1320,7 @@ class AsyncOpenShockClient:
             validate_action_params(
                 int(entry.get("intensity", 0)), int(entry.get("duration", 0))
             )
-        payload = build_control_request(controls, custom_name)
-        return await self._request(
-            "POST", "/2/shockers/control", json_body=payload, api_key=api_key
-        )
+        return await self._send_controls(list(controls), custom_name, api_key)
 
     async def send_action(
         self,
@@ -541,6 +1345,8 @@ class AsyncOpenShockClient:
 
         Returns:
             The decoded response, or None when the API returns no content.
+            With ``coalesce_window`` set this is the response to the shared
+            request the control was merged into.
 
         Raises:
             OpenShockValidationError: If a parameter is out of range.
@@ -551,12 +1357,11 @@ class AsyncOpenShockClient:
                 control_type, intensity, duration, exclusive, api_key, custom_name
             )
         entry = build_control(shocker_id, control_type, intensity, duration, exclusive)
-        return await self._request(
-            "POST",
-            "/2/shockers/control",
-            json_body=build_control_request([entry], custom_name),
-            api_key=api_key,
-        )
+        if control_type == "Stop" and self.priority_stop:
+            return await self._send_stop([shocker_id], custom_name, api_key)
+        if self._coalescer is not None and control_type != "Stop":
+            return await self._coalescer.submit(entry, custom_name, api_key)
+        return await self._send_controls([entry], custom_name, api_key)
 
     async def shock(
         self,
@@ -610,8 +1415,107 @@ class AsyncOpenShockClient:
             shocker_id, "Stop", 0, 300, False, api_key, custom_name
         )
 
-    async def _all_shocker_ids(self, api_key: Optional[str] = None) -> List[str]:
+    async def _send_controls(
+        self,
+        controls: List[Control],
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> Optional[ActionResponse]:
+        if self._coalescer is not None:
+            # Coalesced controls queued before a Stop must not land after it.
+            stopped = [c["id"] for c in controls if c["type"] == "Stop"]
+            if stopped:
+                await self._coalescer.flush(stopped)
+        sent_at = time.time()
+        try:
+            return await self._request(
+                "POST",
+                CONTROL_PATH,
+                json_body=build_control_request(controls, custom_name),
+                api_key=api_key,
+            )
+        except OpenShockPYError as exc:
+            if self.reconciler is None or not is_ambiguous_failure(exc):
+                raise
+            results = await self.reconcile_controls(
+                controls, sent_at, custom_name, api_key
+            )
+            missing = self.reconciler.to_resend(results)
+            if missing is None:
+                raise
+            if not missing:
+                return None
+        return await self._request(
+            "POST",
+            CONTROL_PATH,
+            json_body=build_control_request(missing, custom_name),
+            api_key=api_key,
+        )
+
+    async def reconcile_controls(
+        self,
+        controls: Sequence[Control],
+        sent_at: float,
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> List[ReconcileResult]:
+        """Check the shocker logs for whether ``controls`` were delivered.
+
+        Reads the logs of every targeted shocker concurrently, up to the
+        reconciler's ``max_polls`` times, until each control has a matching
+        entry. Uses the client's ``reconciler`` settings, or the defaults.
+
+        Args:
+            controls: The controls of the request in doubt.
+            sent_at: When it was sent, as a `time.time` timestamp.
+            custom_name: The ``custom_name`` it was sent with.
+            api_key: Optional API token to use instead of the stored one.
+
+        Returns:
+            One `ReconcileResult` per control, in order.
+        """
+        reconciler = self.reconciler or ControlReconciler()
+        state = reconciler.begin(controls, custom_name, sent_at)
+        gate = asyncio.Semaphore(reconciler.concurrency)
+
+        async def read(shocker_id: str) -> Optional[List[Mapping[str, Any]]]:
+            async with gate:
+                try:
+                    response = await self.get_shocker_logs(
+                        shocker_id, limit=reconciler.page_size, api_key=api_key
+                    )
+                except OpenShockPYError:
+                    return None
+            return log_entries(response)
+
+        for poll in range(reconciler.max_polls):
+            shockers = state.pending_shockers()
+            if not shockers:
+                break
+            if poll:
+                await asyncio.sleep(reconciler.poll_interval)
+            logs = await asyncio.gather(*(read(sid) for sid in shockers))
+            for shocker_id, entries in zip(shockers, logs):
+                state.update(shocker_id, entries)
+        return state.results()
+
+    async def refresh_shocker_cache(self, api_key: Optional[str] = None) -> List[str]:
+        """Re-list shockers and cache their ids for the ``*_all`` methods.
+
+        Returns the de-duplicated ids. Useful to warm the cache before an
+        emergency `stop_all`, or after shockers were changed elsewhere.
+        """
         ids = extract_shocker_ids(await self.list_shockers(api_key=api_key))
+        if ids:
+            self._shocker_cache.put(api_key, ids)
+        else:
+            self._shocker_cache.invalidate(api_key)
+        return ids
+
+    async def _all_shocker_ids(self, api_key: Optional[str] = None) -> List[str]:
+        ids = self._shocker_cache.get(api_key)
+        if ids is None:
+            ids = await self.refresh_shocker_cache(api_key)
         if not ids:
             raise OpenShockNotFoundError("No shockers found")
         return ids
@@ -627,8 +1531,9 @@ class AsyncOpenShockClient:
     ) -> Optional[ActionResponse]:
         """Send one action to every shocker the account can control.
 
-        Shockers are looked up via `list_shockers` and de-duplicated, then sent
-        as a single control request so the action applies atomically.
+        Shockers are looked up via `list_shockers` (or taken from the cache
+        when ``shocker_cache_ttl`` is set) and de-duplicated, then sent as a
+        single control request so the action applies atomically.
 
         Raises:
             OpenShockValidationError: If a parameter is out of range.
@@ -636,16 +1541,22 @@ class AsyncOpenShockClient:
             OpenShockAPIError: If the API returns an error status code.
         """
         validate_action_params(intensity, duration)
+        if control_type == "Stop" and self.priority_stop:
+            return await self._send_stop(
+                await self._all_shocker_ids(api_key), custom_name, api_key
+            )
         controls = [
             build_control(sid, control_type, intensity, duration, exclusive)
             for sid in await self._all_shocker_ids(api_key)
         ]
-        return await self._request(
-            "POST",
-            "/2/shockers/control",
-            json_body=build_control_request(controls, custom_name),
-            api_key=api_key,
-        )
+        try:
+            return await self._send_controls(controls, custom_name, api_key)
+        except OpenShockAPIError as exc:
+            # A 4xx here usually means the cached listing went stale (a
+            # shocker was removed elsewhere), so re-list next time.
+            if exc.status_code in _STALE_LISTING_STATUSES:
+                self._shocker_cache.invalidate(api_key)
+            raise
 
     async def shock_all(
         self,
@@ -695,7 +1606,7 @@ class AsyncOpenShockClient:
 
     async def list_public_shares(self, api_key: Optional[str] = None) -> Any:
         """List public share links. ``GET /1/shares/links``."""
-        return await self._request("GET", "/1/shares/links", api_key=api_key)
+        return await self._call("list_public_shares", api_key=api_key)
 
     async def create_public_share(
         self,
@@ -709,27 +1620,24 @@ class AsyncOpenShockClient:
             name: Share name, 1-64 characters.
             expires_on: ISO-8601 timestamp, or None for no expiry.
         """
-        return await self._request(
-            "POST",
-            "/1/shares/links",
-            json_body=clean_params({"name": name, "expiresOn": expires_on}),
-            api_key=api_key,
+        return await self._call(
+            "create_public_share", name=name, expires_on=expires_on, api_key=api_key
         )
 
     async def delete_public_share(
         self, public_share_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Delete a public share link. ``DELETE /1/shares/links/{publicShareId}``."""
-        return await self._request(
-            "DELETE", f"/1/shares/links/{public_share_id}", api_key=api_key
+        return await self._call(
+            "delete_public_share", public_share_id=public_share_id, api_key=api_key
         )
 
     async def get_public_share(
         self, public_share_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Read a public share link. ``GET /1/public/shares/links/{publicShareId}``."""
-        return await self._request(
-            "GET", f"/1/public/shares/links/{public_share_id}", api_key=api_key
+        return await self._call(
+            "get_public_share", public_share_id=public_share_id, api_key=api_key
         )
 
     async def add_shocker_to_public_share(
@@ -744,10 +1652,12 @@ class AsyncOpenShockClient:
 
         ``POST /1/shares/links/{publicShareId}/{shockerId}``.
         """
-        return await self._request(
-            "POST",
-            f"/1/shares/links/{public_share_id}/{shocker_id}",
-            json_body={"permissions": permissions, "limits": limits},
+        return await self._call(
+            "add_shocker_to_public_share",
+            public_share_id=public_share_id,
+            shocker_id=shocker_id,
+            permissions=permissions,
+            limits=limits,
             api_key=api_key,
         )
 
@@ -758,9 +1668,10 @@ class AsyncOpenShockClient:
 
         ``DELETE /1/shares/links/{publicShareId}/{shockerId}``.
         """
-        return await self._request(
-            "DELETE",
-            f"/1/shares/links/{public_share_id}/{shocker_id}",
+        return await self._call(
+            "remove_shocker_from_public_share",
+            public_share_id=public_share_id,
+            shocker_id=shocker_id,
             api_key=api_key,
         )
 
@@ -768,13 +1679,13 @@ class AsyncOpenShockClient:
         self, shocker_id: str, api_key: Optional[str] = None
     ) -> Any:
         """List users a shocker is shared with. ``GET /1/shockers/{shockerId}/shares``."""
-        return await self._request(
-            "GET", f"/1/shockers/{shocker_id}/shares", api_key=api_key
+        return await self._call(
+            "list_shocker_shares", shocker_id=shocker_id, api_key=api_key
         )
 
     async def list_user_shares(self, api_key: Optional[str] = None) -> Any:
         """List user-to-user shares. ``GET /2/shares/user``."""
-        return await self._request("GET", "/2/shares/user", api_key=api_key)
+        return await self._call("list_user_shares", api_key=api_key)
 
     async def create_share_invite(
         self,
@@ -788,47 +1699,40 @@ class AsyncOpenShockClient:
             shockers: ``ShockerPermLimitPairWithId`` entries (max 128).
             user: Target user id, or None for an open invite link.
         """
-        return await self._request(
-            "POST",
-            "/2/shares/user/invites",
-            json_body=clean_params({"shockers": list(shockers), "user": user}),
-            api_key=api_key,
+        return await self._call(
+            "create_share_invite", shockers=shockers, user=user, api_key=api_key
         )
 
     async def list_incoming_share_invites(self, api_key: Optional[str] = None) -> Any:
         """``GET /2/shares/user/invites/incoming``."""
-        return await self._request(
-            "GET", "/2/shares/user/invites/incoming", api_key=api_key
-        )
+        return await self._call("list_incoming_share_invites", api_key=api_key)
 
     async def list_outgoing_share_invites(self, api_key: Optional[str] = None) -> Any:
         """``GET /2/shares/user/invites/outgoing``."""
-        return await self._request(
-            "GET", "/2/shares/user/invites/outgoing", api_key=api_key
-        )
+        return await self._call("list_outgoing_share_invites", api_key=api_key)
 
     async def accept_share_invite(
         self, invite_id: str, api_key: Optional[str] = None
     ) -> Any:
         """``POST /2/shares/user/invites/incoming/{inviteId}``."""
-        return await self._request(
-            "POST", f"/2/shares/user/invites/incoming/{invite_id}", api_key=api_key
+        return await self._call(
+            "accept_share_invite", invite_id=invite_id, api_key=api_key
         )
 
     async def decline_share_invite(
         self, invite_id: str, api_key: Optional[str] = None
     ) -> Any:
         """``DELETE /2/shares/user/invites/incoming/{inviteId}``."""
-        return await self._request(
-            "DELETE", f"/2/shares/user/invites/incoming/{invite_id}", api_key=api_key
+        return await self._call(
+            "decline_share_invite", invite_id=invite_id, api_key=api_key
         )
 
     async def cancel_share_invite(
         self, invite_id: str, api_key: Optional[str] = None
     ) -> Any:
         """``DELETE /2/shares/user/invites/outgoing/{inviteId}``."""
-        return await self._request(
-            "DELETE", f"/2/shares/user/invites/outgoing/{invite_id}", api_key=api_key
+        return await self._call(
+            "cancel_share_invite", invite_id=invite_id, api_key=api_key
         )
 
     async def update_user_shares(
@@ -840,14 +1744,12 @@ class AsyncOpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Bulk-update a user's shares. ``PATCH /2/shares/user/{userId}/shockers``."""
-        return await self._request(
-            "PATCH",
-            f"/2/shares/user/{user_id}/shockers",
-            json_body={
-                "shockers": list(shockers),
-                "permissions": permissions,
-                "limits": limits,
-            },
+        return await self._call(
+            "update_user_shares",
+            user_id=user_id,
+            shockers=shockers,
+            permissions=permissions,
+            limits=limits,
             api_key=api_key,
         )
 
@@ -859,10 +1761,11 @@ class AsyncOpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Pause a user's shares. ``POST /2/shares/user/{userId}/shockers/pause``."""
-        return await self._request(
-            "POST",
-            f"/2/shares/user/{user_id}/shockers/pause",
-            json_body={"shockers": list(shockers), "paused": paused},
+        return await self._call(
+            "pause_user_shares",
+            user_id=user_id,
+            shockers=shockers,
+            paused=paused,
             api_key=api_key,
         )
 
@@ -873,26 +1776,23 @@ class AsyncOpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Revoke a user's shares. ``DELETE /2/shares/user/{userId}/shockers``."""
-        return await self._request(
-            "DELETE",
-            f"/2/shares/user/{user_id}/shockers",
-            json_body={"shockers": list(shockers)},
-            api_key=api_key,
+        return await self._call(
+            "remove_user_shares", user_id=user_id, shockers=shockers, api_key=api_key
         )
 
     # -- tokens ------------------------------------------------------------
 
     async def list_tokens(self, api_key: Optional[str] = None) -> Any:
         """List API tokens. ``GET /2/tokens``."""
-        return await self._request("GET", "/2/tokens", api_key=api_key)
+        return await self._call("list_tokens", api_key=api_key)
 
     async def get_token(self, token_id: str, api_key: Optional[str] = None) -> Any:
         """Get one API token. ``GET /2/tokens/{tokenId}``."""
-        return await self._request("GET", f"/2/tokens/{token_id}", api_key=api_key)
+        return await self._call("get_token", token_id=token_id, api_key=api_key)
 
     async def get_self_token(self, api_key: Optional[str] = None) -> Any:
         """Describe the token being used right now. ``GET /2/tokens/self``."""
-        return await self._request("GET", "/2/tokens/self", api_key=api_key)
+        return await self._call("get_self_token", api_key=api_key)
 
     async def create_token(
         self,
@@ -911,17 +1811,12 @@ class AsyncOpenShockClient:
                 ``paused``, ``intensity`` and ``duration`` keys.
             valid_until: ISO-8601 expiry, or None for no expiry.
         """
-        return await self._request(
-            "POST",
-            "/2/tokens",
-            json_body=clean_params(
-                {
-                    "name": name,
-                    "permissions": list(permissions),
-                    "shockerControl": shocker_control,
-                    "validUntil": valid_until,
-                }
-            ),
+        return await self._call(
+            "create_token",
+            name=name,
+            permissions=permissions,
+            shocker_control=shocker_control,
+            valid_until=valid_until,
             api_key=api_key,
         )
 
@@ -934,14 +1829,12 @@ class AsyncOpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Edit an API token. ``PATCH /2/tokens/{tokenId}``."""
-        return await self._request(
-            "PATCH",
-            f"/2/tokens/{token_id}",
-            json_body={
-                "name": name,
-                "permissions": list(permissions),
-                "shockerControl": shocker_control,
-            },
+        return await self._call(
+            "edit_token",
+            token_id=token_id,
+            name=name,
+            permissions=permissions,
+            shocker_control=shocker_control,
             api_key=api_key,
         )
 
@@ -949,62 +1842,52 @@ class AsyncOpenShockClient:
         self, token_id: str, paused: bool, api_key: Optional[str] = None
     ) -> Any:
         """Pause or resume a token. ``PATCH /2/tokens/{tokenId}/paused``."""
-        return await self._request(
-            "PATCH",
-            f"/2/tokens/{token_id}/paused",
-            json_body={"paused": paused},
-            api_key=api_key,
+        return await self._call(
+            "set_token_paused", token_id=token_id, paused=paused, api_key=api_key
         )
 
     async def delete_token(self, token_id: str, api_key: Optional[str] = None) -> Any:
         """Delete a token. ``DELETE /1/tokens/{tokenId}`` (no v2 equivalent)."""
-        return await self._request("DELETE", f"/1/tokens/{token_id}", api_key=api_key)
+        return await self._call("delete_token", token_id=token_id, api_key=api_key)
 
     async def report_tokens(
         self, secrets: Sequence[str], api_key: Optional[str] = None
     ) -> Any:
         """Report leaked tokens. ``POST /2/tokens/report``."""
-        return await self._request(
-            "POST",
-            "/2/tokens/report",
-            json_body={"secrets": list(secrets)},
-            api_key=api_key,
-        )
+        return await self._call("report_tokens", secrets=secrets, api_key=api_key)
 
     # -- account / users / sessions ---------------------------------------
 
     async def get_self(self, api_key: Optional[str] = None) -> Any:
         """Get the authenticated user. ``GET /1/users/self``."""
-        return await self._request("GET", "/1/users/self", api_key=api_key)
+        return await self._call("get_self", api_key=api_key)
 
     async def get_user_by_name(
         self, username: str, api_key: Optional[str] = None
     ) -> Any:
         """Look a user up by name. ``GET /1/users/by-name/{username}``."""
-        return await self._request(
-            "GET", f"/1/users/by-name/{username}", api_key=api_key
-        )
+        return await self._call("get_user_by_name", username=username, api_key=api_key)
 
     async def list_sessions(self, api_key: Optional[str] = None) -> Any:
         """List login sessions. ``GET /1/sessions``."""
-        return await self._request("GET", "/1/sessions", api_key=api_key)
+        return await self._call("list_sessions", api_key=api_key)
 
     async def get_self_session(self, api_key: Optional[str] = None) -> Any:
         """Describe the current session. ``GET /1/sessions/self``."""
-        return await self._request("GET", "/1/sessions/self", api_key=api_key)
+        return await self._call("get_self_session", api_key=api_key)
 
     async def delete_session(
         self, session_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Revoke a session. ``DELETE /1/sessions/{sessionId}``."""
-        return await self._request(
-            "DELETE", f"/1/sessions/{session_id}", api_key=api_key
+        return await self._call(
+            "delete_session", session_id=session_id, api_key=api_key
         )
 
     async def logout(self, api_key: Optional[str] = None) -> Any:
         """Invalidate the current session cookie. ``POST /1/account/logout``."""
-        return await self._request("POST", "/1/account/logout", api_key=api_key)
+        return await self._call("logout", api_key=api_key)
 
     async def get_public_stats(self, api_key: Optional[str] = None) -> Any:
         """Instance-wide public statistics. ``GET /1/public/stats``."""
-        return await self._request("GET", "/1/public/stats", api_key=api_key)
+        return await self._call("get_public_stats", api_key=api_key)
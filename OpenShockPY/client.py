@@ -2,28 +2,56 @@
 # https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
 """Synchronous OpenShock API client (``requests``)."""
 
+import contextvars
+import threading
 import time
-from contextlib import suppress
-from typing import Any, Dict, List, Optional, Sequence
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack, nullcontext, suppress
+from dataclasses import replace
+from itertools import count
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from ._circuit import CircuitBreaker
+from ._coalesce import ControlCoalescer
+from ._codec import resolve_codec
 from ._core import (
-    AUTH_HEADER,
+    CONTROL_PATH,
     DEFAULT_BASE_URL,
     DEFAULT_TIMEOUT,
-    LEGACY_AUTH_HEADER,
-    SESSION_COOKIE,
-    SESSION_HEADER,
+    ENDPOINTS,
+    RETRY_STATUSES,
+    STOP_MAX_RETRY_WAIT,
+    WARMUP_PATH,
     ActionResponse,
+    BatchResult,
+    ClientConfig,
     Control,
     ControlType,
     Device,
     DeviceListResponse,
     DeviceResponse,
+    JSONCodec,
     OpenShockAPIError,
     OpenShockAuthError,
+    OpenShockCircuitOpenError,
     OpenShockConnectionError,
+    OpenShockDeadlineExceededError,
     OpenShockNotFoundError,
     OpenShockPYError,
     OpenShockRateLimitError,
@@ -31,33 +59,81 @@ from ._core import (
     OpenShockValidationError,
     OwnShockerListResponse,
     PermissionType,
+    PoolStats,
     Shocker,
+    ShockerIdCache,
     ShockerLimits,
     ShockerListResponse,
     ShockerModel,
     ShockerPermissions,
     ShockerResponse,
     SortDirection,
-    auth_headers,
-    build_api_error,
+    StreamedResponse,
+    Timeouts,
+    Transport,
+    TransportResponse,
+    batch_target,
     build_control,
     build_control_request,
-    clean_params,
+    config_property,
+    decode_response,
+    encode_stop_request,
     extract_shocker_ids,
+    get_header,
+    logs_params,
     normalize_base_url,
     parse_retry_after,
-    retry_delay,
-    session_headers,
     should_retry,
     should_retry_transport_error,
     validate_action_params,
+    validate_log_paging,
+    validate_warmup,
+)
+from ._hedge import HedgePolicy
+from ._lazy import LazyObject, lazy_response
+from ._models import compact_listing
+from ._ratelimit import RateLimiter, as_limiter
+from ._reconcile import (
+    ControlReconciler,
+    ReconcileResult,
+    is_ambiguous_failure,
+    log_entries,
+)
+from ._retry import (
+    BackoffStrategy,
+    RetryBudget,
+    attempt_timeout,
+    call_deadline,
+    call_timeouts,
+    endpoint_class,
+    fits_deadline,
+    resolve_endpoint_timeouts,
+    retry_delay,
+    time_left,
 )
+from ._singleflight import SingleFlight, flight_key
+from ._stream import DataStreamParser
+from .transports import RequestsTransport
+
+#: Threads hedged reads may run on at once, first attempts and hedges alike.
+#: A read arriving while every one is busy is sent unhedged on its own thread
+#: rather than queued behind the others.
+_HEDGE_WORKERS = 32
+
+#: Longest `close` waits for the keepalive thread. A ping still in flight
+#: then finishes on its own; the thread is a daemon and exits right after.
+_KEEPALIVE_JOIN_TIMEOUT = 0.5
+
+#: Statuses that suggest a cached shocker listing no longer matches the account.
+_STALE_LISTING_STATUSES = frozenset({400, 403, 404})
 
 __all__ = [
     "OpenShockClient",
     "OpenShockPYError",
     "OpenShockValidationError",
     "OpenShockConnectionError",
+    "OpenShockCircuitOpenError",
+    "OpenShockDeadlineExceededError",
     "OpenShockAPIError",
     "OpenShockAuthError",
     "OpenShockNotFoundError",
@@ -81,6 +157,17 @@ __all__ = [
 ]
 
 
+def _submit_in_context(
+    pool: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any
+) -> "Future[Any]":
+    """Run ``fn`` on ``pool`` under a copy of the caller's context.
+
+    Worker threads start from an empty context, which would drop any
+    enclosing `deadline` or `request_timeout`.
+    """
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
 class OpenShockClient:
     """Client for the OpenShock REST API (v1 + v2).
 
@@ -90,50 +177,261 @@ class OpenShockClient:
 
     Attributes:
         base_url: Base URL for the OpenShock API.
-        timeout: Request timeout in seconds.
+        timeout: Request timeout in seconds, or per-phase `Timeouts`;
+            assigning it re-resolves ``endpoint_timeouts``.
+        endpoint_timeouts: Fully resolved `Timeouts` per endpoint class.
         api_key: The API token used for authentication.
+        session_token: The user session token, if one was set.
         user_agent: The User-Agent header value sent with every request.
         max_retries: How many times a retryable response is retried.
+        coalesce_window: Seconds single-shocker controls wait to be merged
+            with others into one request, or None when coalescing is off.
+        shocker_cache_ttl: Seconds the ``*_all`` methods reuse a shocker
+            listing; 0 re-lists on every call.
+        priority_stop: Whether stops travel over their own reserved
+            connection pool.
     """
 
-    base_url: str
-    timeout: float
-    api_key: Optional[str]
-    user_agent: str
+    _timeout: Union[float, Timeouts]
+    _timeout_overrides: Dict[str, Union[float, Timeouts]]
+    endpoint_timeouts: Dict[str, Timeouts]
     max_retries: int
     backoff_factor: float
+    coalesce_window: Optional[float]
+    shocker_cache_ttl: float
+    priority_stop: bool
     _session: Optional[requests.Session]
+    _transport: Optional[Transport]
+
+    # Connection settings live in one immutable `ClientConfig`; these read
+    # it, and assigning one is the same as calling its setter.
+    base_url = config_property("base_url", "SetBaseURL")
+    user_agent = config_property("user_agent", "SetUA")
+    api_key = config_property("api_key", "SetAPIKey")
+    session_token = config_property("session_token", "SetSessionToken")
+
+    @property
+    def timeout(self) -> Union[float, Timeouts]:
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value: Union[float, Timeouts]) -> None:
+        # Re-resolve so endpoint classes without an override follow the change.
+        self.endpoint_timeouts = resolve_endpoint_timeouts(
+            value, self._timeout_overrides
+        )
+        self._timeout = value
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         base_url: str = DEFAULT_BASE_URL,
-        timeout: float = DEFAULT_TIMEOUT,
+        timeout: Union[float, Timeouts] = DEFAULT_TIMEOUT,
         user_agent: Optional[str] = None,
         max_retries: int = 2,
         backoff_factor: float = 0.5,
+        coalesce_window: Optional[float] = None,
+        coalesce_max_batch: int = 64,
+        shocker_cache_ttl: float = 0.0,
+        priority_stop: bool = False,
+        transport: Optional[Transport] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        tcp_keepalive: Optional[float] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        control_rate_limit: Union[float, RateLimiter, None] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        backoff: Optional[BackoffStrategy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[float] = None,
+        endpoint_timeouts: Optional[Mapping[str, Union[float, Timeouts]]] = None,
+        reconciler: Optional[ControlReconciler] = None,
+        hedge: Optional[HedgePolicy] = None,
+        single_flight: bool = False,
+        codec: Union[str, JSONCodec, None] = None,
+        typed_responses: bool = False,
     ) -> None:
         """Initialize the OpenShock client.
 
         Args:
             api_key: Optional API token for authentication.
             base_url: Base URL for the OpenShock API.
-            timeout: Request timeout in seconds.
+            timeout: Request timeout in seconds, or `Timeouts` to set the
+                connect, read, write and pool phases separately.
             user_agent: User-Agent header value. Required before any request;
                 pass it here or via `SetUA`.
             max_retries: Retries for HTTP 429/502/503/504 and transport errors.
             backoff_factor: Base for exponential backoff, in seconds.
+            coalesce_window: Opt-in. When set, `shock`, `vibrate`, `beep` and
+                `send_action` calls for a single shocker that arrive within
+                this many seconds of each other are sent as one
+                ``POST /2/shockers/control``. A few milliseconds is plenty.
+                Stops are never delayed. Ordering is only guaranteed for
+                Stops, which are sent after the controls queued before them;
+                two other controls for one shocker that land in different
+                batches may reach the API in either order.
+            coalesce_max_batch: Flush a coalesced batch early once it holds
+                this many controls.
+            shocker_cache_ttl: Opt-in. How long, in seconds, the shocker ids
+                looked up by the ``*_all`` methods are reused, so a warm
+                `stop_all` is a single request. Creating or deleting shockers
+                or hubs through this client, or changing credentials or the
+                base URL, drops the cache; `refresh_shocker_cache` re-lists
+                on demand.
+            priority_stop: Opt-in. Send every Stop control over a dedicated
+                keep-alive session with a pre-serialized body, bypassing
+                coalescing and backoff sleeps, so a stop never waits behind
+                slow listing calls. Pair it with ``shocker_cache_ttl`` to make
+                a warm `stop_all` a single round trip.
+            transport: Send requests through this `Transport` instead of the
+                default `RequestsTransport`, for example `Urllib3Transport`
+                or a zero-network `InMemoryTransport`. The client owns it
+                and closes it in `close`.
+            pool_connections: How many hosts the default pool keeps
+                connections for (``requests`` default: 10).
+            pool_maxsize: How many idle connections per host the default
+                pool keeps (``requests`` default: 10). With more threads than
+                this, the extra connections are closed after each request;
+                size it to the number of threads and watch `pool_stats`.
+            pool_block: Make threads wait for a pooled connection instead of
+                opening a throwaway one when all ``pool_maxsize`` are busy.
+            tcp_keepalive: Opt-in. Enable TCP keep-alive probes after this
+                many idle seconds, so NATs and load balancers do not silently
+                drop pooled connections.
+            rate_limit: Opt-in. Requests per second, or a `RateLimiter` to
+                share with other clients on the same token. Every request
+                waits for a slot; a 429 slows the limiter down for all of
+                them and it speeds back up once 429s stop.
+            control_rate_limit: Opt-in. A separate limiter for control
+                requests, so listing traffic cannot starve them. Without it
+                controls share ``rate_limit``. Priority stops never wait.
+            retry_budget: Opt-in. A `RetryBudget` capping retries at a
+                fraction of recent requests, so an outage does not multiply
+                traffic. Retries it refuses raise the error at once; its
+                `RetryBudget.stats` counts them. May be shared between
+                clients. Priority stop replays are exempt.
+            backoff: How long to wait between retries when the server sends
+                no ``Retry-After``: a `BackoffStrategy` such as
+                `FullJitterBackoff`, so many clients failing together do not
+                retry in lockstep. Defaults to un-jittered exponential
+                backoff from ``backoff_factor``.
+            circuit_breaker: Opt-in. A `CircuitBreaker` that, once an
+                endpoint keeps failing, raises `OpenShockCircuitOpenError`
+                for it at once instead of waiting out timeouts and retries.
+                May be shared between clients. Priority stops bypass it.
+            deadline: Opt-in. Seconds each call may take in total, across
+                all attempts, backoff sleeps and rate limiter waits. The
+                last attempt's timeout is trimmed to what is left, and a
+                retry that could not finish in time is skipped. Wrap calls
+                in `OpenShockPY.deadline` for a per-call bound.
+            endpoint_timeouts: Timeouts per endpoint class, keyed
+                ``"control"`` (control requests), ``"lookup"`` (everything
+                else) or ``"bulk"`` (log pages), as seconds or `Timeouts`.
+                Unset classes and phases fall back to ``timeout``. Wrap
+                calls in `OpenShockPY.request_timeout` to override them
+                per call.
+            reconciler: Opt-in. A `ControlReconciler`: when a control
+                request fails ambiguously (a 5xx, or a transport error after
+                it may have been sent), read back the targeted shockers'
+                logs and re-send only the controls that did not land.
+            hedge: Opt-in. A `HedgePolicy`: when a GET has not answered
+                within its endpoint's recent p95 latency (or a fixed delay),
+                send a second copy on a pool thread and return whichever
+                answers first; the other is left to finish in the background
+                and its response dropped. Each hedge draws from
+                ``retry_budget`` when one is set. Control requests are never
+                hedged.
+            single_flight: Opt-in. Identical GETs in flight at the same
+                time (same URL, query parameters and credentials) share one
+                request: the first caller sends it and the others wait for
+                its result or error, each getting its own copy. Nothing is
+                cached once the request finishes.
+            codec: Opt-in. Encode request bodies and decode responses,
+                error bodies included, with this `JSONCodec` or one of
+                ``"orjson"``, ``"msgspec"`` or ``"stdlib"``; ``"auto"``
+                picks the fastest one installed. By default the transport
+                encodes bodies and responses go through ``json``.
+            typed_responses: Opt-in. Return the entries of the hub and
+                shocker listings (``list_devices``, ``list_shockers``,
+                ``list_own_shockers``) as compact, read-only
+                `DeviceRecord` and `ShockerRecord` mappings instead of
+                dicts, for large fleets. They read like the dicts they
+                replace but are not ``dict`` instances: call ``to_dict()``
+                before ``json.dumps`` or anything else that needs a dict.
         """
-        self.base_url = normalize_base_url(base_url)
+        self._config = ClientConfig(normalize_base_url(base_url))
+        self._config_lock = threading.Lock()
+        self._timeout_overrides = dict(endpoint_timeouts or {})
         self.timeout = timeout
-        self.user_agent = ""
-        self.api_key = None
-        self.session_token: Optional[str] = None
         self.max_retries = max(0, int(max_retries))
         self.backoff_factor = backoff_factor
-        self._session = requests.Session()
-
-        self._session.headers.setdefault("Accept", "application/json")
+        self.coalesce_window = coalesce_window
+        self.shocker_cache_ttl = shocker_cache_ttl
+        self._shocker_cache = ShockerIdCache(shocker_cache_ttl)
+        self._coalescer: Optional[ControlCoalescer] = None
+        if coalesce_window is not None:
+            self._coalescer = ControlCoalescer(
+                self._send_controls, coalesce_window, coalesce_max_batch
+            )
+        self.priority_stop = priority_stop
+        self.rate_limiter = as_limiter(rate_limit)
+        self.control_rate_limiter = as_limiter(control_rate_limit)
+        self.retry_budget = retry_budget
+        self.backoff = backoff
+        self.circuit_breaker = circuit_breaker
+        if deadline is not None and deadline <= 0:
+            raise OpenShockValidationError("deadline must be greater than 0")
+        self.deadline = deadline
+        self.reconciler = reconciler
+        self.hedge = hedge
+        self.single_flight = single_flight
+        self.codec = resolve_codec(codec)
+        self.typed_responses = typed_responses
+        self._flights = SingleFlight() if single_flight else None
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        # Idle hedge workers; attempts only go to the pool when one is free.
+        self._hedge_slots = threading.BoundedSemaphore(_HEDGE_WORKERS)
+        if hedge is not None:
+            self._hedge_pool = ThreadPoolExecutor(
+                _HEDGE_WORKERS, thread_name_prefix="openshock-hedge"
+            )
+        pool_options: Dict[str, Any] = {
+            name: value
+            for name, value in (
+                ("pool_connections", pool_connections),
+                ("pool_maxsize", pool_maxsize),
+                ("tcp_keepalive", tcp_keepalive),
+            )
+            if value is not None
+        }
+        if pool_block:
+            pool_options["pool_block"] = True
+        if transport is not None and pool_options:
+            raise OpenShockValidationError(
+                "pool options configure the default transport; "
+                "set them on your own transport instead"
+            )
+        self._session = None
+        if transport is None:
+            default = RequestsTransport(**pool_options)
+            self._session = default.session
+            self._session.headers.setdefault("Accept", "application/json")
+            transport = default
+        self._transport = transport
+        self._stop_transport: Transport = transport
+        if priority_stop and self._session is not None:
+            # One kept-alive connection is reserved for stops; extra
+            # concurrent stops open (and then drop) their own rather than
+            # waiting for it.
+            stop_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            stop_session.mount("https://", adapter)
+            stop_session.mount("http://", adapter)
+            self._stop_transport = RequestsTransport(stop_session)
+
+        self._keepalive_stop: Optional[threading.Event] = None
+        self._keepalive_thread: Optional[threading.Thread] = None
 
         if user_agent is not None:
             self.SetUA(user_agent)
@@ -141,56 +439,66 @@ class OpenShockClient:
 
     # -- plumbing ----------------------------------------------------------
 
+    def _limiter_for(self, path: str) -> Optional[RateLimiter]:
+        if path == CONTROL_PATH and self.control_rate_limiter is not None:
+            return self.control_rate_limiter
+        return self.rate_limiter
+
+    def _timeouts_for(self, path: str) -> Timeouts:
+        return call_timeouts(self.endpoint_timeouts[endpoint_class(path)])
+
+    def _retry_delay(
+        self, attempt: int, retry_after: Optional[float], previous: Optional[float]
+    ) -> float:
+        return retry_delay(
+            attempt,
+            retry_after,
+            self.backoff_factor,
+            strategy=self.backoff,
+            previous=previous,
+        )
+
+    def _spend_retry(self) -> bool:
+        budget = self.retry_budget
+        return budget is None or budget.try_spend()
+
     def _url(self, path: str) -> str:
-        return f"{self.base_url}{path}"
+        return self._config.url(path)
 
-    def _ensure_open(self) -> requests.Session:
-        if self._session is None:
+    def _ensure_open(self) -> Transport:
+        if self._transport is None:
             raise OpenShockPYError("Client is closed; create a new OpenShockClient")
-        return self._session
+        return self._transport
 
-    def _ensure_user_agent(self) -> None:
-        if not self.user_agent:
-            raise OpenShockValidationError(
-                "User-Agent must be set via SetUA before using the client"
-            )
-
-    def _get_headers(self, api_key: Optional[str] = None) -> Dict[str, Any]:
-        """Per-request headers, layered on top of the session defaults.
+    def _get_headers(
+        self, api_key: Optional[str] = None, config: Optional[ClientConfig] = None
+    ) -> Dict[str, Any]:
+        """The complete header set for one request.
 
         Args:
             api_key: Optional API token to use instead of the stored one.
                 Pass an empty string to send the request unauthenticated even
                 when a key is stored on the client.
+            config: The snapshot to build from; the current one by default.
+                Callers that also build the URL pass the snapshot they used.
 
         Returns:
-            Headers to merge into the request. A ``None`` value tells
-            ``requests`` to drop that session header for this request.
+            Headers for the transport. A ``None`` value means the header
+            must not be sent, overriding any session default.
         """
-        self._ensure_user_agent()
-        if api_key is None:
-            return dict(auth_headers(self.api_key))
-        if not api_key:
-            return {AUTH_HEADER: None, LEGACY_AUTH_HEADER: None}
-        return dict(auth_headers(api_key))
-
-    def _handle(self, resp: requests.Response) -> Any:
-        """Turn a response into decoded JSON, or raise the matching error."""
-        if 200 <= resp.status_code < 300:
-            if resp.content:
-                try:
-                    return resp.json()
-                except ValueError:
-                    return None
-            return None
-        try:
-            payload = resp.json()
-        except Exception:
-            payload = {"message": resp.text}
-        retry_after = parse_retry_after(
-            getattr(resp, "headers", {}).get("Retry-After")  # type: ignore[union-attr]
-        )
-        raise build_api_error(resp.status_code, payload, retry_after)
+        return (config or self._config).headers(api_key)
+
+    def _call(
+        self,
+        endpoint: str,
+        *,
+        api_key: Optional[str] = None,
+        lazy: bool = False,
+        **args: Any,
+    ) -> Any:
+        """Call one of the `ENDPOINTS` with its endpoint method's arguments."""
+        method, path, kwargs = ENDPOINTS[endpoint].request(args)
+        return self._request(method, path, api_key=api_key, lazy=lazy, **kwargs)
 
     def _request(
         self,
@@ -200,67 +508,270 @@ class OpenShockClient:
         params: Optional[Dict[str, Any]] = None,
         json_body: Optional[Any] = None,
         api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
         """Send a request, retrying only where a replay is safe.
 
         Control requests are POSTs, so they are replayed on HTTP 429 (the
         request was rejected, never executed) but never on a timeout or 5xx,
-        which could otherwise deliver a second shock.
+        which could otherwise deliver a second shock. With ``lazy``, a
+        successful body is returned as a `LazyObject` view, unshared.
         """
-        session = self._ensure_open()
-        url = self._url(path)
-        headers = self._get_headers(api_key)
+        transport = self._ensure_open()
+        config = self._config
+        url = config.url(path)
+        headers = self._get_headers(api_key, config)
+        if lazy:
+            return self._send_request(
+                transport, method, path, config, url, headers, params, json_body, True
+            )
+        if self._flights is not None and method == "GET":
+            result = self._flights.do(
+                flight_key(method, url, params, headers, self._timeouts_for(path)),
+                lambda: self._send_request(
+                    transport, method, path, config, url, headers, params, json_body
+                ),
+                # A waiter stops waiting at its own deadline, not the sender's.
+                timeout=time_left(call_deadline(self.deadline)),
+            )
+        else:
+            result = self._send_request(
+                transport, method, path, config, url, headers, params, json_body
+            )
+        if self.typed_responses and method == "GET":
+            return compact_listing(path, result)
+        return result
+
+    def _send_request(
+        self,
+        transport: Transport,
+        method: str,
+        path: str,
+        config: ClientConfig,
+        url: str,
+        headers: Dict[str, Optional[str]],
+        params: Optional[Dict[str, Any]],
+        json_body: Optional[Any],
+        lazy: bool = False,
+    ) -> Any:
+        """The attempts and retries behind one `_request`."""
+        expires = call_deadline(self.deadline)
+        limiter = self._limiter_for(path)
+        body: Dict[str, Any] = {"json": json_body}
+        codec = self.codec
+        if codec is not None and json_body is not None:
+            body = {"content": codec.encode(json_body)}
+            headers = {**headers, "Content-Type": codec.content_type}
+        breaker = self.circuit_breaker
+        circuit = breaker.key(config.base_url, path) if breaker else None
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
         attempt = 0
+        delay: Optional[float] = None
         while True:
+            if breaker is not None:
+                breaker.before_request(circuit)
+            recorded = False
             try:
-                resp = session.request(
-                    method,
-                    url,
-                    params=params,
-                    json=json_body,
-                    headers=headers,
-                    timeout=self.timeout,
-                )
-            except requests.RequestException as exc:
-                if attempt < self.max_retries and should_retry_transport_error(method):
-                    time.sleep(retry_delay(attempt, None, self.backoff_factor))
+                if limiter is not None:
+                    limiter.acquire(timeout=time_left(expires))
+                timeout = attempt_timeout(self._timeouts_for(path), expires)
+                started = time.monotonic()
+                try:
+                    resp = self._send(
+                        transport,
+                        method,
+                        path,
+                        url,
+                        headers=headers,
+                        params=params,
+                        timeout=timeout,
+                        **body,
+                    )
+                except OpenShockConnectionError as exc:
+                    recorded = True
+                    if breaker is not None:
+                        breaker.record_failure(circuit)
+                    if attempt < self.max_retries and should_retry_transport_error(
+                        method, exc.request_sent
+                    ):
+                        wait = self._retry_delay(attempt, None, delay)
+                        took = time.monotonic() - started
+                        if fits_deadline(expires, wait, took) and self._spend_retry():
+                            delay = wait
+                            time.sleep(delay)
+                            attempt += 1
+                            continue
+                    raise
+                recorded = True
+                if breaker is not None:
+                    if resp.status_code >= 500:
+                        breaker.record_failure(circuit)
+                    else:
+                        breaker.record_success(circuit)
+            finally:
+                if breaker is not None and not recorded:
+                    # Stopped before an outcome (deadline, limiter, cancel):
+                    # give the probe slot back instead of holding it.
+                    breaker.release(circuit)
+            after = None
+            if resp.status_code in RETRY_STATUSES:
+                after = parse_retry_after(get_header(resp.headers, "Retry-After"))
+                if resp.status_code == 429 and limiter is not None:
+                    limiter.penalize(after)
+            if should_retry(resp.status_code, method) and attempt < self.max_retries:
+                wait = self._retry_delay(attempt, after, delay)
+                took = time.monotonic() - started
+                if fits_deadline(expires, wait, took) and self._spend_retry():
+                    delay = wait
+                    time.sleep(delay)
                     attempt += 1
                     continue
-                raise OpenShockConnectionError(
-                    f"{method} {url} failed: {exc}"
-                ) from exc
+            if lazy and 200 <= resp.status_code < 300:
+                return lazy_response(resp.content)
+            return decode_response(resp, self.codec)
+
+    def _send(
+        self, transport: Transport, method: str, path: str, url: str, **kwargs: Any
+    ) -> TransportResponse:
+        hedge = self.hedge
+        if hedge is None or not hedge.applies(method, path):
+            return transport.send(method, url, **kwargs)
+        if not self._hedge_slots.acquire(blocking=False):
+            # Queueing would delay the read and skew the observed latency.
+            return transport.send(method, url, **kwargs)
+        pending = {self._submit_attempt(hedge, path, transport, method, url, kwargs)}
+        try:
+            done, _ = wait(pending, timeout=hedge.delay_for(path))
+            if not done and self._hedge_slots.acquire(blocking=False):
+                if self._spend_retry():
+                    pending.add(
+                        self._submit_attempt(hedge, path, transport, method, url, kwargs)
+                    )
+                else:
+                    self._hedge_slots.release()
+            failures: List[BaseException] = []
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for attempt in done:
+                    error = attempt.exception()
+                    if error is None:
+                        return attempt.result()
+                    failures.append(error)
+            # Every attempt failed; report the first failure.
+            raise failures[0]
+        finally:
+            # A running request cannot be interrupted; the loser finishes on
+            # its pool thread and its response is dropped.
+            for attempt in pending:
+                attempt.cancel()
+
+    def _submit_attempt(
+        self,
+        hedge: HedgePolicy,
+        path: str,
+        transport: Transport,
+        method: str,
+        url: str,
+        kwargs: Dict[str, Any],
+    ) -> "Future[TransportResponse]":
+        """Run one attempt on a hedge worker whose slot the caller holds."""
+        pool = self._hedge_pool
+        started = time.monotonic()
+
+        def finished(attempt: "Future[TransportResponse]") -> None:
+            self._hedge_slots.release()
+            # Losers run to the end too, so slow answers are sampled as well
+            # and the hedge delay is not biased towards the fast ones.
+            if not attempt.cancelled() and attempt.exception() is None:
+                hedge.observe(path, time.monotonic() - started)
 
-            if should_retry(resp.status_code, method) and attempt < self.max_retries:
-                after = parse_retry_after(
-                    getattr(resp, "headers", {}).get("Retry-After")  # type: ignore[union-attr]
+        try:
+            if pool is None:
+                raise RuntimeError("hedged read without a hedge pool")
+            attempt = pool.submit(transport.send, method, url, **kwargs)
+        except BaseException:
+            self._hedge_slots.release()
+            raise
+        attempt.add_done_callback(finished)
+        return attempt
+
+    def _send_stop(
+        self,
+        shocker_ids: Sequence[str],
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> Optional[ActionResponse]:
+        """Send a Stop for ``shocker_ids`` over the priority transport.
+
+        Controls still queued in the coalescer for these shockers are sent
+        first, so none of them lands after the Stop. A repeated Stop is
+        harmless, so unlike other control requests this one is replayed
+        after a 5xx or transport failure too - immediately, without a
+        backoff sleep. A 429 penalizes the control rate limiter and is
+        replayed only after its ``Retry-After`` (or the backoff), and only
+        when that is at most `STOP_MAX_RETRY_WAIT`; otherwise it is raised.
+        """
+        self._ensure_open()
+        if self._coalescer is not None:
+            self._coalescer.flush(shocker_ids)
+        config = self._config
+        url = config.url(CONTROL_PATH)
+        headers = self._get_headers(api_key, config)
+        headers["Content-Type"] = "application/json"
+        body = encode_stop_request(tuple(shocker_ids), custom_name)
+        timeout = attempt_timeout(self._timeouts_for(CONTROL_PATH), None)
+        attempt = 0
+        while True:
+            try:
+                resp = self._stop_transport.send(
+                    "POST", url, headers=headers, content=body, timeout=timeout
                 )
-                time.sleep(retry_delay(attempt, after, self.backoff_factor))
+            except OpenShockConnectionError:
+                if attempt < self.max_retries:
+                    attempt += 1
+                    continue
+                raise
+            if resp.status_code == 429:
+                after = parse_retry_after(get_header(resp.headers, "Retry-After"))
+                limiter = self._limiter_for(CONTROL_PATH)
+                if limiter is not None:
+                    limiter.penalize(after)
+                wait = self._retry_delay(attempt, after, None)
+                if attempt < self.max_retries and wait <= STOP_MAX_RETRY_WAIT:
+                    time.sleep(wait)
+                    attempt += 1
+                    continue
+                return decode_response(resp, self.codec)
+            if resp.status_code in RETRY_STATUSES and attempt < self.max_retries:
                 attempt += 1
                 continue
-            return self._handle(resp)
+            return decode_response(resp, self.codec)
 
     # -- configuration -----------------------------------------------------
 
+    def _configure(self, **changes: Any) -> None:
+        # Writers serialize on the lock; readers just take ``self._config``.
+        with self._config_lock:
+            self._config = replace(self._config, **changes)
+
     def SetUA(self, user_agent: str) -> None:
         """Set the User-Agent header. Required before any request."""
         if not user_agent:
             raise OpenShockValidationError("user_agent must be provided to SetUA")
-        self.user_agent = user_agent
-        self._ensure_open().headers["User-Agent"] = user_agent
+        self._ensure_open()
+        self._configure(user_agent=user_agent)
 
     def SetBaseURL(self, base_url: str) -> None:
         """Set the base API URL, without trailing slashes."""
-        self.base_url = normalize_base_url(base_url)
+        self._configure(base_url=normalize_base_url(base_url))
+        self._shocker_cache.invalidate()
 
     def SetAPIKey(self, api_key: Optional[str]) -> None:
-        """Store the API token in memory and refresh the session headers."""
-        self.api_key = api_key
-        session = self._ensure_open()
-        if api_key:
-            session.headers.update(auth_headers(api_key))
-        else:
-            session.headers.pop(AUTH_HEADER, None)
-            session.headers.pop(LEGACY_AUTH_HEADER, None)
+        """Store the API token in memory; it is sent with every request."""
+        self._ensure_open()
+        self._configure(api_key=api_key)
+        self._shocker_cache.invalidate()
 
     def SetSessionToken(self, session_token: Optional[str]) -> None:
         """Authenticate with a user session token instead of an API token.
@@ -268,14 +779,9 @@ class OpenShockClient:
         Sends it both as the ``OpenShockSession`` header and the
         ``openShockSession`` cookie, which are the two forms the API reads.
         """
-        self.session_token = session_token
-        session = self._ensure_open()
-        if session_token:
-            session.headers.update(session_headers(session_token))
-            session.cookies.set(SESSION_COOKIE, session_token)
-        else:
-            session.headers.pop(SESSION_HEADER, None)
-            session.cookies.pop(SESSION_COOKIE, None)
+        self._ensure_open()
+        self._configure(session_token=session_token)
+        self._shocker_cache.invalidate()
 
     # Pythonic aliases for the historical PascalCase setters.
     set_user_agent = SetUA
@@ -284,11 +790,17 @@ class OpenShockClient:
     set_session_token = SetSessionToken
 
     def close(self) -> None:
-        """Close the underlying HTTP session. Safe to call more than once."""
-        session = self._session
+        """Close the underlying transport. Safe to call more than once."""
+        self._stop_keepalive()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+        transport, stop_transport = self._transport, self._stop_transport
+        self._transport = None
         self._session = None
-        if session is not None:
-            session.close()
+        if transport is not None:
+            transport.close()
+            if stop_transport is not transport:
+                stop_transport.close()
 
     def __del__(self) -> None:
         """Best-effort cleanup; never raises during interpreter shutdown."""
@@ -303,67 +815,259 @@ class OpenShockClient:
         """Exit context manager and close the session."""
         self.close()
 
+    # -- connections -------------------------------------------------------
+
+    def _ping(self, transport: Transport) -> bool:
+        # Any HTTP status means the connection is up; only a transport
+        # failure counts as a miss.
+        try:
+            transport.send(
+                "GET",
+                self._url(WARMUP_PATH),
+                headers=self._get_headers(""),
+                timeout=attempt_timeout(self._timeouts_for(WARMUP_PATH), None),
+            )
+        except OpenShockConnectionError:
+            return False
+        return True
+
+    def _ping_pool(self, connections: int) -> int:
+        transport = self._ensure_open()
+        lanes = [transport] * connections
+        if self._stop_transport is not transport:
+            lanes.append(self._stop_transport)
+        if len(lanes) == 1:
+            return int(self._ping(transport))
+        # Pings must overlap, or the pool would reuse a single connection.
+        with ThreadPoolExecutor(max_workers=len(lanes)) as pool:
+            pings = [_submit_in_context(pool, self._ping, lane) for lane in lanes]
+            return sum(ping.result() for ping in pings)
+
+    def _keepalive_loop(
+        self, stop: threading.Event, connections: int, interval: float
+    ) -> None:
+        while not stop.wait(interval):
+            try:
+                self._ping_pool(connections)
+            except OpenShockPYError:
+                return
+            except Exception:
+                if stop.is_set():
+                    return  # closed under a ping in flight
+                raise
+
+    def _stop_keepalive(self) -> None:
+        stop, thread = self._keepalive_stop, self._keepalive_thread
+        self._keepalive_stop = self._keepalive_thread = None
+        if stop is not None:
+            stop.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(_KEEPALIVE_JOIN_TIMEOUT)
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Connection counters for the request pool.
+
+        Returns a `PoolStats` with how many connections were created, how
+        many requests reused one, and how many were discarded because the
+        pool was full. ``None`` when the transport does not track them.
+        """
+        stats = getattr(self._ensure_open(), "pool_stats", None)
+        return None if stats is None else stats()
+
+    def warmup(
+        self, connections: int = 1, keepalive_interval: Optional[float] = None
+    ) -> int:
+        """Open pooled connections to ``base_url`` ahead of the first request.
+
+        Sends ``connections`` concurrent ``GET /1/public/stats`` requests, so
+        DNS, TCP and TLS setup are paid here rather than by the first
+        control. The `priority_stop` connection is warmed as well. Keep
+        ``connections`` within the pool size (10 for the default transport),
+        or the extra connections are dropped again right away.
+
+        Args:
+            connections: How many connections to open.
+            keepalive_interval: Opt-in. Re-ping the same number of
+                connections every this many seconds from a daemon thread, so
+                idle connections are not reaped by proxies or load
+                balancers. Calling `warmup` again replaces the schedule;
+                `close` stops it, without waiting out a ping in flight.
+
+        Returns:
+            How many pings got a response. Failures are not raised; the
+            first real request reports them.
+        """
+        validate_warmup(connections, keepalive_interval)
+        warmed = self._ping_pool(connections)
+        self._stop_keepalive()
+        if keepalive_interval is not None:
+            stop = threading.Event()
+            thread = threading.Thread(
+                target=self._keepalive_loop,
+                args=(stop, connections, keepalive_interval),
+                name="OpenShockPY-keepalive",
+                daemon=True,
+            )
+            self._keepalive_stop, self._keepalive_thread = stop, thread
+            thread.start()
+        return warmed
+
+    # -- bulk calls --------------------------------------------------------
+
+    def batch(
+        self,
+        method: str,
+        calls: Iterable[Mapping[str, Any]],
+        concurrency: int = 32,
+        ordered: bool = True,
+    ) -> Iterator[BatchResult]:
+        """Call one endpoint method many times from a bounded thread pool.
+
+        Results stream back as they are ready, so thousands of calls never
+        sit in memory at once; at most ``concurrency`` are in flight. Every
+        call goes through the usual retry and backoff. An `OpenShockPYError`
+        from one call is returned in its `BatchResult` and the batch goes
+        on; any other exception stops it.
+
+        Example::
+
+            calls = ({"shocker_id": i, "paused": True} for i in ids)
+            for r in client.batch("pause_shocker", calls):
+                if not r.ok:
+                    print(r.kwargs["shocker_id"], r.error)
+
+        Args:
+            method: Name of the endpoint method, e.g. ``"get_shocker"``.
+            calls: Keyword arguments for each call. Consumed lazily.
+            concurrency: Maximum number of calls in flight.
+            ordered: Yield results in input order. With ``False`` they come
+                in completion order, so one slow call does not hold back the
+                rest.
+
+        Returns:
+            An iterator of `BatchResult`. Leaving it early waits for the
+            calls already in flight and skips the rest.
+        """
+        target = batch_target(self, method, concurrency)
+        self._ensure_open()
+        return self._iter_batch(target, calls, concurrency, ordered)
+
+    @staticmethod
+    def _call_one(
+        target: Callable[..., Any], index: int, kwargs: Mapping[str, Any]
+    ) -> BatchResult:
+        try:
+            return BatchResult(index, kwargs, target(**kwargs))
+        except OpenShockPYError as exc:
+            return BatchResult(index, kwargs, error=exc)
+
+    def _iter_batch(
+        self,
+        target: Callable[..., Any],
+        calls: Iterable[Mapping[str, Any]],
+        concurrency: int,
+        ordered: bool,
+    ) -> Iterator[BatchResult]:
+        items = enumerate(calls)
+        pool = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="OpenShockPY-batch"
+        )
+        pending: Deque["Future[BatchResult]"] = deque()
+
+        def submit_next() -> None:
+            for index, kwargs in items:
+                pending.append(
+                    _submit_in_context(pool, self._call_one, target, index, kwargs)
+                )
+                return
+
+        try:
+            for _ in range(concurrency):
+                submit_next()
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(f for f in pending if f in done)
+                    pending.remove(future)
+                result = future.result()
+                submit_next()
+                yield result
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
     # -- hubs / devices ----------------------------------------------------
 
     def list_devices(self, api_key: Optional[str] = None) -> DeviceListResponse:
         """List every hub owned by the account. ``GET /1/devices``."""
-        return self._request("GET", "/1/devices", api_key=api_key)
+        return self._call("list_devices", api_key=api_key)
 
     def get_device(
         self, device_id: str, api_key: Optional[str] = None
     ) -> DeviceResponse:
         """Get a single hub. ``GET /1/devices/{deviceId}``."""
-        return self._request("GET", f"/1/devices/{device_id}", api_key=api_key)
+        return self._call("get_device", device_id=device_id, api_key=api_key)
 
     def create_device(self, api_key: Optional[str] = None) -> str:
         """Create a hub and return its id. ``POST /1/devices``."""
-        return self._request("POST", "/1/devices", api_key=api_key)
+        try:
+            return self._call("create_device", api_key=api_key)
+        finally:
+            self._shocker_cache.invalidate()
 
     def edit_device(
         self, device_id: str, name: str, api_key: Optional[str] = None
     ) -> Any:
         """Rename a hub. ``PATCH /1/devices/{deviceId}``."""
-        return self._request(
-            "PATCH",
-            f"/1/devices/{device_id}",
-            json_body={"name": name},
-            api_key=api_key,
+        return self._call(
+            "edit_device", device_id=device_id, name=name, api_key=api_key
         )
 
     def delete_device(self, device_id: str, api_key: Optional[str] = None) -> Any:
         """Delete a hub. ``DELETE /1/devices/{deviceId}``."""
-        return self._request("DELETE", f"/1/devices/{device_id}", api_key=api_key)
+        try:
+            return self._call("delete_device", device_id=device_id, api_key=api_key)
+        finally:
+            self._shocker_cache.invalidate()
 
     def regenerate_device_token(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Regenerate a hub's token. ``PUT /1/devices/{deviceId}``."""
-        return self._request("PUT", f"/1/devices/{device_id}", api_key=api_key)
+        return self._call(
+            "regenerate_device_token", device_id=device_id, api_key=api_key
+        )
 
     def get_device_pair_code(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Get a hub pair code. ``GET /1/devices/{deviceId}/pair``."""
-        return self._request("GET", f"/1/devices/{device_id}/pair", api_key=api_key)
+        return self._call("get_device_pair_code", device_id=device_id, api_key=api_key)
 
     def get_device_lcg(self, device_id: str, api_key: Optional[str] = None) -> Any:
         """Get the LCG node a hub is connected to. ``GET /1/devices/{deviceId}/lcg``."""
-        return self._request("GET", f"/1/devices/{device_id}/lcg", api_key=api_key)
+        return self._call("get_device_lcg", device_id=device_id, api_key=api_key)
 
     def get_device_lcg_v2(self, device_id: str, api_key: Optional[str] = None) -> Any:
         """LCG node for a hub, v2 shape. ``GET /2/devices/{deviceId}/lcg``."""
-        return self._request("GET", f"/2/devices/{device_id}/lcg", api_key=api_key)
+        return self._call("get_device_lcg_v2", device_id=device_id, api_key=api_key)
 
     def get_device_ota_updates(
         self, device_id: str, api_key: Optional[str] = None
     ) -> Any:
         """List OTA update history for a hub. ``GET /1/devices/{deviceId}/ota``."""
-        return self._request("GET", f"/1/devices/{device_id}/ota", api_key=api_key)
+        return self._call(
+            "get_device_ota_updates", device_id=device_id, api_key=api_key
+        )
 
     # -- shockers ----------------------------------------------------------
 
     def list_shockers(
-        self, device_id: Optional[str] = None, api_key: Optional[str] = None
+        self,
+        device_id: Optional[str] = None,
+        api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
         """List shockers.
 
@@ -374,28 +1078,33 @@ class OpenShockClient:
                 which returns hubs with nested shockers
                 (`OwnShockerListResponse`).
             api_key: Optional API token to use instead of the stored one.
+            lazy: Return a `LazyObject` view that decodes the listing only
+                as far as it is read, instead of decoding it all up front.
         """
         if device_id:
-            return self._request(
-                "GET", f"/1/devices/{device_id}/shockers", api_key=api_key
+            return self._call(
+                "list_device_shockers", device_id=device_id, api_key=api_key, lazy=lazy
             )
-        return self._request("GET", "/1/shockers/own", api_key=api_key)
+        return self._call("list_own_shockers", api_key=api_key, lazy=lazy)
 
     def list_own_shockers(
-        self, api_key: Optional[str] = None
-    ) -> OwnShockerListResponse:
-        """List owned hubs with their shockers. ``GET /1/shockers/own``."""
-        return self._request("GET", "/1/shockers/own", api_key=api_key)
+        self, api_key: Optional[str] = None, lazy: bool = False
+    ) -> Union[OwnShockerListResponse, LazyObject]:
+        """List owned hubs with their shockers. ``GET /1/shockers/own``.
+
+        With ``lazy=True``, returns a `LazyObject` view instead.
+        """
+        return self._call("list_own_shockers", api_key=api_key, lazy=lazy)
 
     def list_shared_shockers(self, api_key: Optional[str] = None) -> Any:
         """List shockers shared with this account. ``GET /1/shockers/shared``."""
-        return self._request("GET", "/1/shockers/shared", api_key=api_key)
+        return self._call("list_shared_shockers", api_key=api_key)
 
     def get_shocker(
         self, shocker_id: str, api_key: Optional[str] = None
     ) -> ShockerResponse:
         """Get a single shocker. ``GET /1/shockers/{shockerId}``."""
-        return self._request("GET", f"/1/shockers/{shocker_id}", api_key=api_key)
+        return self._call("get_shocker", shocker_id=shocker_id, api_key=api_key)
 
     def create_shocker(
         self,
@@ -406,17 +1115,17 @@ class OpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Create a shocker on a hub. ``POST /1/shockers``."""
-        return self._request(
-            "POST",
-            "/1/shockers",
-            json_body={
-                "device": device_id,
-                "name": name,
-                "rfId": rf_id,
-                "model": model,
-            },
-            api_key=api_key,
-        )
+        try:
+            return self._call(
+                "create_shocker",
+                device_id=device_id,
+                name=name,
+                rf_id=rf_id,
+                model=model,
+                api_key=api_key,
+            )
+        finally:
+            self._shocker_cache.invalidate()
 
     def edit_shocker(
         self,
@@ -432,31 +1141,29 @@ class OpenShockClient:
         The API requires the full ``NewShocker`` body, so every field must be
         supplied even when only one is changing.
         """
-        return self._request(
-            "PATCH",
-            f"/1/shockers/{shocker_id}",
-            json_body={
-                "device": device_id,
-                "name": name,
-                "rfId": rf_id,
-                "model": model,
-            },
+        return self._call(
+            "edit_shocker",
+            shocker_id=shocker_id,
+            device_id=device_id,
+            name=name,
+            rf_id=rf_id,
+            model=model,
             api_key=api_key,
         )
 
     def delete_shocker(self, shocker_id: str, api_key: Optional[str] = None) -> Any:
         """Delete a shocker. ``DELETE /1/shockers/{shockerId}``."""
-        return self._request("DELETE", f"/1/shockers/{shocker_id}", api_key=api_key)
+        try:
+            return self._call("delete_shocker", shocker_id=shocker_id, api_key=api_key)
+        finally:
+            self._shocker_cache.invalidate()
 
     def pause_shocker(
         self, shocker_id: str, paused: bool, api_key: Optional[str] = None
     ) -> Any:
         """Pause or unpause a shocker. ``POST /1/shockers/{shockerId}/pause``."""
-        return self._request(
-            "POST",
-            f"/1/shockers/{shocker_id}/pause",
-            json_body={"pause": paused},
-            api_key=api_key,
+        return self._call(
+            "pause_shocker", shocker_id=shocker_id, paused=paused, api_key=api_key
         )
 
     def get_shocker_logs(
@@ -465,13 +1172,19 @@ class OpenShockClient:
         offset: Optional[int] = None,
         limit: Optional[int] = None,
         api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
-        """Get control logs for one shocker. ``GET /1/shockers/{shockerId}/logs``."""
-        return self._request(
-            "GET",
-            f"/1/shockers/{shocker_id}/logs",
-            params=clean_params({"offset": offset, "limit": limit}),
+        """Get control logs for one shocker. ``GET /1/shockers/{shockerId}/logs``.
+
+        With ``lazy=True``, returns a `LazyObject` view instead.
+        """
+        return self._call(
+            "get_shocker_logs",
+            shocker_id=shocker_id,
+            offset=offset,
+            limit=limit,
             api_key=api_key,
+            lazy=lazy,
         )
 
     def get_logs(
@@ -483,24 +1196,182 @@ class OpenShockClient:
         sort_dir: Optional[SortDirection] = None,
         shocker_ids: Optional[Sequence[str]] = None,
         api_key: Optional[str] = None,
+        lazy: bool = False,
     ) -> Any:
-        """Get paged control logs across shockers. ``GET /1/shockers/logs``."""
-        return self._request(
-            "GET",
-            "/1/shockers/logs",
-            params=clean_params(
-                {
-                    "page": page,
-                    "pageSize": page_size,
-                    "search": search,
-                    "sort": sort,
-                    "sortDir": sort_dir,
-                    "shockerIds": list(shocker_ids) if shocker_ids else None,
-                }
-            ),
+        """Get paged control logs across shockers. ``GET /1/shockers/logs``.
+
+        With ``lazy=True``, returns a `LazyObject` view instead.
+        """
+        return self._call(
+            "get_logs",
+            page=page,
+            page_size=page_size,
+            search=search,
+            sort=sort,
+            sort_dir=sort_dir,
+            shocker_ids=shocker_ids,
             api_key=api_key,
+            lazy=lazy,
         )
 
+    def iter_logs(
+        self,
+        page_size: int = 100,
+        search: Optional[str] = None,
+        sort: Optional[str] = None,
+        sort_dir: Optional[SortDirection] = None,
+        shocker_ids: Optional[Sequence[str]] = None,
+        first_page: int = 1,
+        prefetch: int = 4,
+        api_key: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """Yield log entries page after page, fetching the next pages ahead.
+
+        Walks `get_logs` pages from ``first_page`` and stops at the first
+        empty page. A short page does not end the walk, since the server
+        may cap ``page_size``. While one page is being read, the next
+        ``prefetch`` pages are already requested from a small thread pool,
+        so a long backfill is paced by throughput and the rate limiter
+        rather than by one round trip per page. Every page goes through the
+        usual retries and rate limiting; up to ``prefetch`` requests past
+        the empty page are sent and their results dropped.
+
+        Example::
+
+            for entry in client.iter_logs(page_size=500, prefetch=8):
+                writer.writerow(entry)
+
+        Args:
+            page_size: Entries per page to ask for.
+            search: Filter, as in `get_logs`.
+            sort: Sort field, as in `get_logs`.
+            sort_dir: Sort direction, as in `get_logs`.
+            shocker_ids: Only these shockers' logs.
+            first_page: The page to start from.
+            prefetch: Pages requested ahead of the one being read; ``0``
+                walks the pages one by one.
+            api_key: Optional API token to use instead of the stored one.
+
+        Returns:
+            An iterator of log entries in page order. An error raises once
+            its page is reached. Leaving the iterator early waits for the
+            pages in flight and skips the rest.
+        """
+        validate_log_paging(page_size, prefetch)
+        self._ensure_open()
+
+        def fetch(page: int) -> Any:
+            return self.get_logs(
+                page, page_size, search, sort, sort_dir, shocker_ids, api_key
+            )
+
+        return self._iter_logs(fetch, first_page, prefetch)
+
+    @staticmethod
+    def _iter_logs(
+        fetch: Callable[[int], Any], first_page: int, prefetch: int
+    ) -> Iterator[Any]:
+        pages = count(first_page)
+        pool = ThreadPoolExecutor(
+            max_workers=prefetch + 1, thread_name_prefix="OpenShockPY-logs"
+        )
+        pending: Deque["Future[Any]"] = deque(
+            _submit_in_context(pool, fetch, next(pages)) for _ in range(prefetch + 1)
+        )
+        try:
+            while pending:
+                entries = log_entries(pending.popleft().result())
+                if not entries:
+                    return
+                pending.append(_submit_in_context(pool, fetch, next(pages)))
+                yield from entries
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def iter_logs_stream(
+        self,
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        search: Optional[str] = None,
+        sort: Optional[str] = None,
+        sort_dir: Optional[SortDirection] = None,
+        shocker_ids: Optional[Sequence[str]] = None,
+        api_key: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """Yield the entries of one `get_logs` page as they arrive.
+
+        The body is read in chunks and each entry is decoded as soon as it is
+        complete, so memory holds one chunk and one entry however large
+        ``page_size`` is. The request is sent on the first ``next()``; close
+        the iterator to drop the rest of the body. Errors raise as in
+        `get_logs`, but nothing is retried: entries already yielded cannot be
+        taken back.
+        """
+        transport = self._ensure_open()
+        config = self._config
+        path = ENDPOINTS["get_logs"].path
+        url = config.url(path)
+        headers = self._get_headers(api_key, config)
+        params = logs_params(page, page_size, search, sort, sort_dir, shocker_ids)
+        limiter = self._limiter_for(path)
+        breaker = self.circuit_breaker
+        circuit = breaker.key(config.base_url, path) if breaker else None
+        if breaker is not None:
+            breaker.before_request(circuit)
+        recorded = False
+        try:
+            expires = call_deadline(self.deadline)
+            if limiter is not None:
+                limiter.acquire(timeout=time_left(expires))
+            timeout = attempt_timeout(self._timeouts_for(path), expires)
+            stream = getattr(transport, "stream", None)
+            try:
+                if stream is None:
+                    sent = transport.send(
+                        "GET", url, headers=headers, params=params, timeout=timeout
+                    )
+                    opened: Any = nullcontext(
+                        StreamedResponse(sent.status_code, sent.headers, [sent.content])
+                    )
+                else:
+                    opened = stream(
+                        "GET", url, headers=headers, params=params, timeout=timeout
+                    )
+                resp = opened.__enter__()
+                recorded = True
+                if breaker is not None:
+                    if resp.status_code >= 500:
+                        breaker.record_failure(circuit)
+                    else:
+                        breaker.record_success(circuit)
+            except OpenShockConnectionError:
+                recorded = True
+                if breaker is not None:
+                    breaker.record_failure(circuit)
+                raise
+        finally:
+            if breaker is not None and not recorded:
+                breaker.release(circuit)
+        with ExitStack() as cleanup:
+            cleanup.push(opened)
+            if not 200 <= resp.status_code < 300:
+                body = b"".join(resp.chunks)
+                if resp.status_code == 429 and limiter is not None:
+                    limiter.penalize(
+                        parse_retry_after(get_header(resp.headers, "Retry-After"))
+                    )
+                decode_response(
+                    TransportResponse(resp.status_code, resp.headers, body), self.codec
+                )
+                return
+            parser = DataStreamParser()
+            try:
+                for chunk in resp.chunks:
+                    yield from parser.feed(chunk)
+                yield from parser.close()
+            except ValueError as exc:
+                raise OpenShockPYError(f"Malformed log page: {exc}") from exc
+
     # -- control actions ---------------------------------------------------
 
     def control(
@@ -525,10 +1396,7 @@ class OpenShockClient:
             validate_action_params(
                 int(entry.get("intensity", 0)), int(entry.get("duration", 0))
             )
-        payload = build_control_request(controls, custom_name)
-        return self._request(
-            "POST", "/2/shockers/control", json_body=payload, api_key=api_key
-        )
+        return self._send_controls(list(controls), custom_name, api_key)
 
     def send_action(
         self,
@@ -553,6 +1421,8 @@ class OpenShockClient:
 
         Returns:
             The decoded response, or None when the API returns no content.
+            With ``coalesce_window`` set this is the response to the shared
+            request the control was merged into.
 
         Raises:
             OpenShockValidationError: If a parameter is out of range.
@@ -562,15 +1432,12 @@ class OpenShockClient:
             return self.send_action_all(
                 control_type, intensity, duration, exclusive, api_key, custom_name
             )
-        entry = build_control(
-            shocker_id, control_type, intensity, duration, exclusive
-        )
-        return self._request(
-            "POST",
-            "/2/shockers/control",
-            json_body=build_control_request([entry], custom_name),
-            api_key=api_key,
-        )
+        entry = build_control(shocker_id, control_type, intensity, duration, exclusive)
+        if control_type == "Stop" and self.priority_stop:
+            return self._send_stop([shocker_id], custom_name, api_key)
+        if self._coalescer is not None and control_type != "Stop":
+            return self._coalescer.submit(entry, custom_name, api_key)
+        return self._send_controls([entry], custom_name, api_key)
 
     def shock(
         self,
@@ -624,8 +1491,104 @@ class OpenShockClient:
             shocker_id, "Stop", 0, 300, False, api_key, custom_name
         )
 
-    def _all_shocker_ids(self, api_key: Optional[str] = None) -> List[str]:
+    def _send_controls(
+        self,
+        controls: List[Control],
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> Optional[ActionResponse]:
+        if self._coalescer is not None:
+            # Coalesced controls queued before a Stop must not land after it.
+            stopped = [c["id"] for c in controls if c["type"] == "Stop"]
+            if stopped:
+                self._coalescer.flush(stopped)
+        sent_at = time.time()
+        try:
+            return self._request(
+                "POST",
+                CONTROL_PATH,
+                json_body=build_control_request(controls, custom_name),
+                api_key=api_key,
+            )
+        except OpenShockPYError as exc:
+            if self.reconciler is None or not is_ambiguous_failure(exc):
+                raise
+            results = self.reconcile_controls(controls, sent_at, custom_name, api_key)
+            missing = self.reconciler.to_resend(results)
+            if missing is None:
+                raise
+            if not missing:
+                return None
+        return self._request(
+            "POST",
+            CONTROL_PATH,
+            json_body=build_control_request(missing, custom_name),
+            api_key=api_key,
+        )
+
+    def reconcile_controls(
+        self,
+        controls: Sequence[Control],
+        sent_at: float,
+        custom_name: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> List[ReconcileResult]:
+        """Check the shocker logs for whether ``controls`` were delivered.
+
+        Reads the logs of every targeted shocker concurrently, up to the
+        reconciler's ``max_polls`` times, until each control has a matching
+        entry. Uses the client's ``reconciler`` settings, or the defaults.
+
+        Args:
+            controls: The controls of the request in doubt.
+            sent_at: When it was sent, as a `time.time` timestamp.
+            custom_name: The ``custom_name`` it was sent with.
+            api_key: Optional API token to use instead of the stored one.
+
+        Returns:
+            One `ReconcileResult` per control, in order.
+        """
+        reconciler = self.reconciler or ControlReconciler()
+        state = reconciler.begin(controls, custom_name, sent_at)
+
+        def read(shocker_id: str) -> Optional[List[Mapping[str, Any]]]:
+            try:
+                response = self.get_shocker_logs(
+                    shocker_id, limit=reconciler.page_size, api_key=api_key
+                )
+            except OpenShockPYError:
+                return None
+            return log_entries(response)
+
+        with ThreadPoolExecutor(max_workers=reconciler.concurrency) as pool:
+            for poll in range(reconciler.max_polls):
+                shockers = state.pending_shockers()
+                if not shockers:
+                    break
+                if poll:
+                    time.sleep(reconciler.poll_interval)
+                reads = [_submit_in_context(pool, read, shocker) for shocker in shockers]
+                for shocker_id, entries in zip(shockers, reads):
+                    state.update(shocker_id, entries.result())
+        return state.results()
+
+    def refresh_shocker_cache(self, api_key: Optional[str] = None) -> List[str]:
+        """Re-list shockers and cache their ids for the ``*_all`` methods.
+
+        Returns the de-duplicated ids. Useful to warm the cache before an
+        emergency `stop_all`, or after shockers were changed elsewhere.
+        """
         ids = extract_shocker_ids(self.list_shockers(api_key=api_key))
+        if ids:
+            self._shocker_cache.put(api_key, ids)
+        else:
+            self._shocker_cache.invalidate(api_key)
+        return ids
+
+    def _all_shocker_ids(self, api_key: Optional[str] = None) -> List[str]:
+        ids = self._shocker_cache.get(api_key)
+        if ids is None:
+            ids = self.refresh_shocker_cache(api_key)
         if not ids:
             raise OpenShockNotFoundError("No shockers found")
         return ids
@@ -641,8 +1604,9 @@ class OpenShockClient:
     ) -> Optional[ActionResponse]:
         """Send one action to every shocker the account can control.
 
-        Shockers are looked up via `list_shockers` and de-duplicated, then sent
-        as a single control request so the action applies atomically.
+        Shockers are looked up via `list_shockers` (or taken from the cache
+        when ``shocker_cache_ttl`` is set) and de-duplicated, then sent as a
+        single control request so the action applies atomically.
 
         Raises:
             OpenShockValidationError: If a parameter is out of range.
@@ -650,16 +1614,22 @@ class OpenShockClient:
             OpenShockAPIError: If the API returns an error status code.
         """
         validate_action_params(intensity, duration)
+        if control_type == "Stop" and self.priority_stop:
+            return self._send_stop(
+                self._all_shocker_ids(api_key), custom_name, api_key
+            )
         controls = [
             build_control(sid, control_type, intensity, duration, exclusive)
             for sid in self._all_shocker_ids(api_key)
         ]
-        return self._request(
-            "POST",
-            "/2/shockers/control",
-            json_body=build_control_request(controls, custom_name),
-            api_key=api_key,
-        )
+        try:
+            return self._send_controls(controls, custom_name, api_key)
+        except OpenShockAPIError as exc:
+            # A 4xx here usually means the cached listing went stale (a
+            # shocker was removed elsewhere), so re-list next time.
+            if exc.status_code in _STALE_LISTING_STATUSES:
+                self._shocker_cache.invalidate(api_key)
+            raise
 
     def shock_all(
         self,
@@ -709,7 +1679,7 @@ class OpenShockClient:
 
     def list_public_shares(self, api_key: Optional[str] = None) -> Any:
         """List public share links. ``GET /1/shares/links``."""
-        return self._request("GET", "/1/shares/links", api_key=api_key)
+        return self._call("list_public_shares", api_key=api_key)
 
     def create_public_share(
         self,
@@ -723,27 +1693,24 @@ class OpenShockClient:
             name: Share name, 1-64 characters.
             expires_on: ISO-8601 timestamp, or None for no expiry.
         """
-        return self._request(
-            "POST",
-            "/1/shares/links",
-            json_body=clean_params({"name": name, "expiresOn": expires_on}),
-            api_key=api_key,
+        return self._call(
+            "create_public_share", name=name, expires_on=expires_on, api_key=api_key
         )
 
     def delete_public_share(
         self, public_share_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Delete a public share link. ``DELETE /1/shares/links/{publicShareId}``."""
-        return self._request(
-            "DELETE", f"/1/shares/links/{public_share_id}", api_key=api_key
+        return self._call(
+            "delete_public_share", public_share_id=public_share_id, api_key=api_key
         )
 
     def get_public_share(
         self, public_share_id: str, api_key: Optional[str] = None
     ) -> Any:
         """Read a public share link. ``GET /1/public/shares/links/{publicShareId}``."""
-        return self._request(
-            "GET", f"/1/public/shares/links/{public_share_id}", api_key=api_key
+        return self._call(
+            "get_public_share", public_share_id=public_share_id, api_key=api_key
         )
 
     def add_shocker_to_public_share(
@@ -758,10 +1725,12 @@ class OpenShockClient:
 
         ``POST /1/shares/links/{publicShareId}/{shockerId}``.
         """
-        return self._request(
-            "POST",
-            f"/1/shares/links/{public_share_id}/{shocker_id}",
-            json_body={"permissions": permissions, "limits": limits},
+        return self._call(
+            "add_shocker_to_public_share",
+            public_share_id=public_share_id,
+            shocker_id=shocker_id,
+            permissions=permissions,
+            limits=limits,
             api_key=api_key,
         )
 
@@ -772,9 +1741,10 @@ class OpenShockClient:
 
         ``DELETE /1/shares/links/{publicShareId}/{shockerId}``.
         """
-        return self._request(
-            "DELETE",
-            f"/1/shares/links/{public_share_id}/{shocker_id}",
+        return self._call(
+            "remove_shocker_from_public_share",
+            public_share_id=public_share_id,
+            shocker_id=shocker_id,
             api_key=api_key,
         )
 
@@ -782,13 +1752,11 @@ class OpenShockClient:
         self, shocker_id: str, api_key: Optional[str] = None
     ) -> Any:
         """List users a shocker is shared with. ``GET /1/shockers/{shockerId}/shares``."""
-        return self._request(
-            "GET", f"/1/shockers/{shocker_id}/shares", api_key=api_key
-        )
+        return self._call("list_shocker_shares", shocker_id=shocker_id, api_key=api_key)
 
     def list_user_shares(self, api_key: Optional[str] = None) -> Any:
         """List user-to-user shares. ``GET /2/shares/user``."""
-        return self._request("GET", "/2/shares/user", api_key=api_key)
+        return self._call("list_user_shares", api_key=api_key)
 
     def create_share_invite(
         self,
@@ -802,44 +1770,31 @@ class OpenShockClient:
             shockers: ``ShockerPermLimitPairWithId`` entries (max 128).
             user: Target user id, or None for an open invite link.
         """
-        return self._request(
-            "POST",
-            "/2/shares/user/invites",
-            json_body=clean_params({"shockers": list(shockers), "user": user}),
-            api_key=api_key,
+        return self._call(
+            "create_share_invite", shockers=shockers, user=user, api_key=api_key
         )
 
     def list_incoming_share_invites(self, api_key: Optional[str] = None) -> Any:
         """``GET /2/shares/user/invites/incoming``."""
-        return self._request(
-            "GET", "/2/shares/user/invites/incoming", api_key=api_key
-        )
+        return self._call("list_incoming_share_invites", api_key=api_key)
 
     def list_outgoing_share_invites(self, api_key: Optional[str] = None) -> Any:
         """``GET /2/shares/user/invites/outgoing``."""
-        return self._request(
-            "GET", "/2/shares/user/invites/outgoing", api_key=api_key
-        )
+        return self._call("list_outgoing_share_invites", api_key=api_key)
 
     def accept_share_invite(self, invite_id: str, api_key: Optional[str] = None) -> Any:
         """``POST /2/shares/user/invites/incoming/{inviteId}``."""
-        return self._request(
-            "POST", f"/2/shares/user/invites/incoming/{invite_id}", api_key=api_key
-        )
+        return self._call("accept_share_invite", invite_id=invite_id, api_key=api_key)
 
     def decline_share_invite(
         self, invite_id: str, api_key: Optional[str] = None
     ) -> Any:
         """``DELETE /2/shares/user/invites/incoming/{inviteId}``."""
-        return self._request(
-            "DELETE", f"/2/shares/user/invites/incoming/{invite_id}", api_key=api_key
-        )
+        return self._call("decline_share_invite", invite_id=invite_id, api_key=api_key)
 
     def cancel_share_invite(self, invite_id: str, api_key: Optional[str] = None) -> Any:
         """``DELETE /2/shares/user/invites/outgoing/{inviteId}``."""
-        return self._request(
-            "DELETE", f"/2/shares/user/invites/outgoing/{invite_id}", api_key=api_key
-        )
+        return self._call("cancel_share_invite", invite_id=invite_id, api_key=api_key)
 
     def update_user_shares(
         self,
@@ -850,14 +1805,12 @@ class OpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Bulk-update a user's shares. ``PATCH /2/shares/user/{userId}/shockers``."""
-        return self._request(
-            "PATCH",
-            f"/2/shares/user/{user_id}/shockers",
-            json_body={
-                "shockers": list(shockers),
-                "permissions": permissions,
-                "limits": limits,
-            },
+        return self._call(
+            "update_user_shares",
+            user_id=user_id,
+            shockers=shockers,
+            permissions=permissions,
+            limits=limits,
             api_key=api_key,
         )
 
@@ -869,10 +1822,11 @@ class OpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Pause a user's shares. ``POST /2/shares/user/{userId}/shockers/pause``."""
-        return self._request(
-            "POST",
-            f"/2/shares/user/{user_id}/shockers/pause",
-            json_body={"shockers": list(shockers), "paused": paused},
+        return self._call(
+            "pause_user_shares",
+            user_id=user_id,
+            shockers=shockers,
+            paused=paused,
             api_key=api_key,
         )
 
@@ -883,26 +1837,23 @@ class OpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Revoke a user's shares. ``DELETE /2/shares/user/{userId}/shockers``."""
-        return self._request(
-            "DELETE",
-            f"/2/shares/user/{user_id}/shockers",
-            json_body={"shockers": list(shockers)},
-            api_key=api_key,
+        return self._call(
+            "remove_user_shares", user_id=user_id, shockers=shockers, api_key=api_key
         )
 
     # -- tokens ------------------------------------------------------------
 
     def list_tokens(self, api_key: Optional[str] = None) -> Any:
         """List API tokens. ``GET /2/tokens``."""
-        return self._request("GET", "/2/tokens", api_key=api_key)
+        return self._call("list_tokens", api_key=api_key)
 
     def get_token(self, token_id: str, api_key: Optional[str] = None) -> Any:
         """Get one API token. ``GET /2/tokens/{tokenId}``."""
-        return self._request("GET", f"/2/tokens/{token_id}", api_key=api_key)
+        return self._call("get_token", token_id=token_id, api_key=api_key)
 
     def get_self_token(self, api_key: Optional[str] = None) -> Any:
         """Describe the token being used right now. ``GET /2/tokens/self``."""
-        return self._request("GET", "/2/tokens/self", api_key=api_key)
+        return self._call("get_self_token", api_key=api_key)
 
     def create_token(
         self,
@@ -921,17 +1872,12 @@ class OpenShockClient:
                 ``paused``, ``intensity`` and ``duration`` keys.
             valid_until: ISO-8601 expiry, or None for no expiry.
         """
-        return self._request(
-            "POST",
-            "/2/tokens",
-            json_body=clean_params(
-                {
-                    "name": name,
-                    "permissions": list(permissions),
-                    "shockerControl": shocker_control,
-                    "validUntil": valid_until,
-                }
-            ),
+        return self._call(
+            "create_token",
+            name=name,
+            permissions=permissions,
+            shocker_control=shocker_control,
+            valid_until=valid_until,
             api_key=api_key,
         )
 
@@ -944,14 +1890,12 @@ class OpenShockClient:
         api_key: Optional[str] = None,
     ) -> Any:
         """Edit an API token. ``PATCH /2/tokens/{tokenId}``."""
-        return self._request(
-            "PATCH",
-            f"/2/tokens/{token_id}",
-            json_body={
-                "name": name,
-                "permissions": list(permissions),
-                "shockerControl": shocker_control,
-            },
+        return self._call(
+            "edit_token",
+            token_id=token_id,
+            name=name,
+            permissions=permissions,
+            shocker_control=shocker_control,
             api_key=api_key,
         )
 
@@ -959,54 +1903,46 @@ class OpenShockClient:
         self, token_id: str, paused: bool, api_key: Optional[str] = None
     ) -> Any:
         """Pause or resume a token. ``PATCH /2/tokens/{tokenId}/paused``."""
-        return self._request(
-            "PATCH",
-            f"/2/tokens/{token_id}/paused",
-            json_body={"paused": paused},
-            api_key=api_key,
+        return self._call(
+            "set_token_paused", token_id=token_id, paused=paused, api_key=api_key
         )
 
     def delete_token(self, token_id: str, api_key: Optional[str] = None) -> Any:
         """Delete a token. ``DELETE /1/tokens/{tokenId}`` (no v2 equivalent)."""
-        return self._request("DELETE", f"/1/tokens/{token_id}", api_key=api_key)
+        return self._call("delete_token", token_id=token_id, api_key=api_key)
 
     def report_tokens(
         self, secrets: Sequence[str], api_key: Optional[str] = None
     ) -> Any:
         """Report leaked tokens. ``POST /2/tokens/report``."""
-        return self._request(
-            "POST",
-            "/2/tokens/report",
-            json_body={"secrets": list(secrets)},
-            api_key=api_key,
-        )
+        return self._call("report_tokens", secrets=secrets, api_key=api_key)
 
     # -- account / users / sessions ---------------------------------------
 
     def get_self(self, api_key: Optional[str] = None) -> Any:
         """Get the authenticated user. ``GET /1/users/self``."""
-        return self._request("GET", "/1/users/self", api_key=api_key)
+        return self._call("get_self", api_key=api_key)
 
     def get_user_by_name(self, username: str, api_key: Optional[str] = None) -> Any:
         """Look a user up by name. ``GET /1/users/by-name/{username}``."""
-        return self._request("GET", f"/1/users/by-name/{username}", api_key=api_key)
+        return self._call("get_user_by_name", username=username, api_key=api_key)
 
     def list_sessions(self, api_key: Optional[str] = None) -> Any:
         """List login sessions. ``GET /1/sessions``."""
-        return self._request("GET", "/1/sessions", api_key=api_key)
+        return self._call("list_sessions", api_key=api_key)
 
     def get_self_session(self, api_key: Optional[str] = None) -> Any:
         """Describe the current session. ``GET /1/sessions/self``."""
-        return self._request("GET", "/1/sessions/self", api_key=api_key)
+        return self._call("get_self_session", api_key=api_key)
 
     def delete_session(self, session_id: str, api_key: Optional[str] = None) -> Any:
         """Revoke a session. ``DELETE /1/sessions/{sessionId}``."""
-        return self._request("DELETE", f"/1/sessions/{session_id}", api_key=api_key)
+        return self._call("delete_session", session_id=session_id, api_key=api_key)
 
     def logout(self, api_key: Optional[str] = None) -> Any:
         """Invalidate the current session cookie. ``POST /1/account/logout``."""
-        return self._request("POST", "/1/account/logout", api_key=api_key)
+        return self._call("logout", api_key=api_key)
 
     def get_public_stats(self, api_key: Optional[str] = None) -> Any:
         """Instance-wide public statistics. ``GET /1/public/stats``."""
-        return self._request("GET", "/1/public/stats", api_key=api_key)
+        return self._call("get_public_stats", api_key=api_key)
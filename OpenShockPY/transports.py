@@ -0,0 +1,818 @@
+# This software is licensed under NNCL v1.3-MODIFIED-OpenShockPY see LICENSE.md for more info
+# https://github.com/NanashiTheNameless/OpenShockPY/blob/main/LICENSE.md
+"""Built-in transports for `OpenShockClient` and `AsyncOpenShockClient`.
+
+A transport sends one request and returns a `TransportResponse`; everything
+else - headers, retries, error mapping - stays in the clients. Pick the one
+with the least overhead for your workload, or use `InMemoryTransport` to
+drive a client without any network at all:
+
+- `RequestsTransport`: the sync default, on a ``requests.Session``.
+- `Urllib3Transport`: raw ``urllib3`` pool, skipping the ``requests`` layer.
+- `HTTPXTransport`: sync ``httpx.Client`` (needs the ``async`` extra).
+- `AsyncHTTPXTransport`: the async default, on ``httpx.AsyncClient``.
+- `InMemoryTransport` / `AsyncInMemoryTransport`: call a handler function.
+"""
+
+import asyncio
+import json as jsonlib
+import queue
+import socket
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlencode
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ._core import (
+    OpenShockConnectionError,
+    OpenShockValidationError,
+    PoolCounter,
+    PoolStats,
+    RequestHeaders,
+    StreamedResponse,
+    Timeouts,
+    TransportResponse,
+)
+
+try:  # httpx is an optional extra
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    httpx = None  # type: ignore[assignment]
+
+__all__ = [
+    "RequestsTransport",
+    "Urllib3Transport",
+    "HTTPXTransport",
+    "AsyncHTTPXTransport",
+    "InMemoryTransport",
+    "AsyncInMemoryTransport",
+    "TransportRequest",
+]
+
+_HTTPX_HINT = (
+    "This transport requires httpx. Install it with: "
+    "pip install Nanashi-OpenShockPY[async]"
+)
+
+
+def _require_httpx() -> Any:
+    if httpx is None:
+        raise ImportError(_HTTPX_HINT)
+    return httpx
+
+
+def _present(headers: RequestHeaders) -> Dict[str, str]:
+    """Drop ``None`` headers, for libraries without a "remove" convention."""
+    return {k: v for k, v in headers.items() if v is not None}
+
+
+def _encode_body(
+    headers: Dict[str, str], json: Any, content: Optional[bytes]
+) -> Optional[bytes]:
+    """Encode a ``json`` body, setting Content-Type unless already present."""
+    if content is not None or json is None:
+        return content
+    if not any(k.lower() == "content-type" for k in headers):
+        headers["Content-Type"] = "application/json"
+    return jsonlib.dumps(json).encode("utf-8")
+
+
+#: Failures that happen before any of the request is written: DNS lookups,
+#: refused or timed-out connects, and waits for a pooled connection.
+_NOT_SENT: Tuple[type, ...] = (
+    urllib3.exceptions.NewConnectionError,
+    urllib3.exceptions.ConnectTimeoutError,
+    urllib3.exceptions.EmptyPoolError,
+    requests.exceptions.ConnectTimeout,
+)
+if httpx is not None:
+    _NOT_SENT += (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _request_sent(exc: BaseException) -> bool:
+    """False only when ``exc`` certainly struck before the request went out.
+
+    Follows the explicit wrapping chain (``raise ... from``, the wrapped
+    error in ``args`` and urllib3's ``reason``) but not ``__context__``,
+    which can hold unrelated errors handled earlier. Anything unrecognised
+    counts as sent.
+    """
+    stack = [exc]
+    seen = set()
+    while stack:
+        err = stack.pop()
+        if id(err) in seen:
+            continue
+        seen.add(id(err))
+        if isinstance(err, _NOT_SENT):
+            return False
+        linked = [err.__cause__, getattr(err, "reason", None), *err.args]
+        stack.extend(e for e in linked if isinstance(e, BaseException))
+    return True
+
+
+def _connection_error(
+    method: str, url: str, exc: BaseException
+) -> OpenShockConnectionError:
+    return OpenShockConnectionError(
+        f"{method} {url} failed: {exc}", request_sent=_request_sent(exc)
+    )
+
+
+#: Bytes per chunk the transports' ``stream`` hands out.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _mapped_chunks(
+    method: str, url: str, chunks: Iterable[bytes], errors: Any
+) -> Iterator[bytes]:
+    """``chunks``, raising `OpenShockConnectionError` for read failures."""
+    try:
+        yield from chunks
+    except errors as exc:
+        raise _connection_error(method, url, exc) from exc
+
+
+async def _amapped_chunks(
+    method: str, url: str, chunks: AsyncIterator[bytes], errors: Any
+) -> AsyncIterator[bytes]:
+    """Async `_mapped_chunks`."""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except errors as exc:
+        raise _connection_error(method, url, exc) from exc
+
+
+def _httpx_timeout(timeout: Union[float, Timeouts, None]) -> Dict[str, Any]:
+    # httpx reads an explicit ``timeout=None`` as "never time out", so only
+    # pass one when set and otherwise keep the client's own default.
+    if timeout is None:
+        return {}
+    if isinstance(timeout, Timeouts):
+        return {
+            "timeout": httpx.Timeout(
+                connect=timeout.connect,
+                read=timeout.read,
+                write=timeout.write,
+                pool=timeout.pool,
+            )
+        }
+    return {"timeout": timeout}
+
+
+def _requests_timeout(
+    timeout: Union[float, Timeouts, None]
+) -> Union[float, Tuple[Optional[float], Optional[float]], None]:
+    # requests has no write or pool phase; it takes (connect, read).
+    if isinstance(timeout, Timeouts):
+        return (timeout.connect, timeout.read)
+    return timeout
+
+
+def _urllib3_timeout(timeout: Union[float, Timeouts, None]) -> Any:
+    if isinstance(timeout, Timeouts):
+        return urllib3.Timeout(connect=timeout.connect, read=timeout.read)
+    return timeout
+
+
+class _CountingQueue(queue.LifoQueue):  # type: ignore[type-arg]
+    """Pool queue that reports connections rejected because it is full."""
+
+    on_full: Optional[Callable[[], None]] = None
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        try:
+            super().put(item, block, timeout)
+        except queue.Full:
+            if item is not None and self.on_full is not None:
+                self.on_full()
+            raise
+
+
+def _counting_pool_classes(counter: PoolCounter) -> Dict[str, Any]:
+    """urllib3 pool classes, per scheme, that feed ``counter``."""
+
+    def counted(base: Any) -> Any:
+        class Connection(base.ConnectionCls):  # type: ignore[misc,name-defined]
+            def connect(self) -> None:
+                super().connect()
+                counter.add("created")
+
+        class Pool(base):  # type: ignore[misc,valid-type]
+            ConnectionCls = Connection
+            QueueCls = _CountingQueue
+
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                super().__init__(*args, **kwargs)
+                self.pool.on_full = lambda: counter.add("discarded")
+
+            def _get_conn(self, timeout: Optional[float] = None) -> Any:
+                conn = super()._get_conn(timeout)
+                # Idle connections keep their socket; fresh or reset ones
+                # connect (and are counted) when first used.
+                if getattr(conn, "sock", None) is not None:
+                    counter.add("reused")
+                return conn
+
+        return Pool
+
+    return {"http": counted(HTTPConnectionPool), "https": counted(HTTPSConnectionPool)}
+
+
+def _keepalive_socket_options(idle: float) -> List[Any]:
+    """TCP keep-alive probes after ``idle`` seconds, where the OS allows it."""
+    options = list(urllib3.connection.HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    seconds = max(1, int(idle))
+    for name in ("TCP_KEEPIDLE", "TCP_KEEPALIVE", "TCP_KEEPINTVL"):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), seconds))
+    return options
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """`HTTPAdapter` whose pools report to a `PoolCounter`."""
+
+    def __init__(
+        self,
+        counter: PoolCounter,
+        socket_options: Optional[List[Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        # HTTPAdapter.__init__ builds the pool manager, so set these first.
+        self._counter = counter
+        self._socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self._socket_options is not None:
+            kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(
+            self._counter
+        )
+
+
+class RequestsTransport:
+    """Transport on a ``requests.Session``.
+
+    Header values of ``None`` are passed straight through, which ``requests``
+    treats as "drop this session header for this request".
+
+    Without a ``session``, one is created whose pool is sized by
+    ``pool_connections`` (hosts kept) and ``pool_maxsize`` (connections kept
+    per host); ``pool_block=True`` makes threads wait for a free connection
+    instead of opening one that will be thrown away afterwards, and
+    ``tcp_keepalive`` turns on TCP keep-alive probes after that many idle
+    seconds. That session also reports `pool_stats`.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: Optional[float] = None,
+    ) -> None:
+        self._counter: Optional[PoolCounter] = None
+        if session is None:
+            for name, value in (
+                ("pool_connections", pool_connections),
+                ("pool_maxsize", pool_maxsize),
+            ):
+                if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                    raise OpenShockValidationError(f"{name} must be an integer >= 1")
+            if tcp_keepalive is not None and tcp_keepalive <= 0:
+                raise OpenShockValidationError("tcp_keepalive must be greater than 0")
+            self._counter = PoolCounter()
+            session = requests.Session()
+            adapter = _CountingHTTPAdapter(
+                self._counter,
+                socket_options=(
+                    None
+                    if tcp_keepalive is None
+                    else _keepalive_socket_options(tcp_keepalive)
+                ),
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Pool counters, or ``None`` for a session passed in by the caller."""
+        return None if self._counter is None else self._counter.snapshot()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        kwargs: Dict[str, Any] = {"params": params, "headers": headers}
+        if content is not None:
+            kwargs["data"] = content
+        else:
+            kwargs["json"] = json
+        try:
+            resp = self.session.request(
+                method, url, timeout=_requests_timeout(timeout), **kwargs
+            )
+        except requests.RequestException as exc:
+            raise _connection_error(method, url, exc) from exc
+        return TransportResponse(
+            resp.status_code, getattr(resp, "headers", {}), resp.content
+        )
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> Iterator[StreamedResponse]:
+        """Send a request and read the body in chunks as it arrives."""
+        try:
+            resp = self.session.request(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                timeout=_requests_timeout(timeout),
+                stream=True,
+            )
+        except requests.RequestException as exc:
+            raise _connection_error(method, url, exc) from exc
+        try:
+            yield StreamedResponse(
+                resp.status_code,
+                resp.headers,
+                _mapped_chunks(
+                    method,
+                    url,
+                    resp.iter_content(STREAM_CHUNK_SIZE),
+                    requests.RequestException,
+                ),
+            )
+        finally:
+            resp.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class Urllib3Transport:
+    """Transport on a bare ``urllib3.PoolManager``.
+
+    Avoids the per-request work ``requests`` does on top of urllib3 (hooks,
+    cookie jars, environment proxy lookups), at the cost of those features.
+    Redirects are not followed.
+    """
+
+    def __init__(self, pool: Optional[urllib3.PoolManager] = None) -> None:
+        self._counter: Optional[PoolCounter] = None
+        if pool is None:
+            self._counter = PoolCounter()
+            pool = urllib3.PoolManager()
+            pool.pool_classes_by_scheme = _counting_pool_classes(self._counter)
+        self.pool = pool
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Pool counters, or ``None`` for a pool passed in by the caller."""
+        return None if self._counter is None else self._counter.snapshot()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        present = _present(headers)
+        body = _encode_body(present, json, content)
+        if params:
+            url = f"{url}?{urlencode(params, doseq=True)}"
+        try:
+            resp = self.pool.request(
+                method,
+                url,
+                body=body,
+                headers=present,
+                timeout=_urllib3_timeout(timeout),
+                retries=False,
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            raise _connection_error(method, url, exc) from exc
+        return TransportResponse(resp.status, resp.headers, resp.data)
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> Iterator[StreamedResponse]:
+        """Send a request and read the body in chunks as it arrives."""
+        if params:
+            url = f"{url}?{urlencode(params, doseq=True)}"
+        try:
+            resp = self.pool.request(
+                method,
+                url,
+                headers=_present(headers),
+                timeout=_urllib3_timeout(timeout),
+                retries=False,
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            raise _connection_error(method, url, exc) from exc
+        try:
+            yield StreamedResponse(
+                resp.status,
+                resp.headers,
+                _mapped_chunks(
+                    method,
+                    url,
+                    resp.stream(STREAM_CHUNK_SIZE),
+                    urllib3.exceptions.HTTPError,
+                ),
+            )
+        finally:
+            if not resp.closed:
+                resp.close()  # unread body left: do not reuse the connection
+            resp.release_conn()
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class _HTTPXPoolTrace:
+    """Pool counters for httpx, fed by httpcore's ``trace`` extension."""
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.sent = 0
+
+    def record(self, name: str) -> None:
+        if name == "connection.connect_tcp.complete":
+            self.created += 1
+        elif name.endswith(".send_request_headers.started"):
+            self.sent += 1
+
+    def stats(self, client: Any) -> PoolStats:
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        discarded = 0 if connections is None else self.created - len(connections)
+        return PoolStats(
+            created=self.created,
+            reused=max(0, self.sent - self.created),
+            discarded=max(0, discarded),
+        )
+
+
+class HTTPXTransport:
+    """Synchronous transport on an ``httpx.Client``."""
+
+    def __init__(self, client: Any = None) -> None:
+        _httpx = _require_httpx()
+        self.client = client if client is not None else _httpx.Client(
+            follow_redirects=True
+        )
+        self._trace = _HTTPXPoolTrace()
+        self._extensions = {"trace": self._on_trace}
+
+    def _on_trace(self, name: str, info: Dict[str, Any]) -> None:
+        self._trace.record(name)
+
+    def pool_stats(self) -> PoolStats:
+        """Pool counters for the wrapped client's default pool."""
+        return self._trace.stats(self.client)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        try:
+            resp = self.client.request(
+                method,
+                url,
+                params=params,
+                json=json if content is None else None,
+                content=content,
+                headers=_present(headers),
+                extensions=self._extensions,
+                **_httpx_timeout(timeout),
+            )
+        except httpx.HTTPError as exc:
+            raise _connection_error(method, url, exc) from exc
+        return TransportResponse(resp.status_code, resp.headers, resp.content)
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> Iterator[StreamedResponse]:
+        """Send a request and read the body in chunks as it arrives."""
+        with ExitStack() as stack:
+            try:
+                resp = stack.enter_context(
+                    self.client.stream(
+                        method,
+                        url,
+                        params=params,
+                        headers=_present(headers),
+                        extensions=self._extensions,
+                        **_httpx_timeout(timeout),
+                    )
+                )
+            except httpx.HTTPError as exc:
+                raise _connection_error(method, url, exc) from exc
+            yield StreamedResponse(
+                resp.status_code,
+                resp.headers,
+                _mapped_chunks(
+                    method, url, resp.iter_bytes(STREAM_CHUNK_SIZE), httpx.HTTPError
+                ),
+            )
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class AsyncHTTPXTransport:
+    """Asynchronous transport on an ``httpx.AsyncClient``."""
+
+    def __init__(self, client: Any = None) -> None:
+        _httpx = _require_httpx()
+        self.client = client if client is not None else _httpx.AsyncClient(
+            follow_redirects=True
+        )
+        self._trace = _HTTPXPoolTrace()
+        self._extensions = {"trace": self._on_trace}
+
+    async def _on_trace(self, name: str, info: Dict[str, Any]) -> None:
+        self._trace.record(name)
+
+    def pool_stats(self) -> PoolStats:
+        """Pool counters for the wrapped client's default pool."""
+        return self._trace.stats(self.client)
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        try:
+            resp = await self.client.request(
+                method,
+                url,
+                params=params,
+                json=json if content is None else None,
+                content=content,
+                headers=_present(headers),
+                extensions=self._extensions,
+                **_httpx_timeout(timeout),
+            )
+        except httpx.HTTPError as exc:
+            raise _connection_error(method, url, exc) from exc
+        return TransportResponse(resp.status_code, resp.headers, resp.content)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Send a request and read the body in chunks as it arrives."""
+        async with AsyncExitStack() as stack:
+            try:
+                resp = await stack.enter_async_context(
+                    self.client.stream(
+                        method,
+                        url,
+                        params=params,
+                        headers=_present(headers),
+                        extensions=self._extensions,
+                        **_httpx_timeout(timeout),
+                    )
+                )
+            except httpx.HTTPError as exc:
+                raise _connection_error(method, url, exc) from exc
+            yield StreamedResponse(
+                resp.status_code,
+                resp.headers,
+                _amapped_chunks(
+                    method, url, resp.aiter_bytes(STREAM_CHUNK_SIZE), httpx.HTTPError
+                ),
+            )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+@dataclass
+class TransportRequest:
+    """A request as seen by `InMemoryTransport` handlers."""
+
+    method: str
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    params: Optional[Mapping[str, Any]] = None
+    json: Any = None
+    content: Optional[bytes] = None
+    timeout: Union[float, Timeouts, None] = None
+
+
+Handler = Callable[[TransportRequest], Any]
+
+
+def _as_response(result: Any) -> TransportResponse:
+    """Accept a `TransportResponse`, a ``(status, body)`` pair or a body."""
+    if isinstance(result, TransportResponse):
+        return result
+    status, body = result if isinstance(result, tuple) else (200, result)
+    if body is None:
+        return TransportResponse(status)
+    if isinstance(body, bytes):
+        return TransportResponse(status, {}, body)
+    return TransportResponse(
+        status,
+        {"Content-Type": "application/json"},
+        jsonlib.dumps(body).encode("utf-8"),
+    )
+
+
+class InMemoryTransport:
+    """Zero-network transport that hands every request to ``handler``.
+
+    ``handler`` receives a `TransportRequest` and returns a
+    `TransportResponse`, a ``(status_code, body)`` tuple, or just a body
+    (meaning HTTP 200). Bodies other than ``bytes`` are JSON encoded. Every
+    request is also appended to `requests`, which makes it a convenient
+    stand-in server for tests and load generators. ``stream`` hands the
+    body out in pieces of ``chunk_size`` bytes.
+    """
+
+    def __init__(self, handler: Handler, chunk_size: int = STREAM_CHUNK_SIZE) -> None:
+        if chunk_size < 1:
+            raise OpenShockValidationError("chunk_size must be >= 1")
+        self.handler = handler
+        self.chunk_size = chunk_size
+        self.requests: List[TransportRequest] = []
+
+    def _chunks(self, content: bytes) -> Iterator[bytes]:
+        for start in range(0, len(content), self.chunk_size):
+            yield content[start:start + self.chunk_size]
+
+    def _record(
+        self,
+        method: str,
+        url: str,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]],
+        json: Any,
+        content: Optional[bytes],
+        timeout: Union[float, Timeouts, None],
+    ) -> TransportRequest:
+        request = TransportRequest(
+            method, url, _present(headers), params, json, content, timeout
+        )
+        self.requests.append(request)
+        return request
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        request = self._record(method, url, headers, params, json, content, timeout)
+        return _as_response(self.handler(request))
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> Iterator[StreamedResponse]:
+        """Call the handler and hand its body out in chunks."""
+        resp = self.send(method, url, headers=headers, params=params, timeout=timeout)
+        yield StreamedResponse(
+            resp.status_code, resp.headers, self._chunks(resp.content)
+        )
+
+    def close(self) -> None:
+        return None
+
+
+class AsyncInMemoryTransport(InMemoryTransport):
+    """`InMemoryTransport` for the async client; ``handler`` may be async."""
+
+    async def send(  # type: ignore[override]
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        content: Optional[bytes] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> TransportResponse:
+        request = self._record(method, url, headers, params, json, content, timeout)
+        result = self.handler(request)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return _as_response(result)
+
+    @asynccontextmanager  # type: ignore[override]
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: RequestHeaders,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Union[float, Timeouts, None] = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Call the handler and hand its body out in chunks."""
+        resp = await self.send(
+            method, url, headers=headers, params=params, timeout=timeout
+        )
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for chunk in self._chunks(resp.content):
+                yield chunk
+
+        yield StreamedResponse(resp.status_code, resp.headers, chunks())
+
+    async def aclose(self) -> None:
+        return None
@@ -1,14 +1,19 @@
 """Async client tests that inspect the actual HTTP calls being made."""
 
+import asyncio
 import json
+import sys
 
 import pytest
 from OpenShockPY import (
+    AsyncInMemoryTransport,
     OpenShockAuthError,
     OpenShockNotFoundError,
     OpenShockPYError,
     OpenShockRateLimitError,
     OpenShockValidationError,
+    RetryBudget,
+    deadline,
 )
 from OpenShockPY.async_client import AsyncOpenShockClient
 
@@ -239,7 +244,7 @@ async def test_control_post_is_not_replayed_after_a_timeout(monkeypatch):
 
     monkeypatch.setattr("OpenShockPY.async_client.asyncio.sleep", fake_sleep)
     route = respx.post(f"{BASE}/2/shockers/control").mock(
-        side_effect=httpx.ConnectTimeout("dropped")
+        side_effect=httpx.ReadTimeout("dropped")
     )
     async with make_client() as client:
         with pytest.raises(OpenShockPYError):
@@ -247,6 +252,23 @@ async def test_control_post_is_not_replayed_after_a_timeout(monkeypatch):
     assert len(route.calls) == 1
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_control_post_is_replayed_after_a_connect_failure(monkeypatch):
+    """A refused connect means the request never left, so replaying is safe."""
+
+    async def fake_sleep(seconds):
+        return None
+
+    monkeypatch.setattr("OpenShockPY.async_client.asyncio.sleep", fake_sleep)
+    route = respx.post(f"{BASE}/2/shockers/control").mock(
+        side_effect=[httpx.ConnectError("refused"), httpx.Response(200, json={})]
+    )
+    async with make_client() as client:
+        await client.shock("s1")
+    assert len(route.calls) == 2
+
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_control_post_is_replayed_after_a_rate_limit(monkeypatch):
@@ -294,6 +316,267 @@ async def test_transport_errors_are_wrapped(monkeypatch):
     assert "boom" in str(exc.value)
 
 
+@pytest.mark.asyncio
+@respx.mock
+async def test_coalescing_merges_concurrent_controls():
+    route = respx.post(f"{BASE}/2/shockers/control").respond(200, json={"message": ""})
+    async with make_client(coalesce_window=0.05) as client:
+        results = await asyncio.gather(
+            *(client.shock(f"s{i}", intensity=10) for i in range(20))
+        )
+    assert results == [{"message": ""}] * 20
+    assert len(route.calls) == 1
+    assert len(body_of(route)["shocks"]) == 20
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_coalescing_splits_on_max_batch_and_repeated_shocker():
+    route = respx.post(f"{BASE}/2/shockers/control").respond(200, json={"message": ""})
+    async with make_client(coalesce_window=0.05, coalesce_max_batch=3) as client:
+        await asyncio.gather(
+            client.shock("s1"),
+            client.shock("s2"),
+            client.shock("s3"),
+            client.shock("s4"),
+            client.shock("s4"),
+        )
+    sizes = sorted(len(body_of(route, i)["shocks"]) for i in range(len(route.calls)))
+    assert sizes == [1, 1, 3]
+
+
+async def until_queued(client):
+    """Yield to the loop until a control is waiting in the coalescer."""
+    for _ in range(500):
+        if client._coalescer._pending:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("no control was queued")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_stop_reaches_the_wire_after_a_queued_shock():
+    route = respx.post(f"{BASE}/2/shockers/control").respond(200, json={"message": ""})
+    async with make_client(coalesce_window=30.0) as client:
+        shock = asyncio.ensure_future(client.shock("s1"))
+        await until_queued(client)
+        await client.stop("s1")
+        assert await asyncio.wait_for(shock, 5) == {"message": ""}
+    types = [body_of(route, i)["shocks"][0]["type"] for i in range(len(route.calls))]
+    assert types == ["Shock", "Stop"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_coalescing_hands_the_error_to_every_caller():
+    respx.post(f"{BASE}/2/shockers/control").respond(403, json={"detail": "no"})
+    async with make_client(coalesce_window=0.05) as client:
+        results = await asyncio.gather(
+            client.shock("s1"), client.shock("s2"), return_exceptions=True
+        )
+    assert all(isinstance(r, OpenShockAuthError) for r in results)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warm_shocker_cache_makes_stop_all_one_request():
+    listing = respx.get(f"{BASE}/1/shockers/own").respond(
+        200, json={"data": [{"id": "hub", "shockers": [{"id": "s1"}]}]}
+    )
+    control = respx.post(f"{BASE}/2/shockers/control").respond(200, json={})
+    respx.post(f"{BASE}/1/shockers").respond(200, json="new-id")
+    async with make_client(shocker_cache_ttl=60) as client:
+        await client.refresh_shocker_cache()
+        await client.stop_all()
+        await client.stop_all()
+        assert len(listing.calls) == 1
+        await client.create_shocker("hub", "new", 1234, "CaiXianlin")
+        await client.stop_all()
+    assert len(listing.calls) == 2
+    assert len(control.calls) == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_priority_stop_bypasses_coalescing_and_backoff(monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr("OpenShockPY.async_client.asyncio.sleep", fake_sleep)
+    route = respx.post(f"{BASE}/2/shockers/control")
+    route.side_effect = [
+        httpx.ConnectError("dropped"),
+        httpx.Response(200, json={"message": "ok"}),
+    ]
+    async with make_client(priority_stop=True, coalesce_window=30.0) as client:
+        await client.stop("s1")
+    assert len(route.calls) == 2
+    assert slept == []
+    request = route.calls[0].request
+    assert request.headers["content-type"] == "application/json"
+    assert request.headers["OpenShockToken"] == "tok"
+    assert body_of(route)["shocks"][0]["type"] == "Stop"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_priority_stop_follows_queued_shocks_and_raises_long_429s():
+    route = respx.post(f"{BASE}/2/shockers/control")
+    route.side_effect = [
+        httpx.Response(200, json={"message": ""}),
+        httpx.Response(429, json={"detail": "no"}, headers={"Retry-After": "30"}),
+    ]
+    async with make_client(priority_stop=True, coalesce_window=30.0) as client:
+        shock = asyncio.ensure_future(client.shock("s1"))
+        await until_queued(client)
+        with pytest.raises(OpenShockRateLimitError):
+            await client.stop("s1")
+        assert await asyncio.wait_for(shock, 5) == {"message": ""}
+    types = [body_of(route, i)["shocks"][0]["type"] for i in range(len(route.calls))]
+    assert types == ["Shock", "Stop"]
+
+
+@pytest.mark.asyncio
+async def test_http2_and_limits_configure_default_pool():
+    pytest.importorskip("h2")
+    client = make_client(http2=True, limits=httpx.Limits(max_connections=3))
+    pool = client._client._transport._pool
+    assert pool._http2 is True
+    assert pool._max_connections == 3
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_default_pool_keeps_httpx_limits():
+    client = make_client()
+    pool = client._client._transport._pool
+    assert pool._max_connections == 100
+    assert pool._max_keepalive_connections == 20
+    await client.aclose()
+
+
+def test_http2_without_h2_names_the_extra(monkeypatch):
+    monkeypatch.setitem(sys.modules, "h2", None)
+    with pytest.raises(ImportError, match=r"\[http2\]"):
+        make_client(http2=True)
+
+
+def test_http2_rejected_with_custom_transport():
+    with pytest.raises(OpenShockValidationError):
+        make_client(http2=True, transport=AsyncInMemoryTransport(lambda r: {}))
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warmup_opens_connections_concurrently():
+    route = respx.get(f"{BASE}/1/public/stats").mock(
+        return_value=httpx.Response(200, json={"data": {}})
+    )
+    async with make_client(priority_stop=True) as client:
+        assert await client.warmup(connections=3) == 4
+    assert route.call_count == 4
+    assert "OpenShockToken" not in route.calls[0].request.headers
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_warmup_keepalive_pings_until_closed():
+    route = respx.get(f"{BASE}/1/public/stats").mock(
+        return_value=httpx.Response(200, json={"data": {}})
+    )
+    client = make_client()
+    await client.warmup(keepalive_interval=0.01)
+    for _ in range(200):
+        if route.call_count >= 3:
+            break
+        await asyncio.sleep(0.01)
+    await client.aclose()
+    sent = route.call_count
+    assert sent >= 3
+    await asyncio.sleep(0.05)
+    assert route.call_count == sent
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_results_with_per_item_errors():
+    async def handler(req):
+        shocker_id = req.url.rsplit("/", 1)[1]
+        await asyncio.sleep(0.05 if shocker_id == "s0" else 0)
+        if shocker_id == "s2":
+            return 404, {"message": "Shocker not found"}
+        return {"data": {"id": shocker_id}}
+
+    async with make_client(transport=AsyncInMemoryTransport(handler)) as client:
+        calls = [{"shocker_id": f"s{i}"} for i in range(5)]
+        ordered = [r async for r in client.batch("get_shocker", calls, concurrency=2)]
+        unordered = [r async for r in client.batch("get_shocker", calls, ordered=False)]
+
+    assert [r.index for r in ordered] == list(range(5))
+    assert isinstance(ordered[2].error, OpenShockNotFoundError)
+    assert ordered[1].result == {"data": {"id": "s1"}}
+    assert unordered[-1].index == 0
+
+
+@pytest.mark.asyncio
+async def test_aiter_logs_prefetches_pages_and_stops_at_the_end():
+    seen = {"pages": [], "active": 0, "max": 0}
+
+    async def handler(req):
+        page = req.params["page"]
+        seen["pages"].append(page)
+        seen["active"] += 1
+        seen["max"] = max(seen["max"], seen["active"])
+        await asyncio.sleep(0.01)
+        seen["active"] -= 1
+        start = (page - 1) * 4
+        return {"data": [{"id": i} for i in range(start, min(start + 4, 10))]}
+
+    async with make_client(transport=AsyncInMemoryTransport(handler)) as client:
+        with pytest.raises(OpenShockValidationError):
+            client.aiter_logs(page_size=0)
+        entries = [e async for e in client.aiter_logs(page_size=4, prefetch=2)]
+
+    assert [entry["id"] for entry in entries] == list(range(10))
+    assert sorted(seen["pages"])[:4] == [1, 2, 3, 4] and max(seen["pages"]) <= 6
+    assert seen["max"] == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_spent_retry_budget_surfaces_errors_immediately(monkeypatch):
+    async def no_sleep(delay):
+        return None
+
+    monkeypatch.setattr("OpenShockPY.async_client.asyncio.sleep", no_sleep)
+    route = respx.get(f"{BASE}/1/devices").mock(
+        return_value=httpx.Response(503, json={"message": "down"})
+    )
+    budget = RetryBudget(ratio=0, min_per_second=0)
+    async with make_client(retry_budget=budget) as client:
+        with pytest.raises(OpenShockPYError):
+            await client.list_devices()
+    assert route.call_count == 1
+    assert budget.stats().suppressed == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_covers_retries_in_tasks_too():
+    transport = AsyncInMemoryTransport(lambda req: (503, {"message": "down"}))
+    async with make_client(
+        transport=transport, max_retries=5, backoff_factor=0.05
+    ) as client:
+        with deadline(0.3):
+            with pytest.raises(OpenShockPYError):
+                await asyncio.create_task(client.list_devices())
+    # Sleeps of 0.05s and 0.1s, each followed by the 0.1s an attempt needs at
+    # least, fit in 0.3s; a further 0.2s would not.
+    assert len(transport.requests) == 3
+    assert all(req.timeout <= 0.3 for req in transport.requests)
+
+
 @pytest.mark.asyncio
 async def test_aclose_is_idempotent_and_blocks_reuse():
     client = make_client()
@@ -326,7 +609,39 @@ async def test_sync_and_async_expose_the_same_surface():
             if not name.startswith("_") and callable(getattr(obj, name))
         }
 
-    # Only the close methods differ by name; everything else is 1:1.
-    assert public(OpenShockClient) - {"close"} == (
-        public(AsyncOpenShockClient) - {"aclose"}
+    # Only the close and log-iterating methods differ by name (the async
+    # ones carry an ``a`` prefix); everything else is 1:1.
+    assert public(OpenShockClient) - {"close", "iter_logs", "iter_logs_stream"} == (
+        public(AsyncOpenShockClient) - {"aclose", "aiter_logs", "aiter_logs_stream"}
     )
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_send_the_same_endpoint_requests():
+    import inspect
+
+    from OpenShockPY import InMemoryTransport, OpenShockClient
+    from OpenShockPY._core import ENDPOINTS
+
+    sync_transport = InMemoryTransport(lambda req: {"data": []})
+    async_transport = AsyncInMemoryTransport(lambda req: {"data": []})
+    sync = OpenShockClient(
+        api_key="tok", user_agent="OpenShockPY-Test/0.1", transport=sync_transport
+    )
+    client = make_client(transport=async_transport)
+    names = [name for name in ENDPOINTS if hasattr(sync, name)]
+    for name in names:
+        args = {
+            param.name: [param.name] if "Sequence" in str(param.annotation) else "v"
+            for param in inspect.signature(getattr(sync, name)).parameters.values()
+            if param.default is inspect.Parameter.empty
+        }
+        getattr(sync, name)(**args)
+        await getattr(client, name)(**args)
+    await client.aclose()
+
+    def sent(transport):
+        return [(r.method, r.url, r.params, r.json) for r in transport.requests]
+
+    assert len(sync_transport.requests) == len(names) == len(ENDPOINTS) - 1
+    assert sent(sync_transport) == sent(async_transport)
@@ -0,0 +1,199 @@
+"""Tests for the per-endpoint circuit breaker."""
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    CircuitBreaker,
+    InMemoryTransport,
+    OpenShockCircuitOpenError,
+    OpenShockClient,
+    OpenShockConnectionError,
+    OpenShockDeadlineExceededError,
+    OpenShockServerError,
+    OpenShockValidationError,
+    RateLimiter,
+    deadline,
+)
+from OpenShockPY._circuit import endpoint_template
+
+DEVICE = "2b2c6a3e-1f9e-4d55-9a57-0c5c0e1f5a10"
+KEY = ("https://api.openshock.app", "/1/devices")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(**kwargs):
+    clock = FakeClock()
+    transitions = []
+    breaker = CircuitBreaker(
+        on_state_change=lambda key, old, new: transitions.append((old, new)),
+        clock=clock,
+        **kwargs,
+    )
+    return breaker, clock, transitions
+
+
+def test_opens_after_threshold_then_probes_and_closes():
+    breaker, clock, transitions = make_breaker(
+        failure_threshold=3, recovery_timeout=10
+    )
+    for _ in range(3):
+        breaker.before_request(KEY)
+        breaker.record_failure(KEY)
+    assert breaker.state(KEY) == "open"
+
+    with pytest.raises(OpenShockCircuitOpenError) as excinfo:
+        breaker.before_request(KEY)
+    assert excinfo.value.key == KEY
+    assert excinfo.value.retry_after == pytest.approx(10)
+
+    clock.now += 10
+    breaker.before_request(KEY)  # the probe
+    with pytest.raises(OpenShockCircuitOpenError):
+        breaker.before_request(KEY)  # only one probe at a time
+    breaker.record_success(KEY)
+
+    assert breaker.state(KEY) == "closed"
+    assert transitions == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
+
+
+def test_failed_probe_reopens_and_success_resets_the_count():
+    breaker, clock, transitions = make_breaker(
+        failure_threshold=2, recovery_timeout=5
+    )
+    breaker.record_failure(KEY)
+    breaker.record_success(KEY)
+    breaker.record_failure(KEY)
+    assert breaker.state(KEY) == "closed"  # not consecutive
+
+    breaker.record_failure(KEY)
+    clock.now += 5
+    breaker.before_request(KEY)
+    breaker.record_failure(KEY)
+    assert breaker.state(KEY) == "open"
+    assert transitions[-1] == ("half_open", "open")
+
+
+def test_a_lost_probe_does_not_hold_the_circuit_half_open():
+    breaker, clock, _ = make_breaker(failure_threshold=1, recovery_timeout=5)
+    breaker.record_failure(KEY)
+    clock.now += 5
+    breaker.before_request(KEY)  # never reports back
+    clock.now += 5
+    breaker.before_request(KEY)
+
+
+def test_released_probe_lets_the_next_one_through():
+    breaker, clock, _ = make_breaker(failure_threshold=1, recovery_timeout=5)
+    breaker.record_failure(KEY)
+    clock.now += 5
+    breaker.before_request(KEY)
+    with pytest.raises(OpenShockCircuitOpenError):
+        breaker.before_request(KEY)
+    breaker.release(KEY)
+    breaker.before_request(KEY)
+    assert breaker.state(KEY) == "half_open"
+
+
+def half_open_client(factory, transport):
+    breaker, clock, _ = make_breaker(failure_threshold=1, recovery_timeout=5)
+    breaker.record_failure(KEY)
+    clock.now += 5
+    limiter = RateLimiter(rate=1, burst=1)
+    limiter.acquire()  # the next request would wait about a second
+    client = factory(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=transport,
+        rate_limit=limiter,
+        circuit_breaker=breaker,
+    )
+    return client, breaker
+
+
+def test_probe_cut_short_by_the_deadline_is_given_back():
+    transport = InMemoryTransport(lambda req: {"data": []})
+    client, breaker = half_open_client(OpenShockClient, transport)
+    with deadline(0.2), pytest.raises(OpenShockDeadlineExceededError):
+        client.list_devices()  # the limiter wait outlasts the deadline
+    client.rate_limiter = None
+    assert client.list_devices() == {"data": []}
+    assert breaker.state(KEY) == "closed"
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_probe_cut_short_by_the_deadline_is_given_back():
+    transport = AsyncInMemoryTransport(lambda req: {"data": []})
+    client, breaker = half_open_client(AsyncOpenShockClient, transport)
+    async with client:
+        with deadline(0.2), pytest.raises(OpenShockDeadlineExceededError):
+            await client.list_devices()
+        client.rate_limiter = None
+        assert await client.list_devices() == {"data": []}
+    assert breaker.state(KEY) == "closed"
+    assert len(transport.requests) == 1
+
+
+def test_circuits_are_keyed_by_endpoint_template():
+    assert endpoint_template(f"/1/devices/{DEVICE}/pair") == "/1/devices/{id}/pair"
+    assert CircuitBreaker.key("https://a", f"/1/devices/{DEVICE}") == (
+        "https://a",
+        "/1/devices/{id}",
+    )
+    with pytest.raises(OpenShockValidationError):
+        CircuitBreaker(failure_threshold=0)
+
+
+def test_client_fails_fast_once_an_endpoint_is_open():
+    calls = []
+
+    def handler(req):
+        calls.append(req.url)
+        if "/1/devices" in req.url:
+            raise OpenShockConnectionError("timed out")
+        return {"data": []}
+
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    client = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        backoff_factor=0,
+        max_retries=1,
+        circuit_breaker=breaker,
+    )
+    with pytest.raises(OpenShockConnectionError):
+        client.get_device(DEVICE)  # two attempts, both fail: now open
+    with pytest.raises(OpenShockCircuitOpenError):
+        client.get_device("2b2c6a3e-1f9e-4d55-9a57-0c5c0e1f5a11")
+    assert len(calls) == 2
+
+    # Other endpoints are unaffected.
+    assert client.list_shockers() == {"data": []}
+
+
+@pytest.mark.asyncio
+async def test_async_client_counts_server_errors():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    transport = AsyncInMemoryTransport(lambda req: (503, {"message": "down"}))
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=transport,
+        max_retries=0,
+        circuit_breaker=breaker,
+    ) as client:
+        with pytest.raises(OpenShockServerError):
+            await client.list_devices()
+        with pytest.raises(OpenShockCircuitOpenError):
+            await client.list_devices()
+    assert len(transport.requests) == 1
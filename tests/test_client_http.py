@@ -1,15 +1,27 @@
 """Sync client tests that inspect the actual HTTP calls being made."""
 
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from OpenShockPY import (
+    DecorrelatedJitterBackoff,
+    InMemoryTransport,
     OpenShockAuthError,
     OpenShockClient,
+    OpenShockConnectionError,
+    OpenShockDeadlineExceededError,
     OpenShockNotFoundError,
     OpenShockPYError,
     OpenShockRateLimitError,
+    OpenShockServerError,
     OpenShockValidationError,
+    RateLimiter,
+    RetryBudget,
+    RetryBudgetStats,
+    deadline,
 )
 
 
@@ -92,8 +104,9 @@ def test_session_token_sets_header_and_cookie(record):
     client = OpenShockClient(user_agent="OpenShockPY-Test/0.1")
     client.SetSessionToken("session-token")
     client.list_devices()
-    assert client._session.headers["OpenShockSession"] == "session-token"
-    assert client._session.cookies.get("openShockSession") == "session-token"
+    headers = recorder.calls[0]["headers"]
+    assert headers["OpenShockSession"] == "session-token"
+    assert headers["Cookie"] == "openShockSession=session-token"
     assert recorder.calls[0]["method"] == "GET"
 
 
@@ -257,6 +270,25 @@ def test_control_post_is_not_replayed_after_a_timeout(record, monkeypatch):
     assert calls == ["POST"]
 
 
+def test_control_post_is_replayed_after_a_connect_failure(record, monkeypatch):
+    import requests
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", lambda _: None)
+    calls = []
+
+    def refuse_once(session, method, url, **kwargs):
+        calls.append(method)
+        if len(calls) == 1:
+            reason = NewConnectionError(None, "Connection refused")
+            raise requests.ConnectionError(MaxRetryError(None, url, reason))
+        return FakeResponse(200, {"message": "ok"})
+
+    monkeypatch.setattr("OpenShockPY.client.requests.Session.request", refuse_once)
+    assert make_client().shock("s1") == {"message": "ok"}
+    assert calls == ["POST", "POST"]
+
+
 def test_control_post_is_replayed_after_a_rate_limit(record, monkeypatch):
     """429 means the request was rejected, so replaying it is safe."""
     monkeypatch.setattr("OpenShockPY.client.time.sleep", lambda _: None)
@@ -295,3 +327,494 @@ def test_base_url_is_normalized(record):
     client = make_client(base_url="https://api.openshock.dev/")
     client.list_devices()
     assert recorder.calls[0]["url"] == "https://api.openshock.dev/1/devices"
+
+
+def wait_until_queued(client):
+    """Block until a control is waiting in the client's coalescer."""
+    for _ in range(500):
+        if client._coalescer._pending:
+            return
+        time.sleep(0.01)
+    raise AssertionError("no control was queued")
+
+
+def test_coalescing_merges_concurrent_controls(record):
+    recorder = record(FakeResponse(200, {"message": "ok"}))
+    client = make_client(coalesce_window=0.2, coalesce_max_batch=8)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(lambda i: client.shock(f"s{i}", intensity=10), range(8))
+        )
+    assert results == [{"message": "ok"}] * 8
+    assert len(recorder.calls) == 1
+    ids = sorted(s["id"] for s in recorder.calls[0]["json"]["shocks"])
+    assert ids == sorted(f"s{i}" for i in range(8))
+
+
+def test_coalescing_never_puts_one_shocker_twice_in_a_batch(record):
+    recorder = record(FakeResponse(200, {"message": "ok"}))
+    client = make_client(coalesce_window=0.2)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda _: client.vibrate("s1"), range(2)))
+    assert len(recorder.calls) == 2
+    assert all(len(c["json"]["shocks"]) == 1 for c in recorder.calls)
+
+
+def test_coalescing_hands_the_error_to_every_caller(record):
+    record(FakeResponse(403, {"detail": "Not allowed"}))
+    client = make_client(coalesce_window=0.2, coalesce_max_batch=3)
+
+    def attempt(i):
+        try:
+            client.shock(f"s{i}")
+        except OpenShockAuthError:
+            return "denied"
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert list(pool.map(attempt, range(3))) == ["denied"] * 3
+
+
+def test_coalescing_does_not_delay_stop(record):
+    recorder = record(FakeResponse(200, {"message": "ok"}))
+    make_client(coalesce_window=30.0).stop("s1")
+    assert recorder.calls[0]["json"]["shocks"][0]["type"] == "Stop"
+
+
+def test_stop_reaches_the_wire_after_a_queued_shock(record):
+    recorder = record(FakeResponse(200, {"message": "ok"}))
+    client = make_client(coalesce_window=30.0)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        shock = pool.submit(client.shock, "s1")
+        wait_until_queued(client)
+        client.stop("s1")
+        assert shock.result(timeout=5) == {"message": "ok"}
+    types = [call["json"]["shocks"][0]["type"] for call in recorder.calls]
+    assert types == ["Shock", "Stop"]
+
+
+def test_coalesce_window_is_validated():
+    with pytest.raises(OpenShockValidationError):
+        make_client(coalesce_window=0)
+    with pytest.raises(OpenShockValidationError):
+        make_client(coalesce_window=0.01, coalesce_max_batch=0)
+
+
+OWN_SHOCKERS = {"data": [{"id": "hub", "shockers": [{"id": "s1"}, {"id": "s2"}]}]}
+
+
+def test_warm_shocker_cache_makes_stop_all_one_request(record):
+    recorder = record(
+        FakeResponse(200, OWN_SHOCKERS),
+        FakeResponse(200, {"message": "ok"}),
+    )
+    client = make_client(shocker_cache_ttl=60)
+    assert client.refresh_shocker_cache() == ["s1", "s2"]
+    client.stop_all()
+    client.stop_all()
+    assert [c["method"] for c in recorder.calls] == ["GET", "POST", "POST"]
+
+
+def test_shocker_cache_is_dropped_by_topology_changes(record):
+    recorder = record(
+        FakeResponse(200, OWN_SHOCKERS),
+        FakeResponse(200, {"message": "ok"}),
+        FakeResponse(200, {"message": "ok"}),
+        FakeResponse(200, OWN_SHOCKERS),
+        FakeResponse(200, {"message": "ok"}),
+    )
+    client = make_client(shocker_cache_ttl=60)
+    client.stop_all()
+    client.delete_shocker("s3")
+    client.stop_all()
+    methods = [c["method"] for c in recorder.calls]
+    assert methods == ["GET", "POST", "DELETE", "GET", "POST"]
+
+
+def test_shocker_cache_is_dropped_when_a_fan_out_is_rejected(record):
+    recorder = record(
+        FakeResponse(200, OWN_SHOCKERS),
+        FakeResponse(404, {"detail": "Shocker not found"}),
+        FakeResponse(200, OWN_SHOCKERS),
+        FakeResponse(200, {"message": "ok"}),
+    )
+    client = make_client(shocker_cache_ttl=60)
+    with pytest.raises(OpenShockNotFoundError):
+        client.shock_all()
+    client.shock_all()
+    assert [c["method"] for c in recorder.calls] == ["GET", "POST", "GET", "POST"]
+
+
+def test_priority_stop_sends_a_pre_serialized_body(record, monkeypatch):
+    slept = []
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", slept.append)
+    recorder = record(
+        FakeResponse(503, {"detail": "busy"}),
+        FakeResponse(200, {"message": "ok"}),
+    )
+    client = make_client(priority_stop=True, coalesce_window=30.0)
+    assert client.stop("s1", custom_name="panic") == {"message": "ok"}
+    # A repeated Stop is harmless, so a 503 is replayed - without sleeping.
+    assert len(recorder.calls) == 2
+    assert slept == []
+    call = recorder.calls[0]
+    assert call["headers"]["Content-Type"] == "application/json"
+    assert call["headers"]["OpenShockToken"] == "tok"
+    assert json.loads(call["data"]) == {
+        "shocks": [
+            {
+                "id": "s1",
+                "type": "Stop",
+                "intensity": 0,
+                "duration": 300,
+                "exclusive": False,
+            }
+        ],
+        "customName": "panic",
+    }
+
+
+def test_priority_stop_waits_out_a_short_retry_after(record, monkeypatch):
+    slept = []
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", slept.append)
+    recorder = record(
+        FakeResponse(429, {"detail": "slow down"}, headers={"Retry-After": "0.2"}),
+        FakeResponse(200, {"message": "ok"}),
+    )
+    limiter = RateLimiter(10)
+    penalized = []
+    monkeypatch.setattr(limiter, "penalize", penalized.append)
+    client = make_client(priority_stop=True, control_rate_limit=limiter)
+    assert client.stop("s1") == {"message": "ok"}
+    assert len(recorder.calls) == 2
+    assert slept == [0.2] and penalized == [0.2]
+
+
+def test_priority_stop_raises_a_429_with_a_long_retry_after(record, monkeypatch):
+    slept = []
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", slept.append)
+    recorder = record(
+        FakeResponse(429, {"detail": "slow down"}, headers={"Retry-After": "30"})
+    )
+    client = make_client(priority_stop=True)
+    with pytest.raises(OpenShockRateLimitError):
+        client.stop("s1")
+    assert len(recorder.calls) == 1 and slept == []
+
+
+def test_priority_stop_reaches_the_wire_after_a_queued_shock(record):
+    recorder = record(FakeResponse(200, {"message": "ok"}))
+    client = make_client(priority_stop=True, coalesce_window=30.0)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        shock = pool.submit(client.shock, "s1")
+        wait_until_queued(client)
+        client.stop("s1")
+        assert shock.result(timeout=5) == {"message": "ok"}
+    bodies = [call.get("json") or json.loads(call["data"]) for call in recorder.calls]
+    assert [body["shocks"][0]["type"] for body in bodies] == ["Shock", "Stop"]
+
+
+def test_priority_stop_all_with_warm_cache_is_one_request(record):
+    recorder = record(
+        FakeResponse(200, OWN_SHOCKERS),
+        FakeResponse(200, {"message": "ok"}),
+    )
+    client = make_client(priority_stop=True, shocker_cache_ttl=60)
+    client.refresh_shocker_cache()
+    client.stop_all()
+    assert len(recorder.calls) == 2
+    ids = [s["id"] for s in json.loads(recorder.calls[1]["data"])["shocks"]]
+    assert ids == ["s1", "s2"]
+
+
+def test_warmup_opens_connections_concurrently(record):
+    recorder = record(FakeResponse(200, {"data": {}}))
+    client = make_client(priority_stop=True)
+    assert client.warmup(connections=3) == 4
+    assert len(recorder.calls) == 4
+    for call in recorder.calls:
+        assert call["method"] == "GET"
+        assert call["url"].endswith("/1/public/stats")
+        assert call["headers"]["OpenShockToken"] is None
+
+
+def test_warmup_counts_failed_pings_without_raising():
+    def handler(req):
+        raise OpenShockConnectionError("refused")
+
+    client = make_client(transport=InMemoryTransport(handler))
+    assert client.warmup(connections=2) == 0
+
+
+def test_warmup_keepalive_pings_until_closed(record):
+    recorder = record(FakeResponse(200, {"data": {}}))
+    client = make_client()
+    client.warmup(keepalive_interval=0.01)
+    deadline = time.monotonic() + 2
+    while len(recorder.calls) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    client.close()
+    sent = len(recorder.calls)
+    assert sent >= 3
+    time.sleep(0.05)
+    assert len(recorder.calls) == sent
+
+
+def test_close_does_not_wait_out_a_keepalive_ping_in_flight():
+    pinged, release = threading.Event(), threading.Event()
+    first = [True]
+
+    def handler(req):
+        if first[0]:
+            first[0] = False  # the warmup ping itself
+        else:
+            pinged.set()
+            release.wait(10)  # a ping stuck until its timeout
+        return {}
+
+    client = make_client(transport=InMemoryTransport(handler))
+    client.warmup(keepalive_interval=0.01)
+    assert pinged.wait(5)
+    thread = client._keepalive_thread
+    client.close()
+    # close returned while the ping was still stuck on the keepalive thread.
+    assert thread.is_alive()
+    release.set()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_warmup_validates_arguments():
+    client = make_client()
+    with pytest.raises(OpenShockValidationError):
+        client.warmup(connections=0)
+    with pytest.raises(OpenShockValidationError):
+        client.warmup(keepalive_interval=0)
+
+
+def test_setters_never_touch_the_shared_session(record):
+    record(FakeResponse(200, {"data": []}))
+    client = make_client()
+    client.SetSessionToken("session-token")
+    client.api_key = "other"
+    assert client.api_key == "other"
+    assert "OpenShockToken" not in client._session.headers
+    assert "OpenShockSession" not in client._session.headers
+    assert not client._session.cookies
+
+
+def test_concurrent_credential_swaps_never_mix_headers(record):
+    recorder = record(FakeResponse(200, {"message": "ok"}))
+    client = make_client(api_key="key-0")
+    stop = threading.Event()
+
+    def swap():
+        n = 0
+        while not stop.is_set():
+            n += 1
+            client.SetAPIKey(f"key-{n}")
+            client.SetBaseURL(f"https://api-{n}.example")
+
+    def control(_):
+        client.shock("s1", intensity=1, duration=300)
+
+    swapper = threading.Thread(target=swap)
+    swapper.start()
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(control, range(2000)))
+    finally:
+        stop.set()
+        swapper.join()
+
+    assert len(recorder.calls) == 2000
+    for call in recorder.calls:
+        token = call["headers"]["OpenShockToken"]
+        assert call["headers"]["Open-Shock-Token"] == token
+        # The base URL is set right after the key, so one snapshot holds
+        # either the matching URL or the previous one - never a later one.
+        key_n = int(token.split("-")[1])
+        host = call["url"].split("/")[2]
+        url_n = 0 if host == "api.openshock.app" else int(host[4:].split(".")[0])
+        assert url_n in (key_n, key_n - 1)
+
+
+def _shocker_handler(slow=(), missing=(), delay=0.05):
+    """InMemoryTransport handler serving ``GET /1/shockers/{id}``."""
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def handler(req):
+        shocker_id = req.url.rsplit("/", 1)[1]
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        try:
+            time.sleep(delay if shocker_id in slow else 0.001)
+            if shocker_id in missing:
+                return 404, {"message": "Shocker not found"}
+            return {"data": {"id": shocker_id}}
+        finally:
+            with lock:
+                active["now"] -= 1
+
+    return handler, active
+
+
+def test_batch_keeps_input_order_and_per_item_errors():
+    handler, active = _shocker_handler(missing={"s3"})
+    client = make_client(transport=InMemoryTransport(handler))
+    calls = ({"shocker_id": f"s{i}"} for i in range(20))
+    results = list(client.batch("get_shocker", calls, concurrency=4))
+    assert [r.index for r in results] == list(range(20))
+    assert results[0].unwrap() == {"data": {"id": "s0"}}
+    assert isinstance(results[3].error, OpenShockNotFoundError)
+    assert [r.ok for r in results].count(False) == 1
+    assert 1 < active["max"] <= 4
+
+
+def test_batch_unordered_yields_in_completion_order():
+    handler, _ = _shocker_handler(slow={"s0"})
+    client = make_client(transport=InMemoryTransport(handler))
+    calls = [{"shocker_id": f"s{i}"} for i in range(5)]
+    results = list(client.batch("get_shocker", calls, ordered=False))
+    assert results[-1].index == 0
+    assert sorted(r.index for r in results) == list(range(5))
+
+
+def test_batch_rejects_non_endpoint_methods_and_bad_concurrency():
+    client = make_client()
+    with pytest.raises(OpenShockValidationError):
+        client.batch("close", [])
+    with pytest.raises(OpenShockValidationError):
+        client.batch("_request", [])
+    with pytest.raises(OpenShockValidationError):
+        client.batch("get_shocker", [], concurrency=0)
+
+
+def test_batch_stops_on_non_api_errors():
+    client = make_client(transport=InMemoryTransport(lambda req: {}))
+    with pytest.raises(TypeError):
+        list(client.batch("get_shocker", [{"bogus": 1}]))
+
+
+def _log_pages(total, page_size, delay=0.0):
+    lock = threading.Lock()
+    seen = {"pages": [], "active": 0, "max": 0}
+
+    def handler(req):
+        with lock:
+            seen["pages"].append(req.params["page"])
+            seen["active"] += 1
+            seen["max"] = max(seen["max"], seen["active"])
+        try:
+            time.sleep(delay)
+            start = (req.params["page"] - 1) * page_size
+            stop = min(start + page_size, total)
+            return {"data": [{"id": i} for i in range(start, stop)]}
+        finally:
+            with lock:
+                seen["active"] -= 1
+
+    return handler, seen
+
+
+def test_iter_logs_walks_pages_in_order_and_stops_at_the_end():
+    handler, seen = _log_pages(total=23, page_size=5, delay=0.02)
+    client = make_client(transport=InMemoryTransport(handler))
+    stream = client.iter_logs(page_size=5, prefetch=3, shocker_ids=["s1"])
+    assert seen["pages"] == []  # nothing is sent before iteration
+    assert [entry["id"] for entry in stream] == list(range(23))
+    assert sorted(seen["pages"])[:6] == [1, 2, 3, 4, 5, 6]
+    # Page 6 is the first empty one; at most `prefetch` pages go past it.
+    assert max(seen["pages"]) <= 6 + 3
+    assert seen["max"] == 4
+
+
+def test_iter_logs_keeps_going_when_the_server_caps_the_page_size():
+    # Asked for 10 per page, the server sends at most 3.
+    handler, seen = _log_pages(total=8, page_size=3)
+    client = make_client(transport=InMemoryTransport(handler))
+    entries = list(client.iter_logs(page_size=10, prefetch=1))
+    assert [entry["id"] for entry in entries] == list(range(8))
+    assert sorted(seen["pages"])[:4] == [1, 2, 3, 4]
+
+
+def test_iter_logs_without_prefetch_is_serial_and_raises_page_errors():
+    handler, seen = _log_pages(total=10, page_size=5)
+    client = make_client(transport=InMemoryTransport(handler))
+    assert len(list(client.iter_logs(page_size=5, prefetch=0))) == 10
+    assert seen["pages"] == [1, 2, 3] and seen["max"] == 1
+
+    failing = make_client(
+        transport=InMemoryTransport(
+            lambda req: (404, {"message": "no"})
+            if req.params["page"] == 2
+            else {"data": [{"id": 0}]}
+        )
+    )
+    stream = failing.iter_logs(page_size=1)
+    assert next(stream) == {"id": 0}
+    with pytest.raises(OpenShockNotFoundError):
+        next(stream)
+    with pytest.raises(OpenShockValidationError):
+        failing.iter_logs(page_size=0)
+    with pytest.raises(OpenShockValidationError):
+        failing.iter_logs(prefetch=-1)
+
+
+def test_spent_retry_budget_surfaces_errors_immediately(record, monkeypatch):
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", lambda s: None)
+    recorder = record(FakeResponse(503, {"message": "down"}))
+    budget = RetryBudget(ratio=0.5, min_per_second=0)
+    client = make_client(retry_budget=budget)
+    for _ in range(4):
+        with pytest.raises(OpenShockServerError):
+            client.list_devices()
+    # Four first attempts earn two retries in total, not 4 * max_retries.
+    assert len(recorder.calls) == 6
+    assert budget.stats() == RetryBudgetStats(requests=4, retries=2, suppressed=4)
+
+
+def test_backoff_strategy_controls_retry_sleeps(record, monkeypatch):
+    slept = []
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", slept.append)
+    record(FakeResponse(503, {"message": "down"}))
+    client = make_client(backoff=DecorrelatedJitterBackoff(base=0.1, seed=3))
+    with pytest.raises(OpenShockServerError):
+        client.list_devices()
+
+    expected = DecorrelatedJitterBackoff(base=0.1, seed=3)
+    first = expected.delay(0, None)
+    assert slept == [first, expected.delay(1, first)]
+
+
+def test_deadline_trims_timeout_and_skips_late_retries(record, monkeypatch):
+    slept = []
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", slept.append)
+    recorder = record(FakeResponse(503, {"message": "down"}, {"Retry-After": "5"}))
+    client = make_client(deadline=2)
+    with pytest.raises(OpenShockServerError):
+        client.list_devices()
+
+    (call,) = recorder.calls
+    assert 0 < call["timeout"] <= 2
+    assert slept == []
+
+
+def test_deadline_block_bounds_a_single_call(record, monkeypatch):
+    real_sleep = time.sleep
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", lambda s: None)
+    recorder = record(FakeResponse(503, {"message": "down"}))
+    client = make_client(max_retries=5, backoff_factor=0.3)
+    with deadline(1):
+        with pytest.raises(OpenShockServerError):
+            client.list_devices()
+    # Backoffs of 0.3s and 0.6s fit in the second; the 1.2s one does not.
+    assert len(recorder.calls) == 3
+
+    with pytest.raises(OpenShockDeadlineExceededError):
+        with deadline(0.01):
+            real_sleep(0.02)
+            client.list_devices()
+    assert len(recorder.calls) == 3
@@ -0,0 +1,111 @@
+"""Tests for pluggable JSON codecs."""
+
+import json
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    InMemoryTransport,
+    OpenShockClient,
+    OpenShockNotFoundError,
+    OpenShockValidationError,
+    OrjsonCodec,
+    StdlibCodec,
+)
+from OpenShockPY._codec import MsgspecCodec, resolve_codec
+
+SHOCKER = "00000000-0000-0000-0000-000000000001"
+
+
+class CountingCodec(StdlibCodec):
+    content_type = "application/json; charset=utf-8"
+
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+
+    def encode(self, value):
+        self.encoded += 1
+        return super().encode(value)
+
+    def decode(self, data):
+        self.decoded += 1
+        return super().decode(data)
+
+
+def test_resolve_codec_names():
+    assert resolve_codec(None) is None
+    codec = CountingCodec()
+    assert resolve_codec(codec) is codec
+    assert isinstance(resolve_codec("stdlib"), StdlibCodec)
+    with pytest.raises(OpenShockValidationError):
+        resolve_codec("yaml")
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgspec"])
+def test_optional_codecs_round_trip(name):
+    pytest.importorskip(name)
+    codec = resolve_codec(name)
+    payload = {"shocks": [{"id": SHOCKER, "intensity": 50}], "customName": None}
+    assert json.loads(codec.encode(payload)) == payload
+    assert codec.decode(b'{"data": [1.5, "\\u00e9"]}') == {"data": [1.5, "é"]}
+    with pytest.raises(ValueError):
+        codec.decode(b"{not json")
+
+
+def test_auto_prefers_an_installed_fast_codec():
+    codec = resolve_codec("auto")
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        assert isinstance(codec, (MsgspecCodec, StdlibCodec))
+    else:
+        assert isinstance(codec, OrjsonCodec)
+
+
+def test_sync_client_sends_pre_encoded_bytes_and_decodes_with_the_codec():
+    def handler(req):
+        if req.url.endswith("/missing"):
+            return 404, {"message": "no such shocker"}
+        return {"message": "ok", "data": None}
+
+    transport = InMemoryTransport(handler)
+    codec = CountingCodec()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=transport,
+        codec=codec,
+    )
+    assert client.shock(SHOCKER, 10, 300) == {"message": "ok", "data": None}
+    request = transport.requests[0]
+    assert request.json is None
+    assert json.loads(request.content)["shocks"][0]["id"] == SHOCKER
+    assert request.headers["Content-Type"] == codec.content_type
+
+    client.list_devices()  # no body: nothing to encode
+    assert transport.requests[1].content is None
+    with pytest.raises(OpenShockNotFoundError) as excinfo:
+        client._request("GET", "/missing")
+    assert excinfo.value.payload == {"message": "no such shocker"}
+    assert (codec.encoded, codec.decoded) == (1, 3)
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_uses_the_codec():
+    codec = CountingCodec()
+    transport = AsyncInMemoryTransport(lambda req: {"data": []})
+    async with AsyncOpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=transport,
+        codec=codec,
+    ) as client:
+        await client.vibrate(SHOCKER, 10, 300)
+        assert await client.list_shockers() == {"data": []}
+    request = transport.requests[0]
+    assert json.loads(request.content)["shocks"][0]["type"] == "Vibrate"
+    assert request.headers["Content-Type"] == codec.content_type
+    assert (codec.encoded, codec.decoded) == (1, 2)
@@ -149,6 +149,8 @@ def test_transport_errors_are_only_retried_for_idempotent_methods():
     assert _core.should_retry_transport_error("GET")
     assert _core.should_retry_transport_error("delete")
     assert not _core.should_retry_transport_error("POST")
+    assert not _core.should_retry_transport_error("POST", request_sent=True)
+    assert _core.should_retry_transport_error("POST", request_sent=False)
 
 
 def test_validation_error_is_also_a_value_error():
@@ -157,13 +159,6 @@ def test_validation_error_is_also_a_value_error():
     assert issubclass(_core.OpenShockValidationError, _core.OpenShockPYError)
 
 
-def test_retry_delay_prefers_retry_after_and_caps():
-    assert _core.retry_delay(0, backoff_factor=0.5) == 0.5
-    assert _core.retry_delay(2, backoff_factor=0.5) == 2.0
-    assert _core.retry_delay(0, retry_after=7.0) == 7.0
-    assert _core.retry_delay(99, backoff_factor=0.5, max_delay=30.0) == 30.0
-
-
 def test_normalize_base_url():
     assert _core.normalize_base_url(" https://api.openshock.app/ ") == (
         "https://api.openshock.app"
@@ -185,3 +180,68 @@ def test_session_headers():
 
 def test_clean_params_drops_none():
     assert _core.clean_params({"a": 1, "b": None, "c": 0}) == {"a": 1, "c": 0}
+
+
+def test_shocker_id_cache_expires_and_invalidates():
+    now = [100.0]
+    cache = _core.ShockerIdCache(ttl=5.0, clock=lambda: now[0])
+    cache.put(None, ["s1", "s2"])
+    cache.put("other", ["s3"])
+    assert cache.get(None) == ["s1", "s2"]
+    now[0] += 5.0
+    assert cache.get(None) is None
+    assert cache.get("other") is None
+    cache.put(None, ["s1"])
+    cache.invalidate()
+    assert cache.get(None) is None
+
+
+def test_shocker_id_cache_is_off_with_zero_ttl():
+    cache = _core.ShockerIdCache(ttl=0)
+    cache.put(None, ["s1"])
+    assert cache.get(None) is None
+    with pytest.raises(_core.OpenShockValidationError):
+        _core.ShockerIdCache(ttl=-1)
+
+
+def test_encode_stop_request_is_memoized_and_valid_json():
+    import json
+
+    first = _core.encode_stop_request(("s1", "s2"), "panic")
+    assert first is _core.encode_stop_request(("s1", "s2"), "panic")
+    payload = json.loads(first)
+    assert [s["type"] for s in payload["shocks"]] == ["Stop", "Stop"]
+    assert payload["customName"] == "panic"
+
+
+def test_timeouts_layer_phase_by_phase():
+    base = _core.Timeouts.of(15.0)
+    assert base.simplify() == 15.0
+    fast_connect = _core.Timeouts(connect=2).over(base)
+    assert fast_connect == _core.Timeouts(2, 15.0, 15.0, 15.0)
+    assert fast_connect.capped(5) == _core.Timeouts(2, 5, 5, 5)
+    assert fast_connect.simplify() is fast_connect
+    with pytest.raises(_core.OpenShockValidationError):
+        _core.Timeouts(read=0)
+
+
+def test_endpoints_build_paths_bodies_and_queries():
+    endpoints = _core.ENDPOINTS
+    assert endpoints["edit_shocker"].request(
+        {"shocker_id": "s1", "device_id": "d1", "name": "n", "rf_id": 7, "model": "m"}
+    ) == (
+        "PATCH",
+        "/1/shockers/s1",
+        {"json_body": {"device": "d1", "name": "n", "rfId": 7, "model": "m"}},
+    )
+    assert endpoints["create_share_invite"].request(
+        {"shockers": ({"id": "s1"},), "user": None}
+    ) == ("POST", "/2/shares/user/invites", {"json_body": {"shockers": [{"id": "s1"}]}})
+    assert endpoints["get_shocker_logs"].request(
+        {"shocker_id": "s1", "offset": None, "limit": 5}
+    ) == ("GET", "/1/shockers/s1/logs", {"params": {"limit": 5}})
+    assert _core.logs_params(2, None, None, None, "Desc", ["a"]) == {
+        "page": 2,
+        "sortDir": "Desc",
+        "shockerIds": ["a"],
+    }
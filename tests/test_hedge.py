@@ -0,0 +1,161 @@
+"""Tests for hedged read requests."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    HedgePolicy,
+    InMemoryTransport,
+    OpenShockClient,
+    OpenShockValidationError,
+)
+
+SHOCKER = "00000000-0000-0000-0000-000000000001"
+
+
+def test_delay_follows_the_observed_quantile():
+    policy = HedgePolicy(quantile=0.9, initial_delay=0.3, min_samples=10)
+    path = f"/1/shockers/{SHOCKER}"
+    assert policy.delay_for(path) == 0.3
+    for ms in range(1, 11):
+        policy.observe(path, ms / 100)
+    assert policy.delay_for(path) == pytest.approx(0.09)
+    # Other shocker ids share the endpoint's samples; other endpoints do not.
+    assert policy.delay_for("/1/shockers/00000000-0000-0000-0000-000000000002") == (
+        pytest.approx(0.09)
+    )
+    assert policy.delay_for("/1/devices") == 0.3
+    assert HedgePolicy(delay=0.2).delay_for(path) == 0.2
+
+
+def test_control_requests_and_unsafe_methods_are_never_hedged():
+    policy = HedgePolicy(methods=("GET", "DELETE"))
+    assert policy.applies("get", "/1/devices")
+    assert not policy.applies("POST", "/2/shockers/control")
+    with pytest.raises(OpenShockValidationError):
+        HedgePolicy(methods=("POST",))
+
+
+def slow_first_handler(release):
+    """The first request blocks until ``release`` is set; later ones answer."""
+    lock = threading.Lock()
+    calls = []
+
+    def handler(req):
+        with lock:
+            calls.append(req.method)
+            first = len(calls) == 1
+        if first:
+            release.wait(5)
+            return {"from": "first"}
+        return {"from": "hedge"}
+
+    return handler, calls
+
+
+class RecordingPolicy(HedgePolicy):
+    """A policy that reports every latency sample it is given."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.seen = []
+        self.sampled_twice = threading.Event()
+
+    def observe(self, path, seconds):
+        super().observe(path, seconds)
+        self.seen.append(seconds)
+        if len(self.seen) == 2:
+            self.sampled_twice.set()
+
+
+def test_sync_hedge_wins_over_a_slow_first_attempt():
+    release = threading.Event()
+    handler, calls = slow_first_handler(release)
+    policy = RecordingPolicy(delay=0.02)
+    client = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        hedge=policy,
+    )
+    # The first attempt is still blocked, so only the hedge can answer.
+    assert client.get_shocker(SHOCKER) == {"from": "hedge"}
+    assert calls == ["GET", "GET"]
+    assert len(policy.seen) == 1
+
+    # The loser's latency is sampled too once it finishes, so a slow
+    # endpoint does not look fast to the hedge delay.
+    release.set()
+    assert policy.sampled_twice.wait(5)
+    assert policy.seen[1] > policy.seen[0]
+    client.close()
+
+
+def test_sync_concurrent_reads_neither_queue_nor_hedge_spuriously():
+    # Every read must be in flight at once to pass the barrier, which a
+    # read queued behind the hedge workers never would be.
+    barrier = threading.Barrier(48)
+    lock = threading.Lock()
+    calls = []
+
+    def handler(req):
+        with lock:
+            calls.append(req.method)
+        barrier.wait(timeout=10)
+        return {"id": SHOCKER}
+
+    client = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        hedge=HedgePolicy(delay=30),
+    )
+    with ThreadPoolExecutor(max_workers=48) as pool:
+        list(pool.map(lambda _: client.get_shocker(SHOCKER), range(48)))
+    client.close()
+    # Reads beyond the hedge workers went out on their callers' threads,
+    # and none was hedged.
+    assert len(calls) == 48
+    assert not barrier.broken
+
+
+def test_sync_control_post_is_sent_once():
+    release = threading.Event()
+    handler, calls = slow_first_handler(release)
+    # Outlast the hedge delay, which a POST must never trigger.
+    threading.Timer(0.1, release.set).start()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        hedge=HedgePolicy(delay=0.01),
+    )
+    assert client.shock(SHOCKER, 10, 300) == {"from": "first"}
+    assert calls == ["POST"]
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_hedge_cancels_the_loser():
+    cancelled = asyncio.Event()
+    calls = []
+
+    async def handler(req):
+        calls.append(req.method)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return {"from": len(calls)}
+
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(handler),
+        hedge=HedgePolicy(delay=0.02),
+    ) as client:
+        assert await client.get_shocker(SHOCKER) == {"from": 2}
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,116 @@
+"""Tests for lazy JSON response views."""
+
+import json
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    InMemoryTransport,
+    LazyArray,
+    LazyObject,
+    OpenShockClient,
+    OpenShockNotFoundError,
+)
+from OpenShockPY._lazy import _View, lazy_response
+
+SHOCKER = "00000000-0000-0000-0000-000000000001"
+PAGE = {
+    "message": "",
+    "data": [
+        {"id": f"log-{i}", "type": "Shock", "controlledBy": {"name": "a"}}
+        for i in range(5)
+    ],
+    "meta": {"total": 5, "pages": [1]},
+}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_views_read_like_the_decoded_json(indent):
+    view = lazy_response(json.dumps(PAGE, indent=indent).encode())
+    assert isinstance(view, LazyObject)
+    assert isinstance(view["data"], LazyArray)
+    assert view["data"][2] == PAGE["data"][2]
+    assert view["data"][-1]["id"] == "log-4"
+    assert [entry["id"] for entry in view["data"]] == [f"log-{i}" for i in range(5)]
+    assert len(view["data"]) == 5 and view["data"][1:3] == PAGE["data"][1:3]
+    assert view["meta"]["pages"] == [1]
+    assert view == PAGE and view.to_python() == PAGE
+    assert list(view) == ["message", "data", "meta"]
+    with pytest.raises(IndexError):
+        view["data"][5]
+    with pytest.raises(KeyError):
+        view["missing"]
+
+
+def test_only_what_is_read_gets_decoded():
+    # A broken entry after the one read does not matter until it is reached.
+    body = b'{"message":"","data":[{"id":"a"},{"id":oops}],"meta":1}'
+    view = lazy_response(body)
+    assert view["data"][0] == {"id": "a"}
+    with pytest.raises(ValueError):
+        view["meta"]
+
+
+def test_entries_are_independent_copies():
+    view = lazy_response(json.dumps(PAGE).encode())
+    first = view["data"][0]
+    first["id"] = "changed"
+    assert view["data"][0]["id"] == "log-0"
+
+
+def test_views_skip_nested_values_they_were_not_asked_for():
+    view = lazy_response(b'{"a": {"b": [1, [2, 3]], "c": {}}, "d": [4]}')
+    assert view["d"] == [4]
+    with pytest.raises(TypeError):
+        _View("[]", 0)  # only the concrete views scan
+
+
+def test_indexing_ahead_while_iterating_skips_nothing():
+    obj = lazy_response(b'{"a": 1, "b": 2, "c": 3, "d": 4}')
+    keys = []
+    for key in obj:
+        keys.append(key)
+        assert obj["c"] == 3
+    assert keys == ["a", "b", "c", "d"]
+
+    arr = lazy_response(b"[10, 20, 30, 40, 50]")
+    values = []
+    for value in arr:
+        values.append(value)
+        assert arr[2] == 30
+    assert values == [10, 20, 30, 40, 50]
+
+
+def test_scalars_and_empty_bodies():
+    assert lazy_response(b"") is None
+    assert lazy_response(b" 3 ") == 3
+    assert lazy_response(b"[]") == [] and lazy_response(b" {} ") == {}
+
+
+def test_sync_listings_return_views_on_request():
+    transport = InMemoryTransport(
+        lambda req: PAGE if req.url.endswith("/logs") else (404, {"message": "no"})
+    )
+    client = OpenShockClient(user_agent="OpenShockPY-Test/0.1", transport=transport)
+    logs = client.get_shocker_logs(SHOCKER, limit=5, lazy=True)
+    assert isinstance(logs, LazyObject)
+    assert logs["data"][0]["id"] == "log-0"
+    assert isinstance(client.get_logs(lazy=True), LazyObject)
+    assert type(client.get_logs()) is dict
+    with pytest.raises(OpenShockNotFoundError):
+        client.list_own_shockers(lazy=True)  # errors are raised as usual
+
+
+@pytest.mark.asyncio
+async def test_async_listings_return_views_on_request():
+    hubs = {"data": [{"id": "hub", "shockers": [{"id": SHOCKER}]}]}
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(lambda req: hubs),
+        single_flight=True,
+        typed_responses=True,
+    ) as client:
+        view = await client.list_shockers(lazy=True)
+    assert isinstance(view, LazyObject)
+    assert view["data"][0]["shockers"][0]["id"] == SHOCKER
@@ -0,0 +1,112 @@
+"""Tests for the compact typed listing records."""
+
+import copy
+import json
+import pickle
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    DeviceRecord,
+    InMemoryTransport,
+    OpenShockClient,
+    ShockerRecord,
+)
+from OpenShockPY._core import extract_shocker_ids
+from OpenShockPY._models import compact_listing
+
+HUB = "2b2c6a3e-1f9e-4d55-9a57-0c5c0e1f5a10"
+
+
+def shocker(n):
+    return {
+        "id": f"00000000-0000-0000-0000-00000000000{n}",
+        "name": f"Shocker {n}",
+        "rfId": n,
+        "model": "CaiXianlin",
+        "isPaused": False,
+        "createdOn": "2026-01-01T00:00:00Z",
+    }
+
+
+OWN = {
+    "message": "",
+    "data": [
+        {
+            "id": HUB,
+            "name": "Hub",
+            "createdOn": "2026-01-01T00:00:00Z",
+            "shockers": [shocker(1), shocker(2)],
+        },
+    ],
+}
+
+
+def test_records_read_like_the_dicts_they_replace():
+    raw = json.loads(json.dumps(OWN))
+    listing = compact_listing("/1/shockers/own", raw)
+    hub = listing["data"][0]
+    assert isinstance(hub, DeviceRecord)
+    assert isinstance(hub["shockers"][0], ShockerRecord)
+    assert listing == OWN
+    assert hub["shockers"][1]["rfId"] == 2
+    assert hub.get("device") is None and "device" not in hub["shockers"][0]
+    assert list(hub) == ["id", "name", "createdOn", "shockers"]
+    assert extract_shocker_ids(listing) == [shocker(1)["id"], shocker(2)["id"]]
+
+    with pytest.raises(KeyError):
+        hub["missing"]
+    with pytest.raises(AttributeError):
+        hub.id = "other"
+    assert not hasattr(hub, "__dict__")
+
+
+def test_ids_and_models_are_interned_and_unknown_fields_kept():
+    a = ShockerRecord(json.loads(json.dumps(dict(shocker(1), firmware={"v": 2}))))
+    b = ShockerRecord(json.loads(json.dumps(shocker(1))))
+    assert a["id"] is b["id"] and a["model"] is b["model"]
+    assert a["firmware"] == {"v": 2}
+    assert a.to_dict() == dict(shocker(1), firmware={"v": 2})
+
+
+def test_records_survive_copy_and_pickle():
+    hub = compact_listing("/1/devices", {"data": [OWN["data"][0]]})["data"][0]
+    assert copy.deepcopy(hub) == hub
+    assert pickle.loads(pickle.dumps(hub)) == hub
+    assert type(copy.deepcopy(hub)["shockers"][0]) is ShockerRecord
+
+
+def test_other_paths_and_shapes_are_left_alone():
+    assert compact_listing("/1/shares", {"data": [{"id": "x"}]}) == {
+        "data": [{"id": "x"}]
+    }
+    assert compact_listing("/1/devices", {"data": "not a list"}) == {
+        "data": "not a list"
+    }
+    flat = compact_listing(f"/1/devices/{HUB}/shockers", {"data": [shocker(3)]})
+    assert isinstance(flat["data"][0], ShockerRecord)
+
+
+def test_clients_only_compact_when_asked():
+    transport = InMemoryTransport(lambda req: OWN)
+    plain = OpenShockClient(user_agent="OpenShockPY-Test/0.1", transport=transport)
+    assert type(plain.list_shockers()["data"][0]) is dict
+
+    typed = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(lambda req: OWN),
+        typed_responses=True,
+    )
+    assert isinstance(typed.list_own_shockers()["data"][0], DeviceRecord)
+
+
+@pytest.mark.asyncio
+async def test_async_client_compacts_device_listings():
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(lambda req: {"data": [OWN["data"][0]]}),
+        typed_responses=True,
+    ) as client:
+        devices = await client.list_devices()
+    assert isinstance(devices["data"][0], DeviceRecord)
@@ -0,0 +1,270 @@
+"""Tests for the adaptive client-side rate limiter."""
+
+import asyncio
+import multiprocessing
+import sqlite3
+import time
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    InMemoryTransport,
+    OpenShockClient,
+    OpenShockDeadlineExceededError,
+    OpenShockRateLimitError,
+    OpenShockValidationError,
+    RateLimiter,
+    SQLiteRateLimiter,
+    TransportResponse,
+    deadline,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(10, burst=2, clock=clock)
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.1)
+    assert limiter.reserve() == pytest.approx(0.2)
+    clock.now += 1
+    assert limiter.reserve() == 0
+
+
+def test_penalize_cuts_rate_blocks_everyone_and_recovers():
+    clock = FakeClock()
+    limiter = RateLimiter(10, min_rate=1, recovery=10, clock=clock)
+    limiter.penalize(retry_after=2)
+    assert limiter.rate == pytest.approx(5)
+    assert limiter.reserve() == pytest.approx(2)
+
+    clock.now += 5
+    assert limiter.rate == pytest.approx(7.5)
+    clock.now += 5
+    assert limiter.rate == pytest.approx(10)
+
+
+def test_slots_after_a_retry_after_block_are_spaced_not_bunched():
+    clock = FakeClock()
+    limiter = RateLimiter(50, burst=1, recovery=0, clock=clock)
+    limiter.penalize(retry_after=1.0)
+    clock.now += 0.5  # the block must not refill the bucket
+    waits = [limiter.reserve() for _ in range(9)]
+    assert waits == pytest.approx([0.5 + i / 50 for i in range(9)])
+
+
+def test_penalize_never_goes_below_min_rate():
+    limiter = RateLimiter(10, min_rate=4, clock=FakeClock())
+    for _ in range(5):
+        limiter.penalize()
+    assert limiter.rate == pytest.approx(4)
+
+
+def test_waits_past_the_timeout_raise_and_give_the_slot_back():
+    clock = FakeClock()
+    limiter = RateLimiter(10, burst=1, clock=clock)
+    limiter.penalize(retry_after=2)
+    with pytest.raises(OpenShockDeadlineExceededError):
+        limiter.acquire(timeout=0.2)
+    assert limiter.reserve(max_wait=1) == pytest.approx(2)
+    clock.now += 2
+    assert limiter.reserve() == 0  # nothing was taken by the refusals
+
+
+def test_deadline_covers_the_limiter_wait():
+    limiter = RateLimiter(10)
+    limiter.penalize(retry_after=2)
+    client = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(lambda req: {"data": []}),
+        rate_limit=limiter,
+    )
+    started = time.monotonic()
+    with pytest.raises(OpenShockDeadlineExceededError):
+        with deadline(0.2):
+            client.list_devices()
+    assert time.monotonic() - started < 0.2
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(OpenShockValidationError):
+        RateLimiter(0)
+    with pytest.raises(OpenShockValidationError):
+        RateLimiter(1, decrease=1)
+
+
+class SpyLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(1000)
+        self.acquired = 0
+        self.penalties = []
+
+    def acquire(self, timeout=None):
+        self.acquired += 1
+        return 0.0
+
+    async def aacquire(self, timeout=None):
+        self.acquired += 1
+        return 0.0
+
+    def penalize(self, retry_after=None):
+        self.penalties.append(retry_after)
+        super().penalize(retry_after)
+
+
+def test_client_feeds_429s_back_into_the_limiter(monkeypatch):
+    monkeypatch.setattr("OpenShockPY.client.time.sleep", lambda s: None)
+    responses = [
+        TransportResponse(429, {"Retry-After": "3"}, b"{}"),
+        TransportResponse(200, {}, b'{"data": []}'),
+    ]
+    limiter = SpyLimiter()
+    client = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(lambda req: responses.pop(0)),
+        rate_limit=limiter,
+    )
+    assert client.list_devices() == {"data": []}
+    assert limiter.acquired == 2
+    assert limiter.penalties == [3.0]
+    assert limiter.rate < limiter.target_rate
+
+
+def test_controls_use_their_own_bucket():
+    general, control = SpyLimiter(), SpyLimiter()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(lambda req: {"data": []}),
+        rate_limit=general,
+        control_rate_limit=control,
+    )
+    client.list_devices()
+    client.shock("s1", intensity=1, duration=300)
+    assert (general.acquired, control.acquired) == (1, 1)
+
+
+def test_a_plain_rate_builds_a_limiter():
+    client = OpenShockClient(user_agent="OpenShockPY-Test/0.1", rate_limit=5)
+    assert isinstance(client.rate_limiter, RateLimiter)
+    assert client.rate_limiter.target_rate == 5
+    assert client.control_rate_limiter is None
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_client_shares_a_limiter_across_clients():
+    limiter = SpyLimiter()
+    transport = AsyncInMemoryTransport(lambda req: {"data": []})
+    first = AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1", transport=transport, rate_limit=limiter
+    )
+    second = AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1", transport=transport, rate_limit=limiter
+    )
+    await first.list_devices()
+    await second.list_devices()
+    assert limiter.acquired == 2
+
+
+def test_sqlite_limiters_on_one_file_share_a_bucket(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "limits.db"
+    first = SQLiteRateLimiter(path, 10, burst=1, clock=clock)
+    second = SQLiteRateLimiter(path, 10, burst=1, clock=clock)
+    other_key = SQLiteRateLimiter(path, 10, burst=1, key="other", clock=clock)
+
+    assert first.reserve() == 0
+    assert second.reserve() == pytest.approx(0.1)
+    assert other_key.reserve() == 0
+
+    second.penalize(retry_after=5)
+    assert first.reserve() == pytest.approx(5)
+    assert first.rate == pytest.approx(5)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_limiter_waits_for_a_locked_file_off_the_loop(tmp_path):
+    path = tmp_path / "limits.db"
+    limiter = SQLiteRateLimiter(path, 10, burst=1)
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")  # another process mid-reservation
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.ensure_future(tick())
+    acquire = asyncio.ensure_future(limiter.aacquire())
+    penalize = asyncio.ensure_future(limiter.apenalize())
+    await asyncio.sleep(0.2)
+    assert not acquire.done() and ticks >= 10  # the loop kept running
+    holder.execute("COMMIT")
+    holder.close()
+    assert await asyncio.wait_for(acquire, 5) == 0
+    await asyncio.wait_for(penalize, 5)
+    ticker.cancel()
+    assert limiter.rate < limiter.target_rate
+
+
+class _SharedClock:
+    """A fake clock every process reads from shared memory."""
+
+    def __init__(self, context):
+        self.value = context.Value("d", 100.0)
+
+    def __call__(self):
+        return self.value.value
+
+
+def _worker(db_path, clock, reservations, waits):
+    limiter = SQLiteRateLimiter(db_path, 50, burst=1, recovery=0, clock=clock)
+    for _ in range(reservations):
+        waits.put(limiter.reserve())
+
+
+def test_retry_after_seen_by_one_process_pauses_the_others(tmp_path):
+    context = multiprocessing.get_context()
+    clock = _SharedClock(context)
+    db_path = str(tmp_path / "limits.db")
+    limiter = SQLiteRateLimiter(db_path, 50, burst=1, recovery=0, clock=clock)
+    first = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(
+            lambda req: TransportResponse(429, {"Retry-After": "1"}, b"{}")
+        ),
+        max_retries=0,
+        rate_limit=limiter,
+    )
+    with pytest.raises(OpenShockRateLimitError):
+        first.list_devices()
+    first.close()
+    clock.value.value += 0.25  # part of the block has passed
+
+    waits = context.Queue()
+    workers = [
+        context.Process(target=_worker, args=(db_path, clock, 3, waits))
+        for _ in range(3)
+    ]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(30)
+        assert proc.exitcode == 0
+
+    # Nobody goes out before the Retry-After elapses, and the nine slots
+    # are then spaced by the shared 50/s bucket rather than bunched.
+    got = sorted(waits.get(timeout=5) for _ in range(9))
+    assert got == pytest.approx([0.75 + i / 50 for i in range(9)])
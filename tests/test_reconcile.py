@@ -0,0 +1,121 @@
+"""Tests for reconciling control requests against the shocker logs."""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    ControlReconciler,
+    InMemoryTransport,
+    OpenShockClient,
+    OpenShockServerError,
+    build_control,
+)
+from OpenShockPY._reconcile import parse_log_time
+
+A = "00000000-0000-0000-0000-00000000000a"
+B = "00000000-0000-0000-0000-00000000000b"
+
+
+def log(kind="Shock", intensity=30, duration=1000, name="bot", at=None):
+    stamp = datetime.fromtimestamp(at or time.time(), timezone.utc)
+    return {
+        "id": f"log-{kind}-{intensity}-{stamp.timestamp()}",
+        "createdOn": stamp.strftime("%Y-%m-%dT%H:%M:%S.%f") + "0Z",
+        "type": kind,
+        "intensity": intensity,
+        "duration": duration,
+        "controlledBy": {"id": "u1", "name": "me", "customName": name},
+    }
+
+
+def test_parse_log_time_accepts_dotnet_precision():
+    assert parse_log_time("2024-05-01T12:00:00.1234567Z") == pytest.approx(
+        datetime(2024, 5, 1, 12, 0, 0, 123456, timezone.utc).timestamp()
+    )
+    assert parse_log_time("yesterday") is None
+
+
+def test_matching_checks_every_field_and_the_window():
+    reconciler = ControlReconciler(clock_skew=2, window=10)
+    control = build_control(A, "Shock", 30, 1000)
+    now = time.time()
+    assert reconciler.matches(log(), control, "bot", now)
+    assert not reconciler.matches(log(intensity=31), control, "bot", now)
+    assert not reconciler.matches(log(name=None), control, "bot", now)
+    assert not reconciler.matches(log(at=now - 5), control, "bot", now)
+    assert not reconciler.matches(log(at=now + 11), control, "bot", now)
+
+
+class Api:
+    """Fails the first control request with a 503; serves canned logs."""
+
+    def __init__(self, logs):
+        self.logs = logs
+        self.controls = []
+
+    def __call__(self, req):
+        if req.method == "POST":
+            self.controls.append([c["id"] for c in req.json["shocks"]])
+            if len(self.controls) == 1:
+                return (503, {"message": "upstream timeout"})
+            return {"message": "ok"}
+        shocker = req.url.split("/")[-2]
+        result = self.logs.get(shocker, [])
+        return result if isinstance(result, tuple) else {"data": result}
+
+
+def make_client(api, **kwargs):
+    return OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(api),
+        reconciler=ControlReconciler(poll_interval=0, **kwargs),
+    )
+
+
+def test_only_undelivered_controls_are_resent():
+    api = Api({A: [log()], B: []})
+    client = make_client(api, max_polls=2)
+    controls = [build_control(s, "Shock", 30, 1000) for s in (A, B)]
+    assert client.control(controls, custom_name="bot") == {"message": "ok"}
+    assert api.controls == [[A, B], [B]]
+
+
+def test_delivered_controls_are_not_resent():
+    api = Api({A: [log(kind="Vibrate")]})
+    client = make_client(api)
+    assert client.vibrate(A, 30, 1000, custom_name="bot") is None
+    assert api.controls == [[A]]
+
+
+def test_unreadable_logs_keep_the_original_error():
+    api = Api({A: (403, {"message": "no logs permission"})})
+    client = make_client(api)
+    with pytest.raises(OpenShockServerError):
+        client.shock(A, 30, 1000, custom_name="bot")
+    assert api.controls == [[A]]
+
+
+def test_resend_can_be_turned_off():
+    api = Api({A: []})
+    client = make_client(api, resend=False, max_polls=1)
+    with pytest.raises(OpenShockServerError):
+        client.shock(A, 30, 1000, custom_name="bot")
+    assert api.controls == [[A]]
+
+
+@pytest.mark.asyncio
+async def test_async_client_reads_logs_concurrently():
+    api = Api({A: [log()], B: [log()]})
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(api),
+        reconciler=ControlReconciler(poll_interval=0),
+    ) as client:
+        controls = [build_control(s, "Shock", 30, 1000) for s in (A, B)]
+        assert await client.control(controls, custom_name="bot") is None
+        results = await client.reconcile_controls(controls, time.time(), "bot")
+    assert [r.delivered for r in results] == [True, True]
+    assert api.controls == [[A, B]]
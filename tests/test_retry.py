@@ -0,0 +1,119 @@
+"""Tests for retry delays, the retry budget, timeouts and deadlines."""
+
+import pytest
+from OpenShockPY import _core, _retry
+
+
+def test_retry_delay_prefers_retry_after_and_caps():
+    assert _retry.retry_delay(0, backoff_factor=0.5) == 0.5
+    assert _retry.retry_delay(2, backoff_factor=0.5) == 2.0
+    assert _retry.retry_delay(0, retry_after=7.0) == 7.0
+    assert _retry.retry_delay(99, backoff_factor=0.5, max_delay=30.0) == 30.0
+
+
+def test_retry_budget_caps_retries_to_a_share_of_requests():
+    now = [100.0]
+    budget = _retry.RetryBudget(
+        ratio=0.2, min_per_second=0.1, window=10.0, clock=lambda: now[0]
+    )
+    for _ in range(10):
+        budget.record_request()
+    # 0.2 * 10 requests + 0.1/s * 10 s = 3 retries in the window.
+    assert [budget.try_spend() for _ in range(4)] == [True, True, True, False]
+    assert budget.stats() == _retry.RetryBudgetStats(
+        requests=10, retries=3, suppressed=1
+    )
+
+    now[0] += 10.0
+    assert budget.try_spend()
+
+
+def test_retry_budget_rejects_bad_settings():
+    with pytest.raises(_core.OpenShockValidationError):
+        _retry.RetryBudget(ratio=-1)
+    with pytest.raises(_core.OpenShockValidationError):
+        _retry.RetryBudget(window=0)
+
+
+def test_jittered_backoffs_stay_in_bounds_and_are_seedable():
+    for cls in (
+        _retry.FullJitterBackoff,
+        _retry.EqualJitterBackoff,
+        _retry.DecorrelatedJitterBackoff,
+    ):
+        first = [cls(base=0.5, max_delay=8, seed=7).delay(a, 1.0) for a in range(6)]
+        again = [cls(base=0.5, max_delay=8, seed=7).delay(a, 1.0) for a in range(6)]
+        assert first == again
+        assert all(0 <= d <= 8 for d in first)
+
+    equal = _retry.EqualJitterBackoff(base=1, seed=1)
+    assert all(2 <= equal.delay(2) <= 4 for _ in range(50))
+    decorrelated = _retry.DecorrelatedJitterBackoff(base=1, max_delay=100, seed=1)
+    assert all(1 <= decorrelated.delay(0, 5.0) <= 15 for _ in range(50))
+
+
+def test_retry_after_still_beats_the_strategy():
+    strategy = _retry.FullJitterBackoff(seed=1)
+    assert _retry.retry_delay(0, 3.0, strategy=strategy) == 3.0
+    assert _retry.retry_delay(0, None, strategy=_retry.ExponentialBackoff(2)) == 2
+
+
+def _busiest_bucket(strategy_for_client, clients=200, bucket=0.05):
+    """Simulate ``clients`` failing at t=0 and retrying; return the peak load."""
+    counts = {}
+    for n in range(clients):
+        delay = strategy_for_client(n).delay(0)
+        counts[int(delay / bucket)] = counts.get(int(delay / bucket), 0) + 1
+    return max(counts.values())
+
+
+def test_jitter_spreads_simultaneous_retries():
+    assert _busiest_bucket(lambda n: _retry.ExponentialBackoff(1.0)) == 200
+    for cls in (_retry.FullJitterBackoff, _retry.EqualJitterBackoff):
+        peak = _busiest_bucket(lambda n: cls(base=1.0, seed=n))
+        assert peak < 40
+
+
+def test_nested_deadlines_keep_the_earlier_one():
+    assert _retry.call_deadline(None) is None
+    with _retry.deadline(5) as outer:
+        with _retry.deadline(60) as inner:
+            assert inner == outer
+            assert _retry.call_deadline(1.0) < outer
+        with _retry.deadline(1) as inner:
+            assert inner < outer
+    assert _retry.call_deadline(None) is None
+    with pytest.raises(_core.OpenShockValidationError):
+        with _retry.deadline(0):
+            pass
+
+
+def test_attempt_timeout_is_trimmed_to_the_deadline():
+    fifteen = _core.Timeouts.of(15.0)
+    assert _retry.attempt_timeout(fifteen, None) == 15.0
+    with _retry.deadline(2) as expires:
+        assert _retry.attempt_timeout(fifteen, expires) <= 2
+        assert _retry.attempt_timeout(_core.Timeouts.of(0.5), expires) == 0.5
+        assert not _retry.fits_deadline(expires, 3)
+        # A retry must leave room for the attempt itself, not just start.
+        assert _retry.fits_deadline(expires, 1, needed=0.5)
+        assert not _retry.fits_deadline(expires, 1, needed=1.5)
+        assert not _retry.fits_deadline(expires, 1.95)
+        assert _retry.time_left(expires) <= 2
+    assert _retry.time_left(None) is None
+    with pytest.raises(_core.OpenShockDeadlineExceededError):
+        _retry.attempt_timeout(fifteen, 0.0)
+
+
+def test_endpoint_timeouts_resolve_per_class():
+    resolved = _retry.resolve_endpoint_timeouts(
+        10.0, {"bulk": _core.Timeouts(read=60), "control": 3}
+    )
+    assert resolved["lookup"] == _core.Timeouts.of(10.0)
+    assert resolved["bulk"] == _core.Timeouts(10.0, 60, 10.0, 10.0)
+    assert resolved["control"] == _core.Timeouts.of(3)
+    assert _retry.endpoint_class("/2/shockers/control") == "control"
+    assert _retry.endpoint_class("/1/shockers/abc/logs") == "bulk"
+    assert _retry.endpoint_class("/1/devices") == "lookup"
+    with pytest.raises(_core.OpenShockValidationError):
+        _retry.resolve_endpoint_timeouts(10.0, {"listing": 5})
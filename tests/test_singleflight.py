@@ -0,0 +1,222 @@
+"""Tests for single-flight coalescing of identical GETs."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    InMemoryTransport,
+    OpenShockClient,
+    OpenShockDeadlineExceededError,
+    OpenShockServerError,
+    deadline,
+    request_timeout,
+)
+from OpenShockPY._singleflight import flight_key
+
+SHOCKER = "00000000-0000-0000-0000-000000000001"
+
+
+def test_keys_separate_params_and_credentials():
+    url = "https://a/1/shockers"
+    base = flight_key("get", url, {"a": [1, 2]}, {"Token": "x"})
+    assert base == flight_key("GET", url, {"a": [1, 2]}, {"Token": "x"})
+    assert base != flight_key("GET", url, {"a": [2, 1]}, {"Token": "x"})
+    assert base != flight_key("GET", url, {"a": [1, 2]}, {"Token": "y"})
+    assert base != flight_key("GET", url, {"a": [1, 2]}, {"Token": "x"}, 1.0)
+
+
+def blocking_handler():
+    release = threading.Event()
+    calls = []
+
+    def handler(req):
+        calls.append(req.url)
+        release.wait(5)
+        if "fail" in req.url:
+            return 503, {"message": "down"}
+        return {"data": [{"id": SHOCKER}]}
+
+    return handler, release, calls
+
+
+def wait_for(predicate):
+    for _ in range(500):
+        if predicate():
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("condition never became true")
+
+
+def test_sync_concurrent_gets_share_one_request():
+    handler, release, calls = blocking_handler()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        single_flight=True,
+    )
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(client.get_shocker, SHOCKER) for _ in range(4)]
+        flights = client._flights._flights
+        wait_for(lambda: [f.waiters for f in list(flights.values())] == [3])
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r == {"data": [{"id": SHOCKER}]} for r in results)
+    results[0]["data"].clear()
+    assert results[1] == {"data": [{"id": SHOCKER}]}  # each caller owns a copy
+    assert len(client._flights) == 0
+
+    client.get_shocker(SHOCKER)  # finished requests are not cached
+    assert len(calls) == 2
+    client.close()
+
+
+def test_sync_waiters_get_the_shared_error():
+    handler, release, calls = blocking_handler()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        base_url="https://api.openshock.app/fail",
+        transport=InMemoryTransport(handler),
+        max_retries=0,
+        single_flight=True,
+    )
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(client.list_devices) for _ in range(2)]
+        flights = client._flights._flights
+        wait_for(lambda: [f.waiters for f in list(flights.values())] == [1])
+        release.set()
+        for future in futures:
+            with pytest.raises(OpenShockServerError):
+                future.result()
+    assert len(calls) == 1
+    client.close()
+
+
+def test_sync_waiter_gives_up_at_its_own_deadline():
+    handler, release, calls = blocking_handler()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        single_flight=True,
+    )
+
+    def hurried():
+        with deadline(0.2):
+            return client.get_shocker(SHOCKER)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        slow = pool.submit(client.get_shocker, SHOCKER)
+        wait_for(lambda: len(calls) == 1)
+        started = time.monotonic()
+        with pytest.raises(OpenShockDeadlineExceededError):
+            pool.submit(hurried).result()
+        assert time.monotonic() - started < 2
+        release.set()
+        assert slow.result() == {"data": [{"id": SHOCKER}]}
+    assert len(calls) == 1
+    client.close()
+
+
+def test_different_timeouts_are_not_shared():
+    handler, release, calls = blocking_handler()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        single_flight=True,
+    )
+
+    def hurried():
+        with request_timeout(0.5):
+            return client.get_shocker(SHOCKER)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(client.get_shocker, SHOCKER), pool.submit(hurried)]
+        wait_for(lambda: len(calls) == 2)
+        release.set()
+        for future in futures:
+            future.result()
+    client.close()
+
+
+def test_different_credentials_and_controls_are_not_shared():
+    handler, release, calls = blocking_handler()
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler),
+        single_flight=True,
+    )
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(client.get_shocker, SHOCKER),
+            pool.submit(client.get_shocker, SHOCKER, api_key="other"),
+            pool.submit(client.shock, SHOCKER, 10, 300),
+            pool.submit(client.shock, SHOCKER, 10, 300),
+        ]
+        wait_for(lambda: len(calls) == 4)
+        release.set()
+        for future in futures:
+            future.result()
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_gets_share_one_request_and_survive_cancellation():
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(req):
+        calls.append(req.url)
+        await release.wait()
+        return {"data": []}
+
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(handler),
+        single_flight=True,
+    ) as client:
+        first = asyncio.ensure_future(client.list_shockers())
+        second = asyncio.ensure_future(client.list_shockers())
+        await asyncio.sleep(0.01)
+        first.cancel()  # the caller that started the request gives up
+        await asyncio.sleep(0.01)
+        release.set()
+        assert await second == {"data": []}
+        with pytest.raises(asyncio.CancelledError):
+            await first
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_waiter_gives_up_at_its_own_deadline():
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(req):
+        calls.append(req.url)
+        await release.wait()
+        return {"data": []}
+
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(handler),
+        single_flight=True,
+    ) as client:
+        slow = asyncio.ensure_future(client.list_shockers())
+        await asyncio.sleep(0.01)
+        with deadline(0.2):
+            with pytest.raises(OpenShockDeadlineExceededError):
+                await asyncio.wait_for(client.list_shockers(), 2)
+        release.set()
+        assert await slow == {"data": []}
+    assert len(calls) == 1
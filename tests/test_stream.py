@@ -0,0 +1,148 @@
+"""Tests for streaming log pages entry by entry."""
+
+import json
+
+import pytest
+from OpenShockPY import (
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    InMemoryTransport,
+    OpenShockClient,
+    OpenShockNotFoundError,
+    OpenShockPYError,
+    TransportResponse,
+)
+from OpenShockPY._stream import DataStreamParser
+
+PAGE = {
+    "message": "",
+    "data": [
+        {"id": f"log-{i}", "intensity": i * 10, "controlledBy": {"name": "é ü"}}
+        for i in range(6)
+    ],
+    "meta": {"total": 6, "page": 1},
+}
+
+
+def feed_all(body: bytes, size: int):
+    parser = DataStreamParser()
+    entries = []
+    for start in range(0, len(body), size):
+        entries.extend(parser.feed(body[start:start + size]))
+    entries.extend(parser.close())
+    return parser, entries
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+def test_parser_yields_every_entry_whatever_the_chunking(indent, size):
+    body = json.dumps(PAGE, indent=indent, ensure_ascii=False).encode()
+    parser, entries = feed_all(body, size)
+    assert entries == PAGE["data"]
+    assert parser.envelope == {"message": "", "meta": PAGE["meta"]}
+
+
+def test_parser_waits_for_numbers_and_literals_split_between_chunks():
+    body = (
+        b'{"elapsed": 12.5, "scale": -7.5e3, "ok": true, '
+        b'"data": [1, 23, 456, -7.5e3, 0.25E-2, true, false, null, {"d": 1.5e+2}], '
+        b'"next": null}'
+    )
+    for split in range(1, len(body)):
+        parser = DataStreamParser()
+        entries = parser.feed(body[:split]) + parser.feed(body[split:])
+        entries += parser.close()
+        assert entries == [1, 23, 456, -7500.0, 0.0025, True, False, None, {"d": 150.0}]
+        assert parser.envelope == {
+            "elapsed": 12.5,
+            "scale": -7500.0,
+            "ok": True,
+            "next": None,
+        }
+
+
+def test_parser_hands_entries_out_as_soon_as_they_close():
+    parser = DataStreamParser()
+    assert parser.feed(b'{"data": [{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b': 2}, 3') == [{"id": 2}]
+    assert parser.feed(b"4]}") == [34]
+    assert parser.close() == []
+
+
+def test_parser_accepts_bare_arrays_and_rejects_cut_bodies():
+    assert feed_all(b"[1, 2, [3]]", 2)[1] == [1, 2, [3]]
+    parser = DataStreamParser()
+    parser.feed(b'{"data": [{"id": 1}, {"id": ')
+    with pytest.raises(ValueError):
+        parser.close()
+    with pytest.raises(ValueError):
+        DataStreamParser().feed(b'"text"')
+
+
+def make_client(handler, **kwargs):
+    return OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=InMemoryTransport(handler, chunk_size=5),
+        **kwargs,
+    )
+
+
+def test_sync_client_streams_entries_with_the_get_logs_query():
+    client = make_client(lambda req: PAGE)
+    stream = client.iter_logs_stream(page=2, page_size=500, shocker_ids=["a"])
+    assert client._transport.requests == []  # nothing sent before next()
+    assert next(stream) == PAGE["data"][0]
+    assert list(stream) == PAGE["data"][1:]
+    request = client._transport.requests[0]
+    assert request.url.endswith("/1/shockers/logs")
+    assert request.params == {"page": 2, "pageSize": 500, "shockerIds": ["a"]}
+
+
+def test_sync_client_raises_api_errors_and_malformed_bodies():
+    client = make_client(lambda req: (404, {"message": "no"}))
+    with pytest.raises(OpenShockNotFoundError):
+        list(client.iter_logs_stream())
+
+    cut = make_client(lambda req: TransportResponse(200, {}, b'{"data": [{"id": 1}'))
+    stream = cut.iter_logs_stream()
+    assert next(stream) == {"id": 1}
+    with pytest.raises(OpenShockPYError):
+        next(stream)
+
+
+class SendOnly:
+    """A custom transport without ``stream``."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def send(self, method, url, **kwargs):
+        return TransportResponse(200, {}, json.dumps(self.body).encode())
+
+    def close(self):
+        pass
+
+
+def test_transports_without_stream_fall_back_to_send():
+    client = OpenShockClient(
+        user_agent="OpenShockPY-Test/0.1", transport=SendOnly(PAGE)
+    )
+    assert list(client.iter_logs_stream()) == PAGE["data"]
+
+
+@pytest.mark.asyncio
+async def test_async_client_streams_entries():
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(lambda req: PAGE, chunk_size=4),
+    ) as client:
+        entries = [entry async for entry in client.aiter_logs_stream(page_size=6)]
+        assert entries == PAGE["data"]
+
+    async with AsyncOpenShockClient(
+        user_agent="OpenShockPY-Test/0.1",
+        transport=AsyncInMemoryTransport(lambda req: (404, {"message": "no"})),
+    ) as client:
+        with pytest.raises(OpenShockNotFoundError):
+            async for _ in client.aiter_logs_stream():
+                pass
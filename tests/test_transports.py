@@ -0,0 +1,367 @@
+"""Tests for the built-in transports and for driving clients through them."""
+
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from OpenShockPY import (
+    AsyncHTTPXTransport,
+    AsyncInMemoryTransport,
+    AsyncOpenShockClient,
+    HTTPXTransport,
+    InMemoryTransport,
+    OpenShockClient,
+    OpenShockConnectionError,
+    OpenShockNotFoundError,
+    OpenShockValidationError,
+    RequestsTransport,
+    Timeouts,
+    TransportResponse,
+    Urllib3Transport,
+    request_timeout,
+)
+from OpenShockPY._core import get_header
+
+SHOCKER = "00000000-0000-0000-0000-000000000001"
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """Replies with a JSON description of the request it received."""
+
+    protocol_version = "HTTP/1.1"  # keep connections alive
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        if "slow" in self.path:
+            time.sleep(0.1)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode()
+        payload = json.dumps(
+            {
+                "path": self.path,
+                "headers": dict(self.headers),
+                "body": json.loads(body) if body else None,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_in_memory_transport_drives_sync_client():
+    transport = InMemoryTransport(lambda req: {"message": "ok"})
+    client = OpenShockClient(
+        api_key="tok", user_agent="OpenShockPY-Test/0.1", transport=transport
+    )
+
+    assert client.shock(SHOCKER, intensity=10, duration=500) == {"message": "ok"}
+
+    (request,) = transport.requests
+    assert request.method == "POST"
+    assert request.url.endswith("/2/shockers/control")
+    assert request.json["shocks"][0]["id"] == SHOCKER
+    assert request.headers["OpenShockToken"] == "tok"
+    # Unset auth headers are dropped rather than sent empty.
+    assert "OpenShockSession" not in request.headers
+
+
+def test_in_memory_transport_status_tuple_maps_errors():
+    transport = InMemoryTransport(lambda req: (404, {"message": "gone"}))
+    client = OpenShockClient(
+        api_key="tok", user_agent="OpenShockPY-Test/0.1", transport=transport
+    )
+
+    with pytest.raises(OpenShockNotFoundError):
+        client.list_devices()
+
+
+def test_transport_connection_errors_are_retried():
+    calls = []
+
+    def handler(req):
+        calls.append(req)
+        if len(calls) == 1:
+            raise OpenShockConnectionError("reset")
+        return TransportResponse(200, {}, b'{"data": []}')
+
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        backoff_factor=0,
+        transport=InMemoryTransport(handler),
+    )
+
+    assert client.list_devices() == {"data": []}
+    assert len(calls) == 2
+
+
+def test_urllib3_transport_round_trip(echo_server):
+    transport = Urllib3Transport()
+    try:
+        resp = transport.send(
+            "POST",
+            f"{echo_server}/1/shockers/x/logs",
+            headers={"User-Agent": "ua", "OpenShockToken": None},
+            params={"offset": 0, "limit": 5},
+            json={"a": 1},
+        )
+    finally:
+        transport.close()
+
+    assert resp.status_code == 200
+    assert get_header(resp.headers, "content-type") == "application/json"
+    echoed = resp.json()
+    assert echoed["path"] == "/1/shockers/x/logs?offset=0&limit=5"
+    assert echoed["body"] == {"a": 1}
+    assert echoed["headers"]["Content-Type"] == "application/json"
+    assert "OpenShockToken" not in echoed["headers"]
+
+
+def test_in_memory_client_gets_per_class_timeouts():
+    transport = InMemoryTransport(lambda req: {"data": []})
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=transport,
+        endpoint_timeouts={"control": Timeouts(connect=1, read=2)},
+    )
+    client.shock(SHOCKER, intensity=10, duration=500)
+    client.list_devices()
+    with request_timeout(Timeouts(read=120)):
+        client.get_logs()
+
+    control, lookup, logs = (req.timeout for req in transport.requests)
+    assert control == Timeouts(1, 2, 15.0, 15.0)
+    assert lookup == 15.0
+    assert logs == Timeouts(15.0, 120, 15.0, 15.0)
+
+
+def test_request_timeout_reaches_sync_fan_out_threads():
+    def handler(req):
+        if "logs" in req.url and req.params["page"] > 1:
+            return {"data": []}
+        return {"data": [{"id": "s1"}]}
+
+    transport = InMemoryTransport(handler)
+    client = OpenShockClient(user_agent="OpenShockPY-Test/0.1", transport=transport)
+    with request_timeout(0.5):
+        list(client.batch("get_shocker", [{"shocker_id": "s1"}] * 3))
+        list(client.iter_logs(prefetch=2))
+    assert len(transport.requests) == 6
+    assert {req.timeout for req in transport.requests} == {0.5}
+
+
+def test_assigning_timeout_reaches_later_requests():
+    transport = InMemoryTransport(lambda req: {"data": []})
+    client = OpenShockClient(
+        api_key="tok",
+        user_agent="OpenShockPY-Test/0.1",
+        transport=transport,
+        endpoint_timeouts={"control": Timeouts(read=2)},
+    )
+    client.timeout = 1.0
+    client.list_devices()
+    client.shock(SHOCKER, intensity=10, duration=500)
+
+    lookup, control = (req.timeout for req in transport.requests)
+    assert lookup == 1.0
+    assert control == Timeouts(1.0, 2, 1.0, 1.0)
+
+
+@pytest.mark.asyncio
+async def test_async_assigning_timeout_reaches_later_requests():
+    transport = AsyncInMemoryTransport(lambda req: {"data": []})
+    client = AsyncOpenShockClient(
+        api_key="tok", user_agent="OpenShockPY-Test/0.1", transport=transport
+    )
+    client.timeout = Timeouts(read=2)
+    await client.list_devices()
+    assert transport.requests[0].timeout == Timeouts(15.0, 2, 15.0, 15.0)
+    await client.aclose()
+
+
+@pytest.mark.parametrize("factory", [RequestsTransport, Urllib3Transport])
+def test_built_in_transports_take_per_phase_timeouts(echo_server, factory):
+    transport = factory()
+    try:
+        resp = transport.send(
+            "GET",
+            f"{echo_server}/1/devices",
+            headers={},
+            timeout=Timeouts(connect=1, read=5, write=5, pool=5),
+        )
+    finally:
+        transport.close()
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "factory", [RequestsTransport, Urllib3Transport, HTTPXTransport]
+)
+def test_built_in_transports_stream_bodies(echo_server, factory):
+    transport = factory()
+    try:
+        with transport.stream(
+            "GET", f"{echo_server}/1/shockers/logs", headers={}, params={"page": 2}
+        ) as resp:
+            body = b"".join(resp.chunks)
+    finally:
+        transport.close()
+    assert resp.status_code == 200
+    assert json.loads(body)["path"] == "/1/shockers/logs?page=2"
+
+
+def test_urllib3_transport_wraps_connection_errors():
+    transport = Urllib3Transport()
+    with pytest.raises(OpenShockConnectionError) as excinfo:
+        # Port 9 (discard) is closed on any sane test host.
+        transport.send("GET", "http://127.0.0.1:9/", headers={}, timeout=1)
+    assert excinfo.value.request_sent is False
+
+
+@pytest.mark.parametrize("factory", [RequestsTransport, HTTPXTransport])
+def test_refused_connects_are_marked_unsent(factory):
+    transport = factory()
+    try:
+        with pytest.raises(OpenShockConnectionError) as excinfo:
+            transport.send("POST", "http://127.0.0.1:9/", headers={}, timeout=1)
+    finally:
+        transport.close()
+    assert excinfo.value.request_sent is False
+
+
+def test_read_timeouts_count_as_sent(echo_server):
+    transport = RequestsTransport()
+    with pytest.raises(OpenShockConnectionError) as excinfo:
+        transport.send("GET", f"{echo_server}/slow", headers={}, timeout=0.02)
+    transport.close()
+    assert excinfo.value.request_sent is True
+
+
+def test_sync_client_over_urllib3(echo_server):
+    with OpenShockClient(
+        api_key="tok",
+        base_url=echo_server,
+        user_agent="OpenShockPY-Test/0.1",
+        transport=Urllib3Transport(),
+    ) as client:
+        echoed = client.list_devices()
+
+    assert echoed["path"] == "/1/devices"
+    assert echoed["headers"]["OpenShockToken"] == "tok"
+
+
+def test_requests_transport_counts_reused_connections(echo_server):
+    transport = RequestsTransport()
+    for _ in range(3):
+        transport.send("GET", f"{echo_server}/1/devices", headers={})
+    stats = transport.pool_stats()
+    transport.close()
+    assert (stats.created, stats.reused, stats.discarded) == (1, 2, 0)
+
+
+def test_undersized_pool_reports_discarded_connections(echo_server):
+    client = OpenShockClient(
+        api_key="tok",
+        base_url=echo_server,
+        user_agent="OpenShockPY-Test/0.1",
+        pool_maxsize=1,
+    )
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: client.get_device("slow"), range(4)))
+    stats = client.pool_stats()
+    client.close()
+    assert stats.created == 4
+    assert stats.discarded == 3
+
+
+def test_tcp_keepalive_sets_socket_options():
+    transport = RequestsTransport(tcp_keepalive=30)
+    adapter = transport.session.get_adapter("https://api.openshock.app")
+    options = adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+
+
+def test_pool_options_rejected_with_custom_transport():
+    with pytest.raises(OpenShockValidationError):
+        OpenShockClient(
+            user_agent="OpenShockPY-Test/0.1",
+            transport=InMemoryTransport(lambda req: {}),
+            pool_maxsize=4,
+        )
+    with pytest.raises(OpenShockValidationError):
+        RequestsTransport(pool_maxsize=0)
+
+
+@pytest.mark.asyncio
+async def test_async_pool_stats_count_reuse(echo_server):
+    async with AsyncOpenShockClient(
+        api_key="tok", base_url=echo_server, user_agent="OpenShockPY-Test/0.1"
+    ) as client:
+        for _ in range(3):
+            await client.list_devices()
+        stats = client.pool_stats()
+    assert (stats.created, stats.reused, stats.discarded) == (1, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_async_in_memory_transport_accepts_async_handler():
+    async def handler(req):
+        return {"data": [{"id": "d1"}]}
+
+    transport = AsyncInMemoryTransport(handler)
+    async with AsyncOpenShockClient(
+        api_key="tok", user_agent="OpenShockPY-Test/0.1", transport=transport
+    ) as client:
+        assert await client.list_devices() == {"data": [{"id": "d1"}]}
+
+    (request,) = transport.requests
+    assert request.method == "GET"
+    assert request.url.endswith("/1/devices")
+
+
+@pytest.mark.asyncio
+async def test_async_httpx_transport_streams_bodies(echo_server):
+    transport = AsyncHTTPXTransport()
+    try:
+        async with transport.stream(
+            "GET", f"{echo_server}/1/shockers/logs", headers={}
+        ) as resp:
+            body = b"".join([chunk async for chunk in resp.chunks])
+    finally:
+        await transport.aclose()
+    assert json.loads(body)["path"] == "/1/shockers/logs"
+
+
+@pytest.mark.asyncio
+async def test_async_client_sends_per_phase_timeouts_through_httpx(echo_server):
+    async with AsyncOpenShockClient(
+        api_key="tok",
+        base_url=echo_server,
+        user_agent="OpenShockPY-Test/0.1",
+        endpoint_timeouts={"lookup": Timeouts(connect=1, read=5)},
+    ) as client:
+        echoed = await client.list_devices()
+    assert echoed["path"] == "/1/devices"